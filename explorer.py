@@ -2,13 +2,15 @@
 ROK Auto Farm - Explorer
 Felfedezés ellenőrzés és indítás
 """
-import time
 import json
 from pathlib import Path
 
 from library import safe_click, press_key, wait_random, ImageManager, find_and_close_popups, is_garbage_ocr_text
 from utils.logger import FarmLogger as log
+from utils.clock import clock
 from utils.ocr_parser import parse_resource_value
+from utils.ocr_grammar import PERCENT
+from utils.ocr_consensus import ocr_consensus
 
 
 class Explorer:
@@ -64,7 +66,7 @@ class Explorer:
         # 1. Que menü megnyitása
         delay = wait_random(self.human_wait_min, self.human_wait_max)
         log.wait(f"Várakozás {delay:.1f} mp (emberi faktor)")
-        time.sleep(delay)
+        clock.sleep(delay)
         coords = self.coords.get('open_queue_menu', [0, 0])
         log.click(f"Que menü megnyitása → ({coords[0]}, {coords[1]})")
         safe_click(coords)
@@ -72,7 +74,7 @@ class Explorer:
         # 2. Que fül bezárása
         delay = wait_random(self.human_wait_min, self.human_wait_max)
         log.wait(f"Várakozás {delay:.1f} mp")
-        time.sleep(delay)
+        clock.sleep(delay)
         coords = self.coords.get('close_queue_tab', [0, 0])
         log.click(f"Que fül bezárása → ({coords[0]}, {coords[1]})")
         safe_click(coords)
@@ -80,7 +82,7 @@ class Explorer:
         # 3. Scout fül megnyitása
         delay = wait_random(self.human_wait_min, self.human_wait_max)
         log.wait(f"Várakozás {delay:.1f} mp")
-        time.sleep(delay)
+        clock.sleep(delay)
         coords = self.coords.get('open_scout_tab', [0, 0])
         log.click(f"Scout fül megnyitása → ({coords[0]}, {coords[1]})")
         safe_click(coords)
@@ -88,7 +90,7 @@ class Explorer:
         # 4. Felfedezés % kiolvasása (3 régió - frissítve!)
         delay = wait_random(self.human_wait_min, self.human_wait_max)
         log.wait(f"Várakozás {delay:.1f} mp")
-        time.sleep(delay)
+        clock.sleep(delay)
 
         region1 = self.coords.get('exploration_region_1', {})
         region2 = self.coords.get('exploration_region_2', {})
@@ -96,32 +98,19 @@ class Explorer:
 
         log.ocr("Felfedezés % kiolvasása (3 régió)...")
 
-        # Régió 1 kiolvasás
-        if region1:
-            log.ocr(f"Régió 1 kiolvasása → (x:{region1.get('x',0)}, y:{region1.get('y',0)}, w:{region1.get('width',0)}, h:{region1.get('height',0)})")
-            text1 = ImageManager.read_text_from_region(region1)
-            log.info(f"Régió 1 OCR: '{text1}'")
-        else:
-            text1 = ""
-            log.warning("Régió 1 nincs beállítva")
-
-        # Régió 2 kiolvasás
-        if region2:
-            log.ocr(f"Régió 2 kiolvasása → (x:{region2.get('x',0)}, y:{region2.get('y',0)}, w:{region2.get('width',0)}, h:{region2.get('height',0)})")
-            text2 = ImageManager.read_text_from_region(region2)
-            log.info(f"Régió 2 OCR: '{text2}'")
-        else:
-            text2 = ""
-            log.warning("Régió 2 nincs beállítva")
-
-        # Régió 3 kiolvasás (ÚJ!)
-        if region3:
-            log.ocr(f"Régió 3 kiolvasása → (x:{region3.get('x',0)}, y:{region3.get('y',0)}, w:{region3.get('width',0)}, h:{region3.get('height',0)})")
-            text3 = ImageManager.read_text_from_region(region3)
-            log.info(f"Régió 3 OCR: '{text3}'")
-        else:
-            text3 = ""
-            log.warning("Régió 3 nincs beállítva")
+        # Mind a 3 régió egy frame-ből, párhuzamos OCR
+        for index, region in enumerate((region1, region2, region3), 1):
+            if region:
+                log.ocr(f"Régió {index} kiolvasása → (x:{region.get('x',0)}, y:{region.get('y',0)}, w:{region.get('width',0)}, h:{region.get('height',0)})")
+            else:
+                log.warning(f"Régió {index} nincs beállítva")
+
+        texts = ImageManager.read_text_from_regions({1: region1, 2: region2, 3: region3}, grammar=PERCENT)
+        text1, text2, text3 = texts[1], texts[2], texts[3]
+
+        for index, region in enumerate((region1, region2, region3), 1):
+            if region:
+                log.info(f"Régió {index} OCR: '{texts[index]}'")
 
         # % jelenlétének ellenőrzése (MIND A 3 régióban kell!)
         # JAVÍTVA: OR → AND (mind a 3 régióban kell % jel)
@@ -160,7 +149,7 @@ class Explorer:
 
                     # Scout panel újranyitása
                     delay = wait_random(self.human_wait_min, self.human_wait_max)
-                    time.sleep(delay)
+                    clock.sleep(delay)
 
                     # Scout fül megnyitása újra
                     coords = self.coords.get('open_scout_tab', [0, 0])
@@ -169,19 +158,18 @@ class Explorer:
 
                     # OCR újrapróbálás
                     delay = wait_random(self.human_wait_min, self.human_wait_max)
-                    time.sleep(delay)
+                    clock.sleep(delay)
 
                     log.ocr("Felfedezés % újraolvasása (tiszta képernyő)...")
 
-                    if region1:
-                        text1 = ImageManager.read_text_from_region(region1)
-                        log.info(f"Régió 1 OCR (újra): '{text1}'")
-                    if region2:
-                        text2 = ImageManager.read_text_from_region(region2)
-                        log.info(f"Régió 2 OCR (újra): '{text2}'")
-                    if region3:
-                        text3 = ImageManager.read_text_from_region(region3)
-                        log.info(f"Régió 3 OCR (újra): '{text3}'")
+                    # Konszenzus olvasás (régiónként 3 frame, párhuzamos OCR)
+                    texts = {index: ocr_consensus.read(region, grammar=PERCENT, votes=3)['text'] if region else ""
+                             for index, region in enumerate((region1, region2, region3), 1)}
+                    text1, text2, text3 = texts[1], texts[2], texts[3]
+
+                    for index, region in enumerate((region1, region2, region3), 1):
+                        if region:
+                            log.info(f"Régió {index} OCR (újra): '{texts[index]}'")
 
                     # Újra ellenőrzés
                     has_all_percent = '%' in text1 and '%' in text2 and '%' in text3
@@ -202,7 +190,7 @@ class Explorer:
         # 5. Scout bezárása
         delay = wait_random(self.human_wait_min, self.human_wait_max)
         log.wait(f"Várakozás {delay:.1f} mp")
-        time.sleep(delay)
+        clock.sleep(delay)
         coords = self.coords.get('close_scout', [0, 0])
         log.click(f"Scout bezárása → ({coords[0]}, {coords[1]})")
         safe_click(coords)
@@ -210,7 +198,7 @@ class Explorer:
         # 6. Que fül megnyitása
         delay = wait_random(self.human_wait_min, self.human_wait_max)
         log.wait(f"Várakozás {delay:.1f} mp")
-        time.sleep(delay)
+        clock.sleep(delay)
         coords = self.coords.get('open_queue_tab', [0, 0])
         log.click(f"Que fül megnyitása → ({coords[0]}, {coords[1]})")
         safe_click(coords)
@@ -218,7 +206,7 @@ class Explorer:
         # 7. Que menü bezárása
         delay = wait_random(self.human_wait_min, self.human_wait_max)
         log.wait(f"Várakozás {delay:.1f} mp")
-        time.sleep(delay)
+        clock.sleep(delay)
         coords = self.coords.get('close_queue_menu', [0, 0])
         log.click(f"Que menü bezárása → ({coords[0]}, {coords[1]})")
         safe_click(coords)
@@ -238,7 +226,7 @@ class Explorer:
         # 1. Scout épület
         delay = wait_random(self.human_wait_min, self.human_wait_max)
         log.wait(f"Várakozás {delay:.1f} mp (emberi faktor)")
-        time.sleep(delay)
+        clock.sleep(delay)
         coords = self.coords.get('scout_building', [0, 0])
         log.click(f"Scout épület kattintás → ({coords[0]}, {coords[1]})")
         safe_click(coords)
@@ -246,7 +234,7 @@ class Explorer:
         # 2. Pre-explore gomb (ÚJ!)
         delay = wait_random(self.human_wait_min, self.human_wait_max)
         log.wait(f"Várakozás {delay:.1f} mp")
-        time.sleep(delay)
+        clock.sleep(delay)
         coords = self.coords.get('pre_explore_button', [0, 0])
         log.click(f"Pre-explore gomb → ({coords[0]}, {coords[1]})")
         safe_click(coords)
@@ -254,14 +242,14 @@ class Explorer:
         # 3. Explore gomb (1. kattintás)
         delay = wait_random(self.human_wait_min, self.human_wait_max)
         log.wait(f"Várakozás {delay:.1f} mp")
-        time.sleep(delay)
+        clock.sleep(delay)
         coords = self.coords.get('explore_button', [0, 0])
         log.click(f"Explore gomb (1. kattintás) → ({coords[0]}, {coords[1]})")
         safe_click(coords)
 
         # 4. Fix 1.5 mp várakozás
         log.wait("Fix várakozás 1.5 mp")
-        time.sleep(1.5)
+        clock.sleep(1.5)
 
         # 5. Explore gomb (2. kattintás)
         log.click(f"Explore gomb (2. kattintás) → ({coords[0]}, {coords[1]})")
@@ -270,7 +258,7 @@ class Explorer:
         # 6. Fix kattintás (képernyő közép)
         delay = wait_random(self.human_wait_min, self.human_wait_max)
         log.wait(f"Várakozás {delay:.1f} mp")
-        time.sleep(delay)
+        clock.sleep(delay)
         coords = self.coords.get('screen_center', [0, 0])
         if coords != [0, 0]:
             log.click(f"Képernyő közép kattintás → ({coords[0]}, {coords[1]})")
@@ -279,14 +267,14 @@ class Explorer:
         # 7. Space (1.)
         delay = wait_random(self.human_wait_min, self.human_wait_max)
         log.wait(f"Várakozás {delay:.1f} mp")
-        time.sleep(delay)
+        clock.sleep(delay)
         log.action("SPACE billentyű lenyomása (1.)")
         press_key('space')
 
         # 8. Space (2.)
         delay = wait_random(self.human_wait_min, self.human_wait_max)
         log.wait(f"Várakozás {delay:.1f} mp")
-        time.sleep(delay)
+        clock.sleep(delay)
         log.action("SPACE billentyű lenyomása (2.)")
         press_key('space')
 
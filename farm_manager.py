@@ -2,15 +2,23 @@
 ROK Auto Farm Manager - Orchestrator
 Új architektúra: Queue + Timer + Scheduler + Managers
 """
-import time
+import argparse
 import signal
 import sys
 
-from library import initialize_game_window
+from library import initialize_game_window, initialize_capture, calibrate_template_scales
 from utils.logger import FarmLogger as log
+from utils.clock import clock
+from utils.farm_stats import farm_stats
+from utils.replay import setup_replay, get_replay_summary
 from utils.queue_manager import queue_manager
 from utils.timer_manager import timer_manager
 from utils.scheduler import scheduler
+from utils.template_cache import template_cache
+from utils.template_hints import template_hints
+from utils.ocr_engine import ocr_engine
+from utils.ocr_cache import ocr_cache
+from utils.easyocr_engine import easyocr_engine
 
 from managers.gathering_manager import gathering_manager
 from managers.training_manager import training_manager
@@ -50,6 +58,33 @@ def signal_handler(sig, frame):
     timer_manager.save_to_file()
     
     # Logger bezárás
+    # Throughput összesítő (virtuális időben is)
+    stats = farm_stats.get_summary()
+    log.info(f"Throughput: {stats['gathers']} gathering / {stats['elapsed_hours']} óra "
+             f"({stats['gathers_per_hour']}/óra), gyűjtés: {stats['gather_hours']} óra, "
+             f"commander idle: {stats['idle_hours']} óra")
+
+    ocr_stats = ocr_cache.get_stats()
+    log.info(f"OCR cache: {ocr_stats['hits']} hit / {ocr_stats['misses']} miss "
+             f"(hit rate: {ocr_stats['hit_rate']:.0%}, {ocr_stats['entries']} bejegyzés)")
+
+    for engine, engine_stats in stats['ocr'].items():
+        log.info(f"OCR {engine}: {engine_stats['count']} olvasás ({engine_stats['cached']} cache), "
+                 f"capture: {engine_stats['avg_capture_ms']} ms, "
+                 f"inference: {engine_stats['avg_inference_ms']} ms átlag")
+
+    template_hints.save_to_file()
+    hint_stats = template_hints.get_stats()
+    log.info(f"Template hint-ek: {hint_stats['hits']} hint találat / {hint_stats['misses']} hint miss / "
+             f"{hint_stats['full_searches']} teljes keresés (hit rate: {hint_stats['hit_rate']:.0%})")
+
+    # Replay összesítő (csak replay módban)
+    replay_summary = get_replay_summary()
+    if replay_summary:
+        log.info(f"Replay összesítő: {replay_summary['clicks']} kattintás, "
+                 f"{replay_summary['keys']} billentyű, "
+                 f"{replay_summary['virtual_seconds']} virtuális mp")
+
     log.info("Logger bezárása...")
     log.close()
 
@@ -60,8 +95,21 @@ def signal_handler(sig, frame):
     sys.exit(0)
 
 
-def main():
+def parse_args(argv=None):
+    """Parancssori argumentumok"""
+    parser = argparse.ArgumentParser(description="ROK Auto Farm Manager")
+    parser.add_argument('--replay', metavar='DIR',
+                        help="Offline replay: felvett PNG frame-ek könyvtára (élő ablak nélkül)")
+    parser.add_argument('--speed', type=float, default=1000.0,
+                        help="Replay virtuális idő gyorsítás (alapértelmezett: 1000x)")
+    parser.add_argument('--ticks', type=int, default=0,
+                        help="Main loop tick-ek száma leállításig (0 = végtelen)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main orchestrator"""
+    args = parse_args(argv)
     
     # Signal handler (CTRL+C)
     signal.signal(signal.SIGINT, signal_handler)
@@ -73,6 +121,26 @@ def main():
     
     log.initialize()
     log.success("Logger inicializálva (file logging enabled)")
+
+    # EasyOCR modell betöltés háttérben (addig Tesseract / glyph fallback)
+    if easyocr_engine.available:
+        easyocr_engine.start_warmup().add_done_callback(
+            lambda ready: log.success("EasyOCR modell betöltve") if ready.result()
+            else log.warning("EasyOCR nem használható, Tesseract fallback")
+        )
+        log.info("EasyOCR modell betöltése háttérben...")
+    else:
+        log.info("EasyOCR nincs telepítve (pip install easyocr) - Tesseract fallback használata")
+
+    # Replay mód: capture / input / óra csere (élő BlueStacks nélkül)
+    if args.replay:
+        replay_info = setup_replay(args.replay, speed=args.speed)
+        log.success(f"REPLAY MÓD: {args.replay} ({args.speed:g}x, ablak: {replay_info['window_rect']})")
+        log.info(f"Input események: {replay_info['input_log']}")
+        log.info(f"Replay állapot (queue / timer / hint): {replay_info['state_dir']}")
+
+    # Throughput mérés kezdete (a választott órával)
+    farm_stats.reset()
     
     # ===== 2. JÁTÉK ABLAK INICIALIZÁLÁS =====
     log.separator('=', 60)
@@ -85,6 +153,22 @@ def main():
         return
     
     log.success("Játék ablak OK")
+
+    # Capture backend (leggyorsabb elérhető: win32 perzisztens DC → PIL)
+    if not args.replay:
+        capture_backend = initialize_capture()
+        log.success(f"Capture backend: {capture_backend}")
+
+    log.info(f"OCR Tesseract backend: {ocr_engine.backend_name}")
+
+    # Template-ek előtöltése (PNG decode csak egyszer, nem a match hot path-ban)
+    template_cache.preload()
+
+    # Skála kalibráció (wizard capture felbontás → aktuális ablak), multi-scale = 1 skála
+    calibration = calibrate_template_scales()
+    if calibration:
+        log.info(f"Template skálák: {calibration['families'] or 'nincs rögzített capture felbontás'} "
+                 f"(ablak: {calibration['window_size'][0]}x{calibration['window_size'][1]})")
     
     # ===== 3. QUEUE MANAGER INIT =====
     log.separator('=', 60)
@@ -158,32 +242,39 @@ def main():
     log.success("✅ ÖSSZES MANAGER ELINDULT - MAIN LOOP KEZDŐDIK")
     log.separator('#', 60)
     
-    log.info("Main Loop: Scheduler tick minden 10 másodpercben")
+    log.info("Main Loop: Event-driven scheduler (új task → azonnali futtatás), heartbeat 10 másodpercenként")
     log.info("CTRL+C = graceful shutdown")
     log.separator('#', 60)
     
     tick_count = 0
+    tick_interval = 10
+    next_tick_at = clock.monotonic() + tick_interval
     
     try:
         while True:
+            # Scheduler: blokkol a következő heartbeat-ig, de új task esetén
+            # azonnal ébred és minden várakozó taskot lefuttat
+            scheduler.run_pending(timeout=next_tick_at - clock.monotonic())
+
+            if clock.monotonic() < next_tick_at:
+                continue
+
+            # ===== Heartbeat (10 sec) =====
             tick_count += 1
+            next_tick_at = clock.monotonic() + tick_interval
 
             # Explorer task queue-ba (minden 12. tick = 2 perc)
-            if tick_count % 12 == 0:
-                queue_manager.add_task("explorer_check", "explorer")
+            if tick_count % 12 == 0 and queue_manager.add_task("explorer_check", "explorer"):
                 log.info("🔍 Explorer task queue-ba rakva (2 perc)")
 
-            # Scheduler tick
-            task_executed = scheduler.tick()
-
-            if not task_executed:
-                # Csak minden 10. tick-nél log (100 sec = ~1.5 perc)
-                if tick_count % 10 == 0:
-                    queue_size = queue_manager.get_queue_size()
-                    log.info(f"[Tick {tick_count}] Queue üres, várakozás... (Queue: {queue_size}, Timers: {len(timer_manager.get_all_timers())})")
+            # Csak minden 10. tick-nél log (100 sec = ~1.5 perc)
+            if tick_count % 10 == 0 and queue_manager.get_queue_size() == 0:
+                log.info(f"[Tick {tick_count}] Queue üres, várakozás... (Timers: {len(timer_manager.get_all_timers())})")
 
-            # Várakozás 10 sec
-            time.sleep(10)
+            # Benchmark / replay: adott tick szám után leállás
+            if args.ticks and tick_count >= args.ticks:
+                log.info(f"[Tick {tick_count}] Tick limit elérve - leállítás")
+                signal_handler(None, None)
     
     except KeyboardInterrupt:
         # CTRL+C - signal handler kezeli
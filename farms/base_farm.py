@@ -1,9 +1,8 @@
 """
 Auto Farm - Base Farm
 Közös farm logika minden típushoz
-JAVÍTOTT VERZIÓ - Gathering Time retry 60x, 1.0 sec késleltetéssel
+JAVÍTOTT VERZIÓ - Gathering Time burst olvasás (villogó szöveg)
 """
-import time
 import json
 from pathlib import Path
 
@@ -15,7 +14,13 @@ from library import (
     ImageManager
 )
 from utils.logger import FarmLogger as log
+from utils.clock import clock
 from utils.time_utils import parse_time, format_time
+from utils.ocr_grammar import TIME
+
+
+# Villogó gather time: burst olvasások száma (egy burst ≈ 1 villogási ciklus)
+GATHER_TIME_BURSTS = 3
 
 
 class BaseFarm:
@@ -84,21 +89,21 @@ class BaseFarm:
             # 1. SPACE
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"Várakozás {delay:.1f} mp (emberi faktor)")
-            time.sleep(delay)
+            clock.sleep(delay)
             log.action("SPACE billentyű lenyomása")
             press_key('space')
             
             # 2. F
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
             log.action("B billentyű lenyomása (térkép megnyitás)")
             press_key('b')
             
             # 3. NYERSANYAG SELECT
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
             coords = self.coords.get('resource_icon', [0, 0])
             log.click(f"{self.farm_type.upper()} alapanyag kiválasztása → ({coords[0]}, {coords[1]})")
             safe_click(coords)
@@ -106,7 +111,7 @@ class BaseFarm:
             # 4. FARM POZÍCIÓ 1
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
             coords = self.coords.get('level_button', [0, 0])
             log.click(f"Farm pozíció #1 → ({coords[0]}, {coords[1]})")
             safe_click(coords)
@@ -114,7 +119,7 @@ class BaseFarm:
             # 5. FARM POZÍCIÓ 2
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
             coords = self.coords.get('search_button', [0, 0])
             log.click(f"Farm pozíció #2 → ({coords[0]}, {coords[1]})")
             safe_click(coords)
@@ -122,7 +127,7 @@ class BaseFarm:
             # 6. GATHER.PNG KERESÉS
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
             log.search("Gather.png gomb keresése (threshold: 0.7)...")
             
             gather_coords = self.find_gather_button()
@@ -140,7 +145,7 @@ class BaseFarm:
             # 7. CONFIRM
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
             coords = self.coords.get('new_troops', [0, 0])
             log.click(f"Megerősítés gomb → ({coords[0]}, {coords[1]})")
             safe_click(coords)
@@ -148,7 +153,7 @@ class BaseFarm:
             # 8. IDŐ A KIOLVASÁS (MARCH TIME)
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
             
             region = self.time_regions.get('march_time', {})
             log.ocr(f"March Time (Idő A) kiolvasása → Region: (x:{region.get('x',0)}, y:{region.get('y',0)}, w:{region.get('width',0)}, h:{region.get('height',0)})")
@@ -164,7 +169,7 @@ class BaseFarm:
             # 9. FIX KOORDINÁTA
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
             coords = self.coords.get('march_button', [0, 0])
             log.click(f"Fix koordináta kattintás → ({coords[0]}, {coords[1]})")
             safe_click(coords)
@@ -172,12 +177,12 @@ class BaseFarm:
             # 10. VÁRNI A IDŐ + 1 SEC
             wait_duration = march_time + 1
             log.wait(f"Várakozás {wait_duration} sec (A idő + 1 sec) = {format_time(wait_duration)}")
-            time.sleep(wait_duration)
+            clock.sleep(wait_duration)
             
             # 11. KÉPERNYŐ KÖZEPE
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
             screen_center = get_screen_center()
             coords = self.coords.get('screen_center', screen_center)
             log.click(f"Képernyő közép kattintás → ({coords[0]}, {coords[1]})")
@@ -186,7 +191,7 @@ class BaseFarm:
             # ===== 12. IDŐ B KIOLVASÁS - JAVÍTOTT RETRY LOGIKA =====
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
 
             region = self.time_regions.get('gather_time', {})
             log.ocr(f"Gathering Time (Idő B) kiolvasása → Region: (x:{region.get('x',0)}, y:{region.get('y',0)}, "
@@ -194,20 +199,18 @@ class BaseFarm:
 
             gather_time = None
             
-            # ===== VÁLTOZTATÁSOK: 30 → 60 próba, 0.5 → 1.0 sec delay =====
-            for attempt in range(60):  # 30 → 60 (dupla esély)
-                gather_time = self.read_time('gather_time')
+            # Burst olvasás: egy burst lefedi a villogási ciklust (a legjobb frame-ek OCR-je)
+            for attempt in range(GATHER_TIME_BURSTS):
+                gather_time = self.read_time('gather_time', burst=True)
                 if gather_time is not None:
-                    log.success(f"Gathering Time sikeresen kiolvasva {attempt+1}. próbálkozásra: "
+                    log.success(f"Gathering Time sikeresen kiolvasva {attempt+1}. burst-re: "
                                 f"{format_time(gather_time)} ({gather_time} sec)")
                     break
-                log.warning(f"Gathering Time nem olvasható ({attempt+1}/60), újrapróbálkozás...")
-                time.sleep(1.0)  # 0.5 → 1.0 sec (teljes villogási ciklus kivárása)
-            # =========================================================
+                log.warning(f"Gathering Time nem olvasható ({attempt+1}/{GATHER_TIME_BURSTS} burst), újrapróbálkozás...")
 
             if gather_time is None:
                 gather_time = self.default_gather_time
-                log.warning(f"Gathering Time nem olvasható 60 próbálkozás után sem! "
+                log.warning(f"Gathering Time nem olvasható {GATHER_TIME_BURSTS} burst után sem! "
                             f"Default érték: {gather_time} sec ({format_time(gather_time)})")
 
             # 14. C_i SZÁMÍTÁS
@@ -219,7 +222,7 @@ class BaseFarm:
             # 15. SPACE
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
             log.action("SPACE lenyomása (C idő mentése után)")
             press_key('space')
             
@@ -240,7 +243,7 @@ class BaseFarm:
         log.info(f"Várakozási idő: {format_time(max_time)} + 1 perc = {format_time(wait_time)}")
         
         log.wait(f"Várakozás {wait_time} sec ({format_time(wait_time)}) a következő farm ciklusig...")
-        time.sleep(wait_time)
+        clock.sleep(wait_time)
         
         log.separator('=', 60)
         log.success(f"{self.farm_type.upper()} farm ciklus befejezve!")
@@ -263,17 +266,18 @@ class BaseFarm:
                 return coords
             
             log.warning(f"Gather.png nem található ({attempt+1}/{self.gather_retry}), újrapróbálkozás...")
-            time.sleep(0.5)
+            clock.sleep(0.5)
         
         return None
     
-    def read_time(self, time_key, debug_save=False):
+    def read_time(self, time_key, debug_save=False, burst=False):
         """
         Idő kiolvasás OCR-rel (javított preprocessing)
 
         Args:
             time_key: Idő kulcs (march_time, gather_time, stb.)
             debug_save: Debug screenshot mentése
+            burst: Villogó szöveg: burst capture, csak a legjobb frame-ek OCR-je
 
         Returns:
             int: Másodpercek vagy None
@@ -283,8 +287,11 @@ class BaseFarm:
         if not region:
             return None
 
-        # Javított OCR preprocessing használata
-        ocr_text = ImageManager.read_text_from_region(region, debug_save=debug_save)
+        # Idő grammar: az első parse-olható engine / variáns kimenetnél kész
+        if burst:
+            ocr_text = ImageManager.burst_read(region, grammar=TIME)
+        else:
+            ocr_text = ImageManager.read_text_from_region(region, debug_save=debug_save, grammar=TIME)
 
         if not ocr_text:
             return None
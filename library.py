@@ -4,18 +4,38 @@ Alapvető függvények a meglévő library alapján
 FIXED: WindowManager.find_window() exception handling
 ENHANCED: EasyOCR support + Template matching improvements
 """
+import sys
 import time
+import json
 import random
-import pyautogui
+import threading
 import cv2
-import numpy as np
 import pytesseract
-from PIL import ImageGrab, Image
-import win32gui
-import win32con
-from pynput.keyboard import Controller, Key
 from pathlib import Path
 
+from utils.template_cache import template_cache, MULTI_SCALES
+from utils.template_matcher import template_matcher
+from utils.template_hints import template_hints
+from utils.scale_calibration import scale_calibration
+from utils.capture import screen_capture
+from utils.input_backend import input_controller
+from utils.clock import clock
+from utils.ocr_engine import ocr_engine, TESSERACT_VARIANTS
+from utils.glyph_ocr import glyph_recognizer
+from utils.ocr_cache import ocr_cache
+from utils.easyocr_engine import easyocr_engine
+from utils.ocr_result import OCRResult
+from utils.farm_stats import farm_stats
+from utils.burst_capture import capture_burst, DEFAULT_BURST_FRAMES, DEFAULT_BURST_INTERVAL
+
+# Windows ablakkezelés (optional - replay módban Linuxon nincs)
+try:
+    import win32gui
+    import win32con
+    WIN32_AVAILABLE = True
+except ImportError:
+    WIN32_AVAILABLE = False
+
 # DPI awareness
 try:
     import ctypes
@@ -26,28 +46,15 @@ except:
     except:
         pass
 
-# Tesseract path - MÓDOSÍTSD A SAJÁTODRA!
-pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
-
-# EasyOCR support (optional)
-try:
-    import easyocr
-    EASYOCR_AVAILABLE = True
-    _easyocr_reader = None
-    print("✅ EasyOCR elérhető - ML-alapú OCR használata")
-except ImportError:
-    EASYOCR_AVAILABLE = False
-    print("⚠️  EasyOCR nincs telepítve - Tesseract fallback használata")
-    print("   Telepítés: pip install easyocr")
+# Tesseract path - MÓDOSÍTSD A SAJÁTODRA! (Linuxon / replay módban a PATH-ból)
+if sys.platform == 'win32':
+    pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+    ocr_engine.tessdata_path = r"C:\Program Files\Tesseract-OCR\tessdata"
 
 # Globális változók
 game_window_handle = None
 game_window_title = "BlueStacks"  # Módosítsd a játék ablak nevére
-keyboard = Controller()
-
-# pyautogui beállítások
-pyautogui.FAILSAFE = True
-pyautogui.PAUSE = 0.1
+virtual_window_rect = None  # Replay mód: (x, y, width, height) valós ablak helyett
 
 
 class WindowManager:
@@ -64,6 +71,14 @@ class WindowManager:
         
         if partial_title is None:
             partial_title = game_window_title
+
+        # Replay mód: virtuális ablak mindig "megtalálható"
+        if virtual_window_rect is not None:
+            return True
+
+        if not WIN32_AVAILABLE:
+            print("Ablak keresési hiba: pywin32 nem elérhető (csak replay módban futtatható)")
+            return False
         
         # Flag lista (mutable, így a callback módosíthatja)
         found = [False]
@@ -95,20 +110,37 @@ class WindowManager:
     @staticmethod
     def focus_window():
         """Fókusz a játék ablakra"""
+        if virtual_window_rect is not None:
+            return True
+
         if game_window_handle:
             try:
                 win32gui.ShowWindow(game_window_handle, win32con.SW_RESTORE)
-                time.sleep(0.1)
+                clock.sleep(0.1)
                 win32gui.SetForegroundWindow(game_window_handle)
-                time.sleep(0.1)
+                clock.sleep(0.1)
                 return True
             except:
                 return False
         return False
+
+    @staticmethod
+    def set_virtual_window(rect):
+        """
+        Virtuális ablak beállítása (replay mód, nincs valós BlueStacks)
+
+        Args:
+            rect: (x, y, width, height) vagy None (valós ablak használata)
+        """
+        global virtual_window_rect
+        virtual_window_rect = tuple(rect) if rect else None
     
     @staticmethod
     def get_window_rect():
         """Ablak pozíció és méret"""
+        if virtual_window_rect is not None:
+            return virtual_window_rect
+
         if game_window_handle:
             try:
                 rect = win32gui.GetWindowRect(game_window_handle)
@@ -119,101 +151,288 @@ class WindowManager:
         return None
 
 
+def _load_capture_settings():
+    """settings.json 'capture' szekció (ha nincs, üres dict)"""
+    settings_file = Path(__file__).parent / 'config' / 'settings.json'
+    try:
+        if settings_file.exists():
+            with open(settings_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get('capture', {})
+    except Exception as e:
+        print(f"Capture settings betöltési hiba: {e}")
+    return {}
+
+
+class FrameCache:
+    """
+    Megosztott képkocka cache: egy ablak screenshot több detektornak
+
+    Az egymás utáni template matching-ek és OCR kivágások ugyanazt a frame-et
+    használják, amíg az frissebb mint max_age. Kattintás / billentyű után
+    a cache invalidálódik (a képernyő megváltozhatott).
+    """
+
+    def __init__(self, max_age_ms=150):
+        self.max_age = max_age_ms / 1000.0
+
+        # Thread lock (connection monitor szál is OCR-ez)
+        self.lock = threading.Lock()
+
+        self.frame = None
+        self.origin = (0, 0)  # Frame bal felső sarka abszolút képernyő koordinátában
+        self.timestamp = 0.0
+        self.frame_id = 0
+
+        # Statisztika
+        self.hits = 0
+        self.misses = 0
+
+    def set_max_age(self, max_age_ms):
+        """Frissességi ablak beállítása (ms, 0 = cache kikapcsolva)"""
+        with self.lock:
+            self.max_age = max_age_ms / 1000.0
+
+    def get_frame(self):
+        """
+        Friss ablak frame lekérése (cache-ből, vagy új capture)
+
+        Returns:
+            tuple: (frame BGR numpy, (origin_x, origin_y)) vagy (None, (0, 0))
+        """
+        frame, origin, _ = self.get_frame_with_id()
+        return frame, origin
+
+    def get_frame_with_id(self):
+        """
+        Mint get_frame(), a frame azonosítóval együtt (OCR eredmény metaadat)
+
+        Returns:
+            tuple: (frame, origin, frame_id)
+        """
+        with self.lock:
+            if self._is_fresh():
+                self.hits += 1
+                return self.frame, self.origin, self.frame_id
+
+            self.misses += 1
+
+            # Timestamp capture ELŐTT (konzervatív kor számítás)
+            timestamp = clock.monotonic()
+
+            rect = WindowManager.get_window_rect()
+            if rect:
+                frame = screen_capture.grab((rect[0], rect[1], rect[0] + rect[2], rect[1] + rect[3]))
+            else:
+                frame = screen_capture.grab()
+
+            self.frame = frame
+            self.origin = (rect[0], rect[1]) if rect else (0, 0)
+            self.timestamp = timestamp
+            self.frame_id += 1
+
+            return self.frame, self.origin, self.frame_id
+
+    def peek(self):
+        """
+        Friss frame lekérése capture NÉLKÜL
+
+        Returns:
+            tuple: (frame, origin) vagy (None, (0, 0)) ha nincs friss frame
+        """
+        frame, origin, _ = self.peek_with_id()
+        return frame, origin
+
+    def peek_with_id(self):
+        """
+        Mint peek(), a frame azonosítóval együtt
+
+        Returns:
+            tuple: (frame, origin, frame_id) vagy (None, (0, 0), None)
+        """
+        with self.lock:
+            if self._is_fresh():
+                self.hits += 1
+                return self.frame, self.origin, self.frame_id
+            return None, (0, 0), None
+
+    def crop(self, region, capture=True):
+        """
+        Abszolút képernyő régió kivágása a cache-elt frame-ből
+
+        Args:
+            region: dict - {'x', 'y', 'width', 'height'} (abszolút koordináták)
+            capture: Ha True és nincs friss frame, új capture készül
+
+        Returns:
+            numpy.ndarray: BGR kivágás vagy None ha a régió kilóg a frame-ből
+        """
+        cropped, _ = self.crop_with_id(region, capture=capture)
+        return cropped
+
+    def crop_with_id(self, region, capture=True):
+        """
+        Mint crop(), a forrás frame azonosítójával
+
+        Returns:
+            tuple: (kivágás vagy None, frame_id vagy None)
+        """
+        if capture:
+            frame, origin, frame_id = self.get_frame_with_id()
+        else:
+            frame, origin, frame_id = self.peek_with_id()
+
+        cropped = self.crop_frame(frame, origin, region)
+        return cropped, (frame_id if cropped is not None else None)
+
+    @staticmethod
+    def crop_frame(frame, origin, region):
+        """
+        Abszolút képernyő régió kivágása egy adott frame-ből
+
+        Returns:
+            numpy.ndarray: BGR kivágás vagy None ha nincs frame / a régió kilóg
+        """
+        if frame is None:
+            return None
+
+        x = region['x'] - origin[0]
+        y = region['y'] - origin[1]
+        w, h = region['width'], region['height']
+
+        if x < 0 or y < 0 or x + w > frame.shape[1] or y + h > frame.shape[0]:
+            return None
+
+        return frame[y:y+h, x:x+w]
+
+    def invalidate(self):
+        """Cache törlése (kattintás / billentyű után)"""
+        with self.lock:
+            self.frame = None
+            self.timestamp = 0.0
+
+    def get_stats(self):
+        """
+        Cache statisztika
+
+        Returns:
+            dict: {'hits', 'misses', 'frame_id'}
+        """
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'frame_id': self.frame_id}
+
+    def _is_fresh(self):
+        """Lock alatt hívandó!"""
+        return (self.frame is not None and
+                clock.monotonic() - self.timestamp <= self.max_age)
+
+
+# Globális frame cache (settings.json → capture.frame_cache_ms)
+frame_cache = FrameCache(_load_capture_settings().get('frame_cache_ms', 150))
+
+# OCR eredmény cache méret (settings.json → capture.ocr_cache_size)
+ocr_cache.max_entries = _load_capture_settings().get('ocr_cache_size', 256)
+
+
 class ImageManager:
     """Képfelismerés és OCR"""
     
     @staticmethod
     def screenshot(region=None):
-        """Képernyőkép készítése"""
+        """
+        Képernyőkép készítése
+
+        region=None esetén a teljes ablak frame a megosztott frame cache-ből
+        jön (egy tick-en belül több detektor ugyanazt a capture-t használja).
+        """
         try:
             if region is None:
-                rect = WindowManager.get_window_rect()
-                if rect:
-                    region = rect
+                frame, _ = frame_cache.get_frame()
+                return frame
             
-            img = pyautogui.screenshot(region=region)
-            img_np = cv2.cvtColor(np.array(img), cv2.COLOR_RGB2BGR)
-            return img_np
+            x, y, w, h = region
+            return screen_capture.grab((x, y, x + w, y + h))
         except Exception as e:
             print(f"Screenshot hiba: {e}")
             return None
+
+    @staticmethod
+    def capture_region(region):
+        """
+        Abszolút képernyő régió beolvasása
+
+        Friss megosztott frame esetén abból vág (capture nélkül), egyébként
+        csak a régiót olvassa be az aktív capture backend-del.
+
+        Args:
+            region: dict - {'x', 'y', 'width', 'height'}
+
+        Returns:
+            numpy.ndarray: BGR kép
+        """
+        cropped = frame_cache.crop(region, capture=False)
+
+        if cropped is None:
+            cropped = screen_capture.grab_region(region)
+
+        return cropped
     
     @staticmethod
-    def find_image(template_path, threshold=0.7, multi_scale=False, search_region=None):
+    def find_image(template_path, threshold=0.7, multi_scale=False, search_region=None, relative=False,
+                   use_hints=True):
         """
         Template matching - ENHANCED verzió
 
         Args:
             template_path: Template kép elérési útja
             threshold: Egyezési küszöb (0-1)
-            multi_scale: Ha True, több skálán is próbál (lassabb, de robusztusabb)
-            search_region: dict - Keresési régió {'x', 'y', 'width', 'height'}
-                          Ha None, akkor teljes képernyő
+            multi_scale: Ha True, több skálán is próbál (lassabb, de robusztusabb);
+                         kalibrált template-nél csak a kalibrált skálán (scale_calibration)
+            search_region: dict - Keresési régió {'x', 'y', 'width', 'height'} (abszolút)
+                          Csak ez a régió kerül capture-re / matchingre.
+                          Ha None, akkor teljes játék ablak
+            relative: Ha True, a search_region a játék ablakhoz relatív
+            use_hints: Régió nélkül először a legutóbbi találati helyek körül keres
+                       (template_hints), teljes frame-en csak ha ott nincs találat
 
         Returns:
-            tuple: (x, y) koordináták vagy None
+            tuple: (x, y) abszolút koordináták vagy None
         """
         try:
-            # Template betöltése
-            template = cv2.imread(template_path)
-            if template is None:
-                print(f"⚠️  Template nem található: {template_path}")
+            # Template a cache-ből + skálák (kalibráció / multi-scale)
+            candidate = ImageManager._template_candidate(template_path, multi_scale)
+            if candidate is None:
                 return None
+            entry, scales, calibrated = candidate
 
-            # Screenshot
-            screen = ImageManager.screenshot()
-            if screen is None:
-                return None
+            use_hints = use_hints and not search_region
 
-            # Régió alapú keresés
-            region_offset_x = 0
-            region_offset_y = 0
-            if search_region:
-                x = search_region.get('x', 0)
-                y = search_region.get('y', 0)
-                w = search_region.get('width', screen.shape[1])
-                h = search_region.get('height', screen.shape[0])
+            # Location hint-ek: kis ablak a legutóbbi találatok körül
+            if use_hints:
+                hit = ImageManager._match_hints(template_path, entry, threshold, scales)
+                if hit:
+                    match, offset = hit
+                    print(f"✅ Template match: {template_path} (confidence: {match[0]:.2f}, hint)")
+                    return ImageManager._match_center(match, offset)
+
+            prepared, offset = ImageManager._prepare_search(search_region, relative)
+            if prepared is None:
+                return None
 
-                # Screenshot régió kivágása
-                screen = screen[y:y+h, x:x+w]
-                region_offset_x = x
-                region_offset_y = y
+            # Coarse-to-fine: kicsinyített grayscale jelöltek → teljes felbontású finomítás
+            match = template_matcher.match(prepared, entry, threshold, scales=scales)
 
             best_match = None
-            best_val = threshold
+            if match:
+                best_val = match[0]
+                best_match = ImageManager._match_center(match, offset)
 
-            # Multi-scale matching (opcionális)
-            scales = [1.0]
+            # Tanult skála: kalibrálatlan találat → tanulás, miss a tanult skálán → törlés
             if multi_scale:
-                scales = [0.8, 0.9, 1.0, 1.1, 1.2]
-
-            for scale in scales:
-                # Template átméretezése
-                if scale != 1.0:
-                    width = int(template.shape[1] * scale)
-                    height = int(template.shape[0] * scale)
-                    resized = cv2.resize(template, (width, height))
-                else:
-                    resized = template
-
-                # Matching
-                result = cv2.matchTemplate(screen, resized, cv2.TM_CCOEFF_NORMED)
-                min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-
-                # Jobb match?
-                if max_val > best_val:
-                    best_val = max_val
-                    h, w = resized.shape[:2]
-                    center_x = max_loc[0] + w // 2 + region_offset_x
-                    center_y = max_loc[1] + h // 2 + region_offset_y
+                ImageManager._update_learned_scale(template_path, entry, match, calibrated)
 
-                    # Relatív → Abszolút koordináták
-                    rect = WindowManager.get_window_rect()
-                    if rect:
-                        center_x += rect[0]
-                        center_y += rect[1]
-
-                    best_match = (center_x, center_y)
+            if use_hints:
+                template_hints.record_miss(template_path,
+                                           ImageManager._window_box(match, offset) if match else None)
 
             if best_match:
                 print(f"✅ Template match: {template_path} (confidence: {best_val:.2f})")
@@ -224,6 +443,295 @@ class ImageManager:
             print(f"Template matching hiba: {e}")
             return None
 
+    @staticmethod
+    def find_all(templates, threshold=0.7, multi_scale=False, search_region=None, relative=False,
+                 use_hints=True):
+        """
+        Template csoport keresése EGY frame-en (párhuzamos correlation)
+
+        Template-enként ugyanaz a jelölt útvonal, mint find_image-nél: kalibrált
+        skála, majd a hint ablakok; a hint-ekben nem talált template-ek egy
+        közös teljes frame-en, párhuzamosan (template_matcher.match_many).
+
+        Args:
+            templates: Template útvonalak listája
+            threshold / multi_scale / search_region / relative / use_hints: lásd find_image
+
+        Returns:
+            list: [{'template', 'coords', 'confidence'}, ...] confidence szerint csökkenő
+                  sorrendben (csak a küszöb feletti találatok, holtversenynél a lista sorrend)
+        """
+        try:
+            # (sorrend, útvonal, entry, skálák, kalibrált)
+            candidates = []
+            for template_path in templates:
+                candidate = ImageManager._template_candidate(template_path, multi_scale)
+                if candidate is not None:
+                    candidates.append((len(candidates), str(template_path)) + candidate)
+
+            use_hints = use_hints and not search_region
+
+            found = []
+            remaining = []
+            for index, template_path, entry, scales, calibrated in candidates:
+                hit = ImageManager._match_hints(template_path, entry, threshold, scales) if use_hints else None
+                if hit:
+                    found.append((index, template_path, hit))
+                else:
+                    remaining.append((index, template_path, entry, scales, calibrated))
+
+            if remaining:
+                prepared, offset = ImageManager._prepare_search(search_region, relative)
+                if prepared is not None:
+                    results = template_matcher.match_many(prepared, [c[2] for c in remaining], threshold,
+                                                          entry_scales=[c[3] for c in remaining])
+
+                    for (index, template_path, entry, _, calibrated), match in zip(remaining, results):
+                        if match:
+                            found.append((index, template_path, (match, offset)))
+
+                        # Tanult skála: kalibrálatlan találat → tanulás, miss a tanult skálán → törlés
+                        if multi_scale:
+                            ImageManager._update_learned_scale(template_path, entry, match, calibrated)
+
+                        if use_hints:
+                            template_hints.record_miss(
+                                template_path, ImageManager._window_box(match, offset) if match else None)
+
+            found.sort(key=lambda item: (-item[2][0][0], item[0]))
+            return [{
+                'template': template_path,
+                'coords': ImageManager._match_center(match, offset),
+                'confidence': match[0]
+            } for _, template_path, (match, offset) in found]
+
+        except Exception as e:
+            print(f"Template matching hiba: {e}")
+            return []
+
+    @staticmethod
+    def find_any(templates, threshold=0.7, multi_scale=False, search_region=None, relative=False,
+                 use_hints=True):
+        """
+        Template csoport legjobb találata EGY frame-en
+
+        Args:
+            (lásd find_all)
+
+        Returns:
+            dict: {'template', 'coords', 'confidence'} vagy None ha egyik sem található
+        """
+        matches = ImageManager.find_all(templates, threshold=threshold, multi_scale=multi_scale,
+                                        search_region=search_region, relative=relative,
+                                        use_hints=use_hints)
+        if not matches:
+            return None
+
+        best = matches[0]
+        print(f"✅ Template match: {best['template']} (confidence: {best['confidence']:.2f})")
+        return best
+
+    @staticmethod
+    def region_around(point, radius, template_path=None):
+        """
+        Keresési régió egy pont körül
+
+        A régió akkora, hogy benne minden olyan találat megférjen, aminek a
+        KÖZÉPPONTJA legfeljebb radius px-re van a ponttól (a template fél méretével bővítve).
+
+        Args:
+            point: (x, y) abszolút koordináta
+            radius: Max eltérés (px) a középponttól
+            template_path: Template útvonal (a méret miatt, None = csak a radius)
+
+        Returns:
+            dict: {'x', 'y', 'width', 'height'} (abszolút)
+        """
+        half_width = half_height = 0
+        entry = template_cache.get(template_path) if template_path else None
+        if entry is not None:
+            height, width = entry['bgr'].shape[:2]
+            half_width, half_height = width // 2 + 1, height // 2 + 1
+
+        x, y = point
+        left = max(0, x - radius - half_width)
+        top = max(0, y - radius - half_height)
+
+        return {
+            'x': left,
+            'y': top,
+            'width': x + radius + half_width + 1 - left,
+            'height': y + radius + half_height + 1 - top
+        }
+
+    @staticmethod
+    def _prepare_search(search_region=None, relative=False):
+        """
+        Keresési kép: teljes frame, vagy csak a régió (ROI)
+
+        Régiónál friss megosztott frame esetén abból vág, egyébként csak a régiót
+        olvassa be (nincs teljes ablak capture).
+
+        Args:
+            search_region: dict - Abszolút régió (None = teljes ablak)
+            relative: Ha True, a régió a játék ablakhoz relatív
+
+        Returns:
+            tuple: (prepared, offset) - offset: a keresési kép abszolút bal felső sarka,
+                   (None, None) ha nincs kép
+        """
+        if not search_region:
+            # Screenshot (megosztott frame cache)
+            screen, origin, frame_id = frame_cache.get_frame_with_id()
+            if screen is None:
+                return None, None
+
+            # Kicsinyített keresési kép (frame szerint cache-elve)
+            prepare_key = (frame_id, None) if frame_id is not None else None
+            return template_matcher.prepare(screen, key=prepare_key), origin
+
+        region = ImageManager._absolute_region(search_region, relative)
+
+        screen, frame_id = frame_cache.crop_with_id(region, capture=False)
+        if screen is None:
+            screen = screen_capture.grab_region(region)
+        if screen is None or screen.size == 0:
+            return None, None
+
+        # Kicsinyített keresési kép (frame + régió szerint cache-elve)
+        prepare_key = (frame_id, ImageManager._region_key(region)) if frame_id is not None else None
+        prepared = template_matcher.prepare(screen, key=prepare_key)
+
+        return prepared, (region['x'], region['y'])
+
+    @staticmethod
+    def _absolute_region(region, relative=False):
+        """
+        Régió → abszolút képernyő régió
+
+        Args:
+            region: dict - {'x', 'y', 'width', 'height'}
+            relative: Ha True, a régió a játék ablak bal felső sarkához relatív
+
+        Returns:
+            dict: Abszolút régió
+        """
+        x, y = region.get('x', 0), region.get('y', 0)
+
+        if relative:
+            rect = WindowManager.get_window_rect()
+            if rect:
+                x += rect[0]
+                y += rect[1]
+
+        return {'x': x, 'y': y, 'width': region.get('width', 0), 'height': region.get('height', 0)}
+
+    @staticmethod
+    def _template_candidate(template_path, multi_scale=False):
+        """
+        Template entry + keresési skálák (find_image / find_all közös jelölt útvonala)
+
+        Multi-scale esetén kalibrált template-nél csak a kalibrált skála, egyébként MULTI_SCALES.
+
+        Returns:
+            tuple: (entry, scales, calibrated) - calibrated: _calibrated_entry() eredménye
+                   vagy None; None ha a template nem található
+        """
+        # Template a cache-ből (decode csak egyszer, mtime változáskor újra)
+        entry = template_cache.get(template_path)
+        if entry is None:
+            print(f"⚠️  Template nem található: {template_path}")
+            return None
+
+        # Multi-scale matching (opcionális) - előre átméretezett piramis
+        scales = [1.0]
+        calibrated = None
+        if multi_scale:
+            scales = MULTI_SCALES
+
+            # Session kalibráció: az ablak méretből egyetlen skála
+            calibrated = ImageManager._calibrated_entry(template_path, entry)
+            if calibrated is not None:
+                entry, scale = calibrated
+                scales = [scale]
+
+        return entry, scales, calibrated
+
+    @staticmethod
+    def _match_hints(template_path, entry, threshold, scales):
+        """
+        Keresés a template hint ablakaiban (legutóbbi találat elöl), találatnál record_hit
+
+        Returns:
+            tuple: (match, offset) az első találatra, vagy None
+        """
+        for hint_region in template_hints.get_regions(template_path):
+            prepared, offset = ImageManager._prepare_search(hint_region, relative=True)
+            if prepared is None:
+                continue
+
+            match = template_matcher.match(prepared, entry, threshold, scales=scales)
+            if match:
+                template_hints.record_hit(template_path, ImageManager._window_box(match, offset))
+                return match, offset
+
+        return None
+
+    @staticmethod
+    def _update_learned_scale(template_path, entry, match, calibrated):
+        """
+        Multi-scale keresés eredménye → template tanult skálája (scale_calibration)
+
+        Kalibrálatlan találat: a nyerő skála megjegyzése; miss a kalibrált skálán:
+        tanult skála törlése (rögzített felbontású template-nél no-op) → újra teljes multi-scale.
+        """
+        if match and calibrated is None:
+            scale = scale_calibration.nearest_scale(match[2][0] / entry['bgr'].shape[1])
+            scale_calibration.learn(template_path, scale)
+        elif not match and calibrated is not None:
+            scale_calibration.unlearn(template_path)
+
+    @staticmethod
+    def _calibrated_entry(template_path, entry):
+        """
+        Kalibrált template entry az aktuális ablak mérethez
+
+        Ablak méret változáskor (get_window_rect) újrakalibrál.
+
+        Returns:
+            tuple: (entry, scale) vagy None ha a template nincs kalibrálva
+        """
+        rect = WindowManager.get_window_rect()
+        if rect:
+            scale_calibration.calibrate((rect[2], rect[3]))
+
+        scale = scale_calibration.get_scale(template_path)
+        if scale is None:
+            return None
+
+        # Előre számolt piramis skála → nincs külön átméretezés
+        if scale in entry['scales']:
+            return entry, scale
+
+        scaled = template_cache.get_scaled(template_path, scale)
+        if scaled is None:
+            return None
+        return scaled, scale
+
+    @staticmethod
+    def _window_box(match, offset):
+        """template_matcher találat → játék ablakhoz relatív (x, y, width, height) (hint tároláshoz)"""
+        _, (left, top), (width, height) = match
+        rect = WindowManager.get_window_rect()
+        origin = (rect[0], rect[1]) if rect else (0, 0)
+        return (left + offset[0] - origin[0], top + offset[1] - origin[1], width, height)
+
+    @staticmethod
+    def _match_center(match, offset):
+        """template_matcher találat → abszolút középpont"""
+        _, (left, top), (width, height) = match
+        return (left + width // 2 + offset[0], top + height // 2 + offset[1])
+
     @staticmethod
     def capture_button_template(x, y, width=80, height=80, output_path=None):
         """
@@ -264,9 +772,10 @@ class ImageManager:
             # Crop
             template = screen[y1:y2, x1:x2]
 
-            # Mentés
+            # Mentés (+ capture felbontás a skála kalibrációhoz)
             if output_path:
                 cv2.imwrite(output_path, template)
+                scale_calibration.record_capture(output_path, rect[2:])
                 print(f"✅ Template mentve: {output_path}")
 
             return template
@@ -276,31 +785,54 @@ class ImageManager:
             return None
     
     @staticmethod
-    def read_text_from_region(region, debug_save=False, use_easyocr=True):
+    def read_text_from_region(region, debug_save=False, use_easyocr=True, validator=None, whitelist=None,
+                              use_glyphs=True, grammar=None):
         """
         OCR szöveg kiolvasás - ML-ENHANCED VERZIÓ
 
         Többféle OCR módszert próbál:
+        0. Glyph OCR (fix játék font, ha van glyph library) - LEGGYORSABB
         1. EasyOCR (ML-alapú, ha elérhető) - ELSŐDLEGES
-        2. Tesseract + preprocessing (OTSU, Adaptive, CLAHE) - FALLBACK
+        2. Tesseract + preprocessing (OTSU, Adaptive, CLAHE) - FALLBACK, párhuzamosan
+
+        Grammar megadásakor cascade: olcsó engine / variáns először, az első
+        illeszkedő kimenetnél kész (lásd ocr_image).
 
         Args:
             region: dict - OCR régió
             debug_save: bool - Ha True, menti a feldolgozott képet hibakereséshez
             use_easyocr: bool - Ha True, EasyOCR-t próbál először (default)
+            validator: callable(text) → bool - Tesseract: az első valid variánsnál visszatér
+            whitelist: Engedélyezett karakterek (pl. ocr_engine.DIGIT_WHITELIST) - EasyOCR allowlist / Tesseract
+            use_glyphs: bool - Ha True, glyph OCR-t próbál először (csak biztos találatot fogad el)
+            grammar: Várt formátum (utils.ocr_grammar: TIME, RESOURCE, PERCENT, keywords(...))
 
         Returns:
-            str: OCR szöveg
+            str: OCR szöveg (confidence / engine / időzítés: read_region)
         """
-        try:
-            # Screenshot a régióból
-            x, y, w, h = region['x'], region['y'], region['width'], region['height']
+        return ImageManager.read_region(region, debug_save=debug_save, use_easyocr=use_easyocr,
+                                        validator=validator, whitelist=whitelist, use_glyphs=use_glyphs,
+                                        grammar=grammar).text
+
+    @staticmethod
+    def read_region(region, debug_save=False, use_easyocr=True, validator=None, whitelist=None,
+                    use_glyphs=True, grammar=None):
+        """
+        OCR olvasás strukturált eredménnyel
 
-            # Teljes képernyő screenshot
-            img = ImageGrab.grab()
+        Args:
+            (lásd read_text_from_region)
 
-            # Kivágás
-            cropped = img.crop((x, y, x + w, y + h))
+        Returns:
+            OCRResult: Szöveg + confidence, engine, variáns, capture / inference idő, frame id
+        """
+        try:
+            # Csak a régió beolvasása (nem teljes desktop grab + crop)
+            capture_started = time.perf_counter()
+            cropped, frame_id = frame_cache.crop_with_id(region, capture=False)
+            if cropped is None:
+                cropped = screen_capture.grab_region(region)
+            capture_ms = (time.perf_counter() - capture_started) * 1000
 
             # ===== DEBUG SAVE: EREDETI SCREENSHOT =====
             if debug_save:
@@ -310,94 +842,350 @@ class ImageManager:
                 debug_dir.mkdir(parents=True, exist_ok=True)
                 timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
                 # Eredeti screenshot mentése (COLOR)
-                cropped.save(str(debug_dir / f"ocr_{timestamp}_0_original.png"))
+                cv2.imwrite(str(debug_dir / f"ocr_{timestamp}_0_original.png"), cropped)
                 print(f"  📸 Original screenshot: {debug_dir}/ocr_{timestamp}_0_original.png")
             # ============================================
 
             # Grayscale
-            gray = cv2.cvtColor(np.array(cropped), cv2.COLOR_RGB2GRAY)
+            gray = cv2.cvtColor(cropped, cv2.COLOR_BGR2GRAY)
 
-            # ===== ELSŐDLEGES: EasyOCR (ML-alapú) =====
-            if EASYOCR_AVAILABLE and use_easyocr:
-                try:
-                    # Lazy load EasyOCR reader
-                    global _easyocr_reader
-                    if _easyocr_reader is None:
-                        print("🔄 EasyOCR inicializálása (csak egyszer)...")
-                        _easyocr_reader = easyocr.Reader(['en'], gpu=False)
-                        print("✅ EasyOCR kész")
-
-                    # EasyOCR futtatása
-                    results = _easyocr_reader.readtext(gray, detail=0)
-
-                    if results:
-                        # Összes szöveg összefűzése
-                        easyocr_text = " ".join(results).strip()
-
-                        if easyocr_text:
-                            if debug_save:
-                                print(f"  🤖 EasyOCR: '{easyocr_text}'")
-                            return easyocr_text
-
-                except Exception as e:
-                    print(f"⚠️  EasyOCR hiba: {e}, Tesseract fallback...")
-
-            # ===== FALLBACK: Tesseract + Preprocessing =====
-
-            # MÓDSZER 1: OTSU Threshold
-            _, thresh1 = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-            text1 = pytesseract.image_to_string(thresh1, config='--psm 7').strip()
-
-            # MÓDSZER 2: Adaptive Threshold
-            thresh2 = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                                           cv2.THRESH_BINARY, 11, 2)
-            text2 = pytesseract.image_to_string(thresh2, config='--psm 7').strip()
-
-            # MÓDSZER 3: Kontrasztfokozás + OTSU
-            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
-            enhanced = clahe.apply(gray)
-            _, thresh3 = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-            text3 = pytesseract.image_to_string(thresh3, config='--psm 7').strip()
-
-            # Debug save
+            region_key = ImageManager._region_key(region)
+
+            # Debug módban nincs cache, hogy a képek mentődjenek
             if debug_save:
-                import datetime
-                from pathlib import Path
-                debug_dir = Path(__file__).parent / 'logs' / 'ocr_debug'
-                debug_dir.mkdir(parents=True, exist_ok=True)
-                timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                cv2.imwrite(str(debug_dir / f"ocr_{timestamp}_1_otsu.png"), thresh1)
-                cv2.imwrite(str(debug_dir / f"ocr_{timestamp}_2_adaptive.png"), thresh2)
-                cv2.imwrite(str(debug_dir / f"ocr_{timestamp}_3_clahe.png"), thresh3)
-                print(f"  📸 Debug képek: {debug_dir}")
-
-            # Válasszuk ki a leghosszabb valid szöveget
-            results = [
-                (text1, len(text1)),
-                (text2, len(text2)),
-                (text3, len(text3))
-            ]
-
-            valid_results = [(t, l) for t, l in results if l > 0]
-
-            if valid_results:
-                best_text = max(valid_results, key=lambda x: x[1])[0]
-                if debug_save:
-                    print(f"  📝 Tesseract best: '{best_text}'")
-                return best_text
-            else:
-                return ""
+                result = ImageManager.ocr_image(gray, debug_save=True, use_easyocr=use_easyocr,
+                                                validator=validator, whitelist=whitelist, use_glyphs=use_glyphs,
+                                                grammar=grammar, region_key=region_key)
+                result.capture_ms = capture_ms
+                result.frame_id = frame_id
+                farm_stats.record_ocr(result)
+                return result
+
+            return ImageManager.ocr_cached(gray, use_easyocr=use_easyocr, validator=validator,
+                                           whitelist=whitelist, use_glyphs=use_glyphs, grammar=grammar,
+                                           region_key=region_key, capture_ms=capture_ms, frame_id=frame_id)
 
         except Exception as e:
             print(f"OCR hiba: {e}")
+            return OCRResult()
+
+    @staticmethod
+    def read_text_from_regions(regions, grammar=None, use_easyocr=True, whitelist=None, use_glyphs=True):
+        """
+        Több régió OCR-je EGY frame-ből (pl. panel összes értéke)
+
+        Args:
+            (lásd read_regions)
+
+        Returns:
+            dict: {név: OCR szöveg} ("" ha a régió üres / nem olvasható)
+        """
+        results = ImageManager.read_regions(regions, grammar=grammar, use_easyocr=use_easyocr,
+                                            whitelist=whitelist, use_glyphs=use_glyphs)
+        return {name: result.text for name, result in results.items()}
+
+    @staticmethod
+    def read_regions(regions, grammar=None, use_easyocr=True, whitelist=None, use_glyphs=True):
+        """
+        Több régió OCR-je EGY frame-ből, strukturált eredménnyel
+
+        Egy capture, az összes régió kivágása, majd a kivágások párhuzamos
+        (cache-elt) OCR-je (ocr_engine.read_batch worker pool).
+
+        Args:
+            regions: dict - {név: régió}
+            grammar: Várt formátum mindegyik régióra (lásd read_text_from_region)
+            (többi: lásd read_text_from_region)
+
+        Returns:
+            dict: {név: OCRResult} (üres eredmény ha a régió üres / nem olvasható)
+        """
+        results = {name: OCRResult() for name in regions}
+
+        try:
+            capture_started = time.perf_counter()
+            frame, origin, frame_id = frame_cache.get_frame_with_id()
+            capture_ms = (time.perf_counter() - capture_started) * 1000
+        except Exception as e:
+            print(f"OCR batch capture hiba: {e}")
+            return results
+
+        pending = []
+        for name, region in regions.items():
+            if not region:
+                continue
+
+            try:
+                cropped = frame_cache.crop_frame(frame, origin, region)
+                region_frame_id = frame_id
+                if cropped is None:
+                    # Kilóg a frame-ből (pl. ablakon kívüli régió) → külön capture
+                    cropped = screen_capture.grab_region(region)
+                    region_frame_id = None
+
+                gray = cv2.cvtColor(cropped, cv2.COLOR_BGR2GRAY)
+            except Exception as e:
+                # Egy hibás régió nem dönti el a többit (üres eredmény marad)
+                print(f"OCR batch régió hiba ({name}): {e}")
+                continue
+
+            pending.append((name, gray, ImageManager._region_key(region), region_frame_id))
+
+        def read_one(item):
+            _, gray, region_key, region_frame_id = item
+            return ImageManager.ocr_cached(gray, use_easyocr=use_easyocr, whitelist=whitelist,
+                                           use_glyphs=use_glyphs, grammar=grammar, region_key=region_key,
+                                           capture_ms=capture_ms, frame_id=region_frame_id)
+
+        ocr_results = ocr_engine.read_batch(read_one, pending, default=OCRResult())
+
+        for (name, _, _, _), result in zip(pending, ocr_results):
+            results[name] = result
+
+        return results
+
+    @staticmethod
+    def burst_read(region, grammar=None, frames=DEFAULT_BURST_FRAMES, interval=DEFAULT_BURST_INTERVAL,
+                   max_ocr=3, use_easyocr=True, whitelist=None, use_glyphs=True):
+        """
+        Villogó szöveg kiolvasása (burst capture)
+
+        N frame gyors egymásutánban, pontszám (kontraszt + tinta lefedettség) szerint
+        rendezve; csak a legjobb max_ocr frame kerül OCR-re, az első illeszkedőnél kész.
+
+        Args:
+            region: dict - OCR régió
+            grammar: Várt formátum (None = a legjobb frame szövege)
+            frames: Burst frame-ek száma
+            interval: Frame-ek közti szünet (sec)
+            max_ocr: Max OCR-ezett frame
+            (többi: lásd read_text_from_region)
+
+        Returns:
+            str: OCR szöveg ("" ha egyik frame sem olvasható)
+        """
+        try:
+            burst = capture_burst(region, frames=frames, interval=interval)
+        except Exception as e:
+            print(f"Burst OCR hiba: {e}")
             return ""
 
+        region_key = ImageManager._region_key(region)
+
+        best_text = ""
+        for score, gray in burst[:max_ocr]:
+            # Villogásnál a frame-ek pixelre ismétlődnek → cache találat
+            result = ImageManager.ocr_cached(gray, use_easyocr=use_easyocr, whitelist=whitelist,
+                                             use_glyphs=use_glyphs, grammar=grammar, region_key=region_key)
+
+            if grammar is None or grammar.validate(result.text):
+                return result.text
+            best_text = best_text or result.text
+
+        return best_text
+
+    @staticmethod
+    def ocr_cached(gray, use_easyocr=True, validator=None, whitelist=None, use_glyphs=True, grammar=None,
+                   region_key=None, capture_ms=0.0, frame_id=None):
+        """
+        Cache-elt OCR egy már beolvasott (grayscale) képen
+
+        Azonos pixelek + beállítások → korábbi eredmény másolata (cached=True), egyébként
+        ocr_image() és az eredmény másolata a cache-be. Minden olvasás farm_stats-ba kerül.
+        Minden olvasási útvonal (read_region / read_regions / burst_read / konszenzus) ezt használja.
+
+        Args:
+            gray: Grayscale numpy kép
+            region_key: Régió azonosító a nyerő variáns statisztikához
+            capture_ms: A kép beolvasási ideje (eredmény metaadat)
+            frame_id: Forrás frame azonosító (None = külön capture)
+            (többi: lásd read_text_from_region)
+
+        Returns:
+            OCRResult: Eredmény
+        """
+        cache_key = ocr_cache.make_key(gray, ImageManager._cache_settings(
+            use_glyphs, use_easyocr, whitelist, validator, grammar))
+
+        cached = ocr_cache.get(cache_key)
+        if cached is not None:
+            result = cached.copy(cached=True, capture_ms=capture_ms, inference_ms=0.0, frame_id=frame_id)
+        else:
+            result = ImageManager.ocr_image(gray, use_easyocr=use_easyocr, validator=validator,
+                                            whitelist=whitelist, use_glyphs=use_glyphs, grammar=grammar,
+                                            region_key=region_key)
+            # Másolat a cache-be (a visszaadott eredmény mezői ne írják át a cache-eltet)
+            ocr_cache.put(cache_key, result.copy())
+            result.capture_ms = capture_ms
+            result.frame_id = frame_id
+
+        farm_stats.record_ocr(result)
+        return result
+
+    @staticmethod
+    def _cache_settings(use_glyphs, use_easyocr, whitelist, validator, grammar):
+        """
+        OCR cache kulcs beállítás része (minden olvasási útvonalon azonos)
+
+        A validator maga (identitás) és a grammar neve (a kulcsszavakkal együtt) kerül
+        a kulcsba; EasyOCR csak betöltött modellel számít, így a warmup alatti
+        Tesseract / glyph eredmény nem szolgálja ki a későbbi EasyOCR-es olvasást.
+        """
+        grammar_name = grammar.name if grammar is not None else None
+        easyocr_active = bool(use_easyocr and easyocr_engine.is_ready())
+        return (use_glyphs, easyocr_active, whitelist, validator, grammar_name)
+
+    @staticmethod
+    def _region_key(region):
+        """Régió azonosító (nyerő variáns statisztika)"""
+        return (region.get('x', 0), region.get('y', 0), region.get('width', 0), region.get('height', 0))
+
+    @staticmethod
+    def ocr_image(gray, debug_save=False, use_easyocr=True, validator=None, whitelist=None, use_glyphs=True,
+                  grammar=None, region_key=None):
+        """
+        OCR engine lánc egy már beolvasott (grayscale) képen
+
+        Grammar nélkül: (Glyph OCR, csak validatorral) → EasyOCR → Tesseract (párhuzamos variánsok)
+        Grammar-ral (cascade, az első illeszkedő kimenetnél kész):
+            Glyph OCR → a régión nyerő Tesseract variáns → EasyOCR → többi variáns
+
+        Args:
+            gray: Grayscale numpy kép
+            region_key: Régió azonosító a nyerő variáns statisztikához
+            (többi: lásd read_text_from_region)
+
+        Returns:
+            OCRResult: Eredmény (grammar-ral: illeszkedő, vagy ha nincs ilyen, a legjobb tipp),
+                       inference_ms kitöltve
+        """
+        inference_started = time.perf_counter()
+
+        if grammar is not None:
+            validator = validator or grammar.validate
+            whitelist = whitelist or grammar.whitelist
+            use_glyphs = use_glyphs and grammar.glyphs
+
+        # Glyph OCR csak várt formátummal (grammar / validator) - enélkül
+        # betűs szöveg is számjegyként olvasódhatna (a glyph készlet csak 0-9 : . K M %)
+        use_glyphs = use_glyphs and validator is not None
+
+        result = None
+
+        # ===== LEGGYORSABB: Glyph OCR (számjegyek, :, ., K, M, %) =====
+        if use_glyphs and glyph_recognizer.is_ready():
+            result = glyph_recognizer.read(gray, validator=validator)
+            if result and debug_save:
+                print(f"  🔢 Glyph OCR: '{result.text}' ({result.confidence:.2f})")
+
+        debug_images = {} if debug_save else None
+
+        if result:
+            pass
+        elif grammar is not None:
+            result = ImageManager._ocr_cascade(gray, validator, whitelist, use_easyocr,
+                                               region_key, debug_images, debug_save)
+        else:
+            # ===== ELSŐDLEGES: EasyOCR (ML-alapú) =====
+            result = ImageManager._read_easyocr(gray, whitelist, debug_save) if use_easyocr else OCRResult()
+
+            # ===== FALLBACK: Tesseract + Preprocessing (párhuzamosan) =====
+            # OTSU / Adaptive / CLAHE egyszerre a worker pool-ban
+            if not result:
+                result = ocr_engine.read_tesseract(gray, validator=validator,
+                                                   debug_images=debug_images,
+                                                   whitelist=whitelist)
+                if debug_save:
+                    print(f"  📝 Tesseract best ({result.variant}): '{result.text}'")
+
+        # Debug save
+        if debug_save and debug_images:
+            import datetime
+            from pathlib import Path
+            debug_dir = Path(__file__).parent / 'logs' / 'ocr_debug'
+            debug_dir.mkdir(parents=True, exist_ok=True)
+            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            for index, (name, _) in enumerate(TESSERACT_VARIANTS, 1):
+                if name in debug_images:
+                    cv2.imwrite(str(debug_dir / f"ocr_{timestamp}_{index}_{name}.png"), debug_images[name])
+            print(f"  📸 Debug képek: {debug_dir}")
+
+        result.inference_ms = (time.perf_counter() - inference_started) * 1000
+        return result
+
+    @staticmethod
+    def _ocr_cascade(gray, validator, whitelist, use_easyocr, region_key, debug_images, debug_save):
+        """
+        Grammar cascade: a régión legutóbb nyerő variáns → EasyOCR → többi variáns
+
+        Returns:
+            OCRResult: Első illeszkedő eredmény, vagy ha egyik sem illeszkedik, a legjobb tipp
+        """
+        order = ocr_engine.get_variant_order(region_key)
+
+        # 1. Nyerő variáns egyedül (tesserocr-rel ~ms)
+        first = ocr_engine.read_variant(gray, order[0], debug_images=debug_images, whitelist=whitelist)
+        if validator(first.text):
+            ocr_engine.record_win(region_key, order[0])
+            if debug_save:
+                print(f"  📝 Tesseract ({order[0]}, cascade 1.): '{first.text}'")
+            return first
+
+        # 2. EasyOCR
+        easyocr_result = ImageManager._read_easyocr(gray, whitelist, debug_save) if use_easyocr else OCRResult()
+        if validator(easyocr_result.text):
+            return easyocr_result
+
+        # 3. Maradék variánsok párhuzamosan
+        rest = ocr_engine.read_tesseract(gray, validator=validator,
+                                         debug_images=debug_images,
+                                         whitelist=whitelist,
+                                         variants=order[1:])
+        if debug_save:
+            print(f"  📝 Tesseract ({rest.variant}, cascade 3.): '{rest.text}'")
+
+        if validator(rest.text):
+            ocr_engine.record_win(region_key, rest.variant)
+            return rest
+
+        # Nincs illeszkedő: a grammar nélküli lánc preferenciája (EasyOCR, majd leghosszabb)
+        if easyocr_result:
+            return easyocr_result
+        return max(first, rest, key=lambda result: len(result.text))
+
+    @staticmethod
+    def _read_easyocr(gray, whitelist=None, debug_save=False):
+        """
+        EasyOCR olvasás (háttérben betöltött modell)
+
+        Amíg a modell nincs kész, nem vár rá → üres eredmény (a hívó a fallback engine-ekre esik vissza)
+
+        Returns:
+            OCRResult: Eredmény (üres szöveg ha nem elérhető / még töltődik / üres / hiba)
+        """
+        try:
+            result = easyocr_engine.read(gray, whitelist=whitelist)
+
+            if result is None:
+                if debug_save:
+                    print("  ⏳ EasyOCR még nincs kész, fallback engine")
+                return OCRResult()
+
+            if result and debug_save:
+                print(f"  🤖 EasyOCR: '{result.text}' ({result.confidence:.2f})")
+            return result
+
+        except Exception as e:
+            print(f"⚠️  EasyOCR hiba: {e}, Tesseract fallback...")
+            return OCRResult()
+
 
 def safe_click(coords):
     """Biztonságos kattintás"""
     if coords:
         try:
-            pyautogui.click(coords[0], coords[1])
+            input_controller.click(coords[0], coords[1])
+            frame_cache.invalidate()  # Képernyő változhatott
             return True
         except:
             return False
@@ -407,27 +1195,8 @@ def safe_click(coords):
 def press_key(key):
     """Billentyű lenyomása"""
     try:
-        key_map = {
-            'space': Key.space,
-            'enter': Key.enter,
-            'esc': Key.esc,
-            'f': 'f',
-            'b': 'b',
-            'tab': Key.tab
-        }
-        
-        if key.lower() in key_map:
-            mapped_key = key_map[key.lower()]
-            if isinstance(mapped_key, str):
-                keyboard.press(mapped_key)
-                keyboard.release(mapped_key)
-            else:
-                keyboard.press(mapped_key)
-                keyboard.release(mapped_key)
-        else:
-            keyboard.press(key)
-            keyboard.release(key)
-        
+        input_controller.press(key)
+        frame_cache.invalidate()  # Képernyő változhatott
         return True
     except Exception as e:
         print(f"Billentyű hiba: {e}")
@@ -513,39 +1282,36 @@ def find_and_close_popups(search_region=None, max_attempts=3, threshold=0.7):
         images_dir / 'popup_close.png'
     ]
 
-    # Válasszuk ki az első létező template-et
-    x_template = None
-    for template_path in x_templates:
-        if template_path.exists():
-            x_template = str(template_path)
-            break
+    # Létező template-ek (egy frame-en, párhuzamosan keresve)
+    x_templates = [str(template_path) for template_path in x_templates if template_path.exists()]
 
-    if not x_template:
+    if not x_templates:
         # Nincs template, nem tudunk X gombot keresni
         return False
 
-    print(f"[Popup Close] X gomb keresése: {Path(x_template).name}")
+    print(f"[Popup Close] X gomb keresése: {', '.join(Path(t).name for t in x_templates)}")
 
     for attempt in range(1, max_attempts + 1):
         print(f"[Popup Close] Próbálkozás {attempt}/{max_attempts}...")
 
         # Template matching (régió alapú, ha van megadva)
-        coords = ImageManager.find_image(x_template, threshold=threshold, search_region=search_region)
+        match = ImageManager.find_any(x_templates, threshold=threshold, search_region=search_region)
+        coords = match['coords'] if match else None
 
         if coords:
             print(f"[Popup Close] ✓ X gomb megtalálva → {coords}")
 
             # Kattintás az X gombra
-            time.sleep(0.3)
+            clock.sleep(0.3)
             safe_click(coords)
 
             print(f"[Popup Close] ✓ Popup bezárva")
-            time.sleep(0.5)  # Rövid várakozás a bezárás után
+            clock.sleep(0.5)  # Rövid várakozás a bezárás után
 
             return True
         else:
             print(f"[Popup Close] X gomb nem található (attempt {attempt}/{max_attempts})")
-            time.sleep(0.3)
+            clock.sleep(0.3)
 
     print(f"[Popup Close] Nincs popup ({max_attempts} próba)")
     return False
@@ -553,10 +1319,42 @@ def find_and_close_popups(search_region=None, max_attempts=3, threshold=0.7):
 
 def get_screen_center():
     """Képernyő középpont számítása"""
-    width, height = pyautogui.size()
+    width, height = input_controller.screen_size()
     return (width // 2, height // 2)
 
 
+def initialize_capture(backend=None):
+    """
+    Capture backend kiválasztása induláskor
+
+    Args:
+        backend: "auto" / "win32" / "pil" (None = settings.json capture.backend)
+
+    Returns:
+        str: Kiválasztott backend neve
+    """
+    if backend is None:
+        backend = _load_capture_settings().get('backend', 'auto')
+
+    frame_cache.invalidate()
+    return screen_capture.select_backend(backend)
+
+
+def calibrate_template_scales():
+    """
+    Template skála kalibráció az aktuális ablak méretre (induláskor)
+
+    Returns:
+        dict: scale_calibration.get_stats() vagy None ha nincs ablak
+    """
+    rect = WindowManager.get_window_rect()
+    if not rect:
+        return None
+
+    scale_calibration.calibrate((rect[2], rect[3]), force=True)
+    return scale_calibration.get_stats()
+
+
 def initialize_game_window(window_title="BlueStacks"):
     """Játék ablak inicializálása"""
     global game_window_title
@@ -4,12 +4,12 @@ Alliance help 5 perces timer-rel
 MÓDOSÍTVA: 10x retry mindkét location, 0.6 threshold, 5 perc interval
 """
 import json
-import time
 import threading
 from pathlib import Path
 
 from library import ImageManager, safe_click, wait_random, press_key
 from utils.logger import FarmLogger as log
+from utils.clock import clock
 from utils.queue_manager import queue_manager
 from utils.timer_manager import timer_manager
 
@@ -127,7 +127,7 @@ class AllianceManager:
             for _ in range(self.check_interval):
                 if not self.running:
                     break
-                time.sleep(1)
+                clock.sleep(1)
     
     def run_help(self, task_data=None):
         """
@@ -152,7 +152,7 @@ class AllianceManager:
 
                 delay = wait_random(self.human_wait_min, self.human_wait_max)
                 log.wait(f"Várakozás {delay:.1f} mp")
-                time.sleep(delay)
+                clock.sleep(delay)
 
                 log.click(f"[Alliance] Fix koordináta kattintás → ({x}, {y})")
                 safe_click((x, y))
@@ -162,7 +162,7 @@ class AllianceManager:
                 # CLEANUP: 2x SPACE (KRITIKUS: kivéve ha marching!)
                 delay = wait_random(2, 4)
                 log.wait(f"[Alliance] Várakozás {delay:.1f} mp (cleanup check)")
-                time.sleep(delay)
+                clock.sleep(delay)
 
                 # Gathering check BEFORE cleanup
                 is_marching = self._check_if_gathering_active()
@@ -170,7 +170,7 @@ class AllianceManager:
                 if not is_marching:
                     log.info("[Alliance] UI cleanup: 2x SPACE (nincs aktív gathering)")
                     press_key('space')
-                    time.sleep(0.5)
+                    clock.sleep(0.5)
                     press_key('space')
                     log.success("[Alliance] UI cleanup befejezve")
                 else:
@@ -205,7 +205,7 @@ class AllianceManager:
 
                 delay = wait_random(self.human_wait_min, self.human_wait_max)
                 log.wait(f"Várakozás {delay:.1f} mp")
-                time.sleep(delay)
+                clock.sleep(delay)
 
                 log.click(f"[Alliance] Hand kattintás → {coords}")
                 safe_click(coords)
@@ -215,7 +215,7 @@ class AllianceManager:
                 # CLEANUP: 2x SPACE (KRITIKUS: kivéve ha marching!)
                 delay = wait_random(2, 4)
                 log.wait(f"[Alliance] Várakozás {delay:.1f} mp (cleanup check)")
-                time.sleep(delay)
+                clock.sleep(delay)
 
                 # Gathering check BEFORE cleanup
                 is_marching = self._check_if_gathering_active()
@@ -223,7 +223,7 @@ class AllianceManager:
                 if not is_marching:
                     log.info("[Alliance] UI cleanup: 2x SPACE (nincs aktív gathering)")
                     press_key('space')
-                    time.sleep(0.5)
+                    clock.sleep(0.5)
                     press_key('space')
                     log.success("[Alliance] UI cleanup befejezve")
                 else:
@@ -238,7 +238,7 @@ class AllianceManager:
             # Várakozás retry előtt (kivéve utolsó próbálkozásnál)
             if attempt < self.max_retries - 1:
                 log.wait(f"[Alliance] Várakozás {self.retry_delay} sec retry előtt...")
-                time.sleep(self.retry_delay)
+                clock.sleep(self.retry_delay)
 
         # ===== VÉGLEG NEM TALÁLHATÓ =====
         log.separator('-', 60)
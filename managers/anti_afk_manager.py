@@ -4,13 +4,12 @@ Auto Farm - Anti-AFK Manager
 MÓDOSÍTVA: Mozgás alapú idle detection (click/action/search) log helyett
 """
 import json
-import time
 import threading
 from pathlib import Path
-from datetime import datetime, timedelta
 
 from library import ImageManager, safe_click, wait_random
 from utils.logger import FarmLogger as log
+from utils.clock import clock
 from utils.queue_manager import queue_manager
 
 
@@ -90,7 +89,7 @@ class AntiAFKManager:
                 log.info("[Anti-AFK] Nincs még mozgás entry, skip")
             else:
                 # Idle idő számítás
-                now = datetime.now()
+                now = clock.now()
                 idle_seconds = (now - last_movement_time).total_seconds()
                 
                 # Ha idle >= threshold
@@ -109,11 +108,11 @@ class AntiAFKManager:
             for _ in range(self.check_interval):
                 if not self.running:
                     break
-                time.sleep(1)
+                clock.sleep(1)
     
     def collect_resources(self, task_data=None):
         """
-        Resource collection (4 képből első találat)
+        Resource collection (4 képből legjobb találat, egy frame-en)
         """
         log.separator('=', 60)
         log.info("🔄 ANTI-AFK RESOURCE COLLECTION")
@@ -126,33 +125,39 @@ class AntiAFKManager:
             self.images_dir / 'resource4.png'
         ]
         
+        existing_templates = []
         for i, template_path in enumerate(resource_templates, 1):
             if not template_path.exists():
                 log.warning(f"resource{i}.png template nem található: {template_path}")
                 continue
-            
-            log.search(f"resource{i}.png keresés...")
-            
-            coords = ImageManager.find_image(str(template_path), threshold=0.7)
-            
-            if coords:
-                log.success(f"resource{i}.png megtalálva → {coords}")
-                
+            existing_templates.append(str(template_path))
+
+        if existing_templates:
+            log.search(f"Resource template-ek keresése ({len(existing_templates)} db, egy frame)...")
+
+            # Egy capture, a template-ek párhuzamosan → legjobb találat
+            match = ImageManager.find_any(existing_templates, threshold=0.7)
+
+            if match:
+                coords = match['coords']
+                log.success(f"{Path(match['template']).name} megtalálva → {coords} "
+                            f"(confidence: {match['confidence']:.2f})")
+
                 # Kattintás Y + offset (alá kattintás)
                 click_x = coords[0]
                 click_y = coords[1] + self.resource_offset_y
-                
+
                 delay = wait_random(self.human_wait_min, self.human_wait_max)
                 log.wait(f"Várakozás {delay:.1f} mp")
-                time.sleep(delay)
-                
+                clock.sleep(delay)
+
                 log.click(f"Resource kattintás → ({click_x}, {click_y})")
                 safe_click((click_x, click_y))
-                
+
                 log.success("Anti-AFK resource collection OK")
                 log.separator('=', 60)
                 return
-        
+
         # Ha egyik sem találtuk
         log.info("Egyik resource template sem található (nincs resource)")
         log.separator('=', 60)
@@ -2,13 +2,14 @@
 ROK Auto Farm - Connection Monitor
 Internet megszakadás detektálás és helyreállítás
 """
-import time
 import json
 import threading
 from pathlib import Path
 
 from library import safe_click, ImageManager, wait_random
 from utils.logger import FarmLogger as log
+from utils.clock import clock
+from utils.ocr_grammar import keywords
 from utils.queue_manager import queue_manager
 from utils.timer_manager import timer_manager
 
@@ -127,13 +128,13 @@ class ConnectionMonitor:
                     self._handle_connection_lost()
 
                 # Várakozás
-                time.sleep(self.check_interval)
+                clock.sleep(self.check_interval)
 
             except Exception as e:
                 log.error(f"[ConnectionMonitor] Monitor hiba: {e}")
                 import traceback
                 traceback.print_exc()
-                time.sleep(self.check_interval)
+                clock.sleep(self.check_interval)
 
     def _check_connection_lost(self):
         """
@@ -147,7 +148,8 @@ class ConnectionMonitor:
 
         try:
             # OCR a detection region-ön
-            ocr_text = ImageManager.read_text_from_region(self.detection_region)
+            ocr_text = ImageManager.read_text_from_region(self.detection_region,
+                                                          grammar=keywords(self.detection_text))
 
             if not ocr_text:
                 return False
@@ -293,7 +295,7 @@ class ConnectionMonitor:
 
         delay = wait_random(self.human_wait_min, self.human_wait_max)
         log.wait(f"[Recovery] Várakozás {delay:.1f} mp")
-        time.sleep(delay)
+        clock.sleep(delay)
 
         safe_click(self.confirm_button)
 
@@ -306,7 +308,7 @@ class ConnectionMonitor:
         while elapsed < self.recovery_wait:
             # Várakozás 5 másodpercig (vagy ami még hátravan)
             wait_time = min(check_interval, self.recovery_wait - elapsed)
-            time.sleep(wait_time)
+            clock.sleep(wait_time)
             elapsed += wait_time
 
             # Network check
@@ -316,7 +318,7 @@ class ConnectionMonitor:
 
                 delay = wait_random(self.human_wait_min, self.human_wait_max)
                 log.wait(f"[Recovery] Várakozás {delay:.1f} mp")
-                time.sleep(delay)
+                clock.sleep(delay)
 
                 safe_click(self.confirm_button)
 
@@ -7,9 +7,8 @@ MÓDOSÍTÁSOK (2025-12-14):
 2. Gather button fail → progressive retry (5/15/30 perc)
 3. March Time OCR → Konszenzus alapú (3 olvasás), default 5 perc ha sikertelen
 4. Gather Time validáció → max 8h (ROK max), default 3 óra ha sikertelen
-   - 60 próba retry, majd commander elküldése 3 óra idővel
+   - Burst olvasás (villogó szöveg), majd commander elküldése 3 óra idővel
 """
-import time
 import json
 import threading
 from pathlib import Path
@@ -19,10 +18,14 @@ from library import (
     ImageManager
 )
 from utils.logger import FarmLogger as log
+from utils.clock import clock
 from utils.queue_manager import queue_manager
 from utils.timer_manager import timer_manager
 from utils.time_utils import format_time, parse_time
 from utils.ocr_parser import parse_resource_value
+from utils.ocr_grammar import RESOURCE, TIME
+from utils.ocr_consensus import ocr_consensus
+from utils.farm_stats import farm_stats
 
 # Farm típusok importálása
 import sys
@@ -32,6 +35,7 @@ from farms.wheat_farm import WheatFarm
 from farms.wood_farm import WoodFarm
 from farms.stone_farm import StoneFarm
 from farms.gold_farm import GoldFarm
+from farms.base_farm import GATHER_TIME_BURSTS
 
 
 class GatheringManager:
@@ -144,19 +148,18 @@ class GatheringManager:
             resource_regions = json.load(f)
         
         resources = {}
-        
-        # OCR minden erőforrásra
+
+        regions = {}
         for resource_type in ['wheat', 'wood', 'stone', 'gold']:
             region = resource_regions.get(resource_type)
-            
-            if not region:
-                continue
-            
-            log.ocr(f"[Gathering] {resource_type.upper()} OCR → Region: (x:{region.get('x',0)}, y:{region.get('y',0)}, w:{region.get('width',0)}, h:{region.get('height',0)})")
+            if region:
+                regions[resource_type] = region
+                log.ocr(f"[Gathering] {resource_type.upper()} OCR → Region: (x:{region.get('x',0)}, y:{region.get('y',0)}, w:{region.get('width',0)}, h:{region.get('height',0)})")
 
-            # Javított OCR preprocessing használata
-            ocr_text = ImageManager.read_text_from_region(region, debug_save=False)
+        # Mind a 4 érték egy frame-ből, párhuzamos OCR (erőforrás grammar: első parse-olható kimenetnél kész)
+        ocr_texts = ImageManager.read_text_from_regions(regions, grammar=RESOURCE)
 
+        for resource_type, ocr_text in ocr_texts.items():
             if not ocr_text:
                 log.warning(f"[Gathering] {resource_type.upper()} OCR üres, skip")
                 continue
@@ -201,6 +204,7 @@ class GatheringManager:
         log.separator('=', 60)
         
         log.info(f"[Gathering] Commander #{commander_id} indítása...")
+        farm_stats.record_commander_start(commander_id)
         
         # Farm ciklus futtatása
         result = self._run_single_farm(commander_id, task_data)
@@ -208,11 +212,13 @@ class GatheringManager:
         if result == "RETRY_LATER":
             log.info(f"[Gathering] Commander #{commander_id} retry később")
             log.separator('=', 60)
+            farm_stats.record_commander_failure(commander_id)
             return
         
         if result == "RESTART":
             log.error(f"[Gathering] Commander #{commander_id} HIBA")
             log.separator('=', 60)
+            farm_stats.record_commander_failure(commander_id)
             return
         
         # Sikeres: march_time + gather_time
@@ -234,6 +240,8 @@ class GatheringManager:
         )
         
         log.success(f"[Gathering] Commander #{commander_id} timer beállítva: {format_time(total_time)} múlva restart")
+
+        farm_stats.record_gather(commander_id, self.selected_resource, march_time, gather_time)
         
         log.separator('=', 60)
         log.success(f"[Gathering] Commander #{commander_id} SIKERES BEFEJEZÉS")
@@ -280,7 +288,7 @@ class GatheringManager:
             log.info(f"[Gathering] [1/13] SPACE billentyű")
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"[Gathering] Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
             log.action("[Gathering] SPACE lenyomása")
             press_key('space')
             log.success(f"[Gathering] SPACE OK")
@@ -289,7 +297,7 @@ class GatheringManager:
             log.info(f"[Gathering] [2/13] B billentyű (térkép)")
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"[Gathering] Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
             log.action("[Gathering] B billentyű lenyomása")
             press_key('b')
             log.success(f"[Gathering] B OK")
@@ -303,7 +311,7 @@ class GatheringManager:
             log.info(f"[Gathering] [3/13] Resource icon kattintás")
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"[Gathering] Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
             coords = farm.coords.get('resource_icon', [0, 0])
             log.click(f"[Gathering] {farm.farm_type.upper()} ikon → {coords}")
             safe_click(coords)
@@ -313,7 +321,7 @@ class GatheringManager:
             log.info(f"[Gathering] [4/13] Level button kattintás")
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"[Gathering] Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
             coords = farm.coords.get('level_button', [0, 0])
             log.click(f"[Gathering] Szint gomb → {coords}")
             safe_click(coords)
@@ -323,7 +331,7 @@ class GatheringManager:
             log.info(f"[Gathering] [5/13] Search button kattintás")
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"[Gathering] Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
             coords = farm.coords.get('search_button', [0, 0])
             log.click(f"[Gathering] Keresés gomb → {coords}")
             safe_click(coords)
@@ -332,7 +340,7 @@ class GatheringManager:
             # ===== ÚJ: 5a. March.png detekció (MÓDOSÍTÁS #1) =====
             log.info(f"[Gathering] [5a/13] March.png detekció")
             delay = wait_random(self.human_wait_min, self.human_wait_max)
-            time.sleep(delay)
+            clock.sleep(delay)
             
             march_template = self.images_dir / 'march.png'
             
@@ -342,57 +350,41 @@ class GatheringManager:
                 region = self.march_detection_region
                 log.info(f"[Gathering] Keresés régióban: (x:{region['x']}, y:{region['y']}, w:{region['width']}, h:{region['height']})")
                 
-                # Screenshot a régióból
-                from PIL import ImageGrab
-                import cv2
-                import numpy as np
-                
-                x, y, w, h = region['x'], region['y'], region['width'], region['height']
-                region_img = ImageGrab.grab(bbox=(x, y, x + w, y + h))
-                
-                # Template matching
-                region_np = cv2.cvtColor(np.array(region_img), cv2.COLOR_RGB2BGR)
-                template = cv2.imread(str(march_template))
-                
-                if template is not None:
-                    result = cv2.matchTemplate(region_np, template, cv2.TM_CCOEFF_NORMED)
-                    min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+                # Csak a régió capture + matching (abszolút koordináták)
+                match_coords = ImageManager.find_image(str(march_template), threshold=0.7, search_region=region)
+
+                if match_coords:
+                    log.warning(f"[Gathering] march.png megtalálva régióban → {match_coords}")
+                    log.warning("[Gathering] Commander már úton van!")
+                    log.info("[Gathering] Visszalépés és 5 perc retry")
+
+                    # Képernyő közép kattintás (bezárás)
+                    delay = wait_random(self.human_wait_min, self.human_wait_max)
+                    log.wait(f"[Gathering] Várakozás {delay:.1f} mp")
+                    clock.sleep(delay)
+
+                    screen_center = get_screen_center()
+                    log.click(f"[Gathering] Képernyő közép → {screen_center}")
+                    safe_click(screen_center)
+                    clock.sleep(1)
                     
-                    if max_val >= 0.7:
-                        match_x = x + max_loc[0] + template.shape[1] // 2
-                        match_y = y + max_loc[1] + template.shape[0] // 2
-                        
-                        log.warning(f"[Gathering] march.png megtalálva régióban → ({match_x}, {match_y})")
-                        log.warning("[Gathering] Commander már úton van!")
-                        log.info("[Gathering] Visszalépés és 5 perc retry")
-
-                        # Képernyő közép kattintás (bezárás)
-                        delay = wait_random(self.human_wait_min, self.human_wait_max)
-                        log.wait(f"[Gathering] Várakozás {delay:.1f} mp")
-                        time.sleep(delay)
-
-                        screen_center = get_screen_center()
-                        log.click(f"[Gathering] Képernyő közép → {screen_center}")
-                        safe_click(screen_center)
-                        time.sleep(1)
-                        
-                        # SPACE
-                        log.action("[Gathering] SPACE lenyomása")
-                        press_key('space')
-                        
-                        # 5 perc múlva újra
-                        timer_manager.add_timer(
-                            timer_id=f"commander_{commander_id}_march_retry",
-                            deadline_seconds=300,
-                            task_id=f"commander_{commander_id}_restart",
-                            task_type="gathering",
-                            data=task_data
-                        )
-                        
-                        log.success(f"[Gathering] Commander #{commander_id} retry: 5 perc múlva")
-                        return "RETRY_LATER"
-                    else:
-                        log.success("[Gathering] march.png nem található régióban - commander elérhető")
+                    # SPACE
+                    log.action("[Gathering] SPACE lenyomása")
+                    press_key('space')
+                    
+                    # 5 perc múlva újra
+                    timer_manager.add_timer(
+                        timer_id=f"commander_{commander_id}_march_retry",
+                        deadline_seconds=300,
+                        task_id=f"commander_{commander_id}_restart",
+                        task_type="gathering",
+                        data=task_data
+                    )
+                    
+                    log.success(f"[Gathering] Commander #{commander_id} retry: 5 perc múlva")
+                    return "RETRY_LATER"
+                else:
+                    log.success("[Gathering] march.png nem található régióban - commander elérhető")
             
             log.info(f"[Gathering] Step 4/5: Farm process")
             log.separator('-', 60)
@@ -403,7 +395,7 @@ class GatheringManager:
             log.info(f"[Gathering] [6/13] Gather button keresés")
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"[Gathering] Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
             
             log.search(f"[Gathering] gather.png keresés...")
             gather_coords = farm.find_gather_button()
@@ -435,11 +427,11 @@ class GatheringManager:
                 # Bezárás (2x SPACE = clean state)
                 delay = wait_random(self.human_wait_min, self.human_wait_max)
                 log.wait(f"[Gathering] Várakozás {delay:.1f} mp")
-                time.sleep(delay)
+                clock.sleep(delay)
 
                 log.action("[Gathering] SPACE #1 lenyomása (kigugrás)")
                 press_key('space')
-                time.sleep(1.0)
+                clock.sleep(1.0)
                 log.action("[Gathering] SPACE #2 lenyomása (városba vissza)")
                 press_key('space')
                 log.info("[Gathering] 2x SPACE → clean state (városban, minden bezárva)")
@@ -462,7 +454,7 @@ class GatheringManager:
 
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"[Gathering] Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
 
             log.click(f"[Gathering] Gather gomb kattintás")
             safe_click(gather_coords)
@@ -472,7 +464,7 @@ class GatheringManager:
             log.info(f"[Gathering] [7/13] New troops kattintás")
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"[Gathering] Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
             coords = farm.coords.get('new_troops', [0, 0])
             log.click(f"[Gathering] New troops → {coords}")
             safe_click(coords)
@@ -482,23 +474,16 @@ class GatheringManager:
             log.info(f"[Gathering] [8/13] March Time OCR (konszenzus)")
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"[Gathering] Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
 
             log.ocr(f"[Gathering] March Time kiolvasása (konszenzus)...")
-            # Konszenzus: 3 OCR olvasás
-            from collections import Counter
-            march_readings = []
-            for sub_attempt in range(3):
-                if sub_attempt > 0:
-                    time.sleep(0.2)
-                temp_march = farm.read_time('march_time', debug_save=False)
-                if temp_march:
-                    march_readings.append(temp_march)
-
-            if march_readings:
-                march_counter = Counter(march_readings)
-                march_time, votes = march_counter.most_common(1)[0]
-                log.success(f"[Gathering] March Time konszenzus ({votes}/{len(march_readings)}): {format_time(march_time)} ({march_time} sec)")
+            # Konszenzus: 3 frame, párhuzamos OCR, szavazás a parse-olt időn
+            consensus = ocr_consensus.read(farm.time_regions.get('march_time', {}), grammar=TIME, votes=3)
+
+            if consensus['valid']:
+                march_time = consensus['value']
+                log.success(f"[Gathering] March Time konszenzus ({consensus['votes']}/{consensus['total']}, "
+                            f"{consensus['latency']:.2f}s): {format_time(march_time)} ({march_time} sec)")
             else:
                 march_time = 300  # Default 5 perc
                 log.warning(f"[Gathering] March Time OCR hiba! Default: 5 perc (300 sec)")
@@ -507,7 +492,7 @@ class GatheringManager:
             log.info(f"[Gathering] [9/13] March button kattintás")
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"[Gathering] Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
             coords = farm.coords.get('march_button', [0, 0])
             log.click(f"[Gathering] March gomb → {coords}")
             safe_click(coords)
@@ -527,45 +512,41 @@ class GatheringManager:
             log.info(f"[Gathering] [11/13] Képernyő közép kattintás")
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"[Gathering] Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
             screen_center = get_screen_center()
             coords = farm.coords.get('screen_center', screen_center)
             log.click(f"[Gathering] Képernyő közép → {coords}")
             safe_click(coords)
             log.success(f"[Gathering] Screen center OK")
 
-            # 12. Gather Time OCR (max 60 retry, default 3 óra ha sikertelen)
-            log.info(f"[Gathering] [12/13] Gather Time OCR (max 60 retry)")
+            # 12. Gather Time OCR (burst olvasás, default 3 óra ha sikertelen)
+            log.info(f"[Gathering] [12/13] Gather Time OCR (max {GATHER_TIME_BURSTS} burst)")
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"[Gathering] Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
 
             gather_time = None
-            for attempt in range(60):
-                log.ocr(f"[Gathering] Gather Time kiolvasás (kísérlet {attempt+1}/60)...")
-                # Debug screenshot minden 5. próbálkozásnál
-                debug_save = ((attempt + 1) % 5 == 0)
-                temp_time = farm.read_time('gather_time', debug_save=debug_save)
+            for attempt in range(GATHER_TIME_BURSTS):
+                log.ocr(f"[Gathering] Gather Time kiolvasás (burst {attempt+1}/{GATHER_TIME_BURSTS})...")
+                # Egy burst ≈ 1 villogási ciklus, csak a legjobb frame-ek OCR-je
+                temp_time = farm.read_time('gather_time', burst=True)
 
                 # VALIDÁCIÓ: max 8 óra (28800 sec) - ROK max gather time
                 if temp_time and temp_time <= 28800:
                     gather_time = temp_time
                     # Sikeres OCR → failure counter reset
                     self.gather_time_failure_count[commander_id] = 0
-                    log.success(f"[Gathering] Gather Time: {format_time(gather_time)} ({gather_time} sec) - {attempt+1}. próba")
+                    log.success(f"[Gathering] Gather Time: {format_time(gather_time)} ({gather_time} sec) - {attempt+1}. burst")
                     break
                 elif temp_time and temp_time > 28800:
                     log.warning(f"[Gathering] Gather Time túl nagy: {format_time(temp_time)} > 8h, retry...")
-
-                if (attempt + 1) % 10 == 0:
-                    log.warning(f"[Gathering] Gather Time OCR hiba ({attempt+1}/60), retry...")
-
-                time.sleep(1.0)
+                else:
+                    log.warning(f"[Gathering] Gather Time OCR hiba ({attempt+1}/{GATHER_TIME_BURSTS}), retry...")
 
             if gather_time is None:
                 # OCR sikertelen → default 3 óra (10800 sec) és újrapróbálás
                 gather_time = 10800  # 3 óra default
-                log.warning(f"[Gathering] ⚠️ Gather Time OCR 60 próba után sikertelen!")
+                log.warning(f"[Gathering] ⚠️ Gather Time OCR {GATHER_TIME_BURSTS} burst után sikertelen!")
                 log.warning(f"[Gathering] ⚠️ Default 3 óra (10800 sec) beállítva, commander elküldve")
                 log.warning(f"[Gathering] ⚠️ 3 óra múlva újra megpróbálja...")
 
@@ -573,7 +554,7 @@ class GatheringManager:
             log.info(f"[Gathering] [13/13] SPACE (bezárás)")
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"[Gathering] Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
             log.action("[Gathering] SPACE lenyomása")
             press_key('space')
             log.success(f"[Gathering] SPACE OK")
@@ -618,7 +599,7 @@ class GatheringManager:
         while elapsed < wait_duration:
             # Várakozás 5 másodpercig (vagy ami még hátravan)
             wait_time = min(check_interval, wait_duration - elapsed)
-            time.sleep(wait_time)
+            clock.sleep(wait_time)
             elapsed += wait_time
 
             # Alliance help check (csak az 1-es pozíció)
@@ -628,31 +609,18 @@ class GatheringManager:
 
                 log.info(f"[Gathering] Alliance help check (marching közben, {elapsed}s / {wait_duration}s)")
 
-                # Template matching az 1-es pozícióban
+                # Template matching az 1-es pozícióban: csak a pont körüli régió
+                # (a találat középpontja max ±50 px-re a fix ponttól)
                 if hand_template.exists():
-                    # Kicsi régió az 1-es pozíció körül (pl. 100x100 px)
-                    # ImageManager.find_image használata (nincs find_image_in_region!)
-                    # Teljes képernyőn keres, de az eredményt ellenőrizzük hogy a régióban van-e
-                    coords = ImageManager.find_image(str(hand_template), threshold=0.6)
-
-                    # Ellenőrzés: a koordináta a fix pont körüli régióban van-e?
-                    if coords:
-                        region_x_min = max(0, x - 50)
-                        region_y_min = max(0, y - 50)
-                        region_x_max = x + 50
-                        region_y_max = y + 50
-
-                        found_x, found_y = coords
-                        if not (region_x_min <= found_x <= region_x_max and region_y_min <= found_y <= region_y_max):
-                            # Kívül esik a régión
-                            coords = None
+                    search_region = ImageManager.region_around((x, y), 50, str(hand_template))
+                    coords = ImageManager.find_image(str(hand_template), threshold=0.6, search_region=search_region)
 
                     if coords:
                         log.success(f"[Gathering] Alliance hand MEGTALÁLVA marching közben → {coords}")
 
                         delay = wait_random(self.human_wait_min, self.human_wait_max)
                         log.wait(f"[Gathering] Várakozás {delay:.1f} mp (alliance help)")
-                        time.sleep(delay)
+                        clock.sleep(delay)
 
                         log.click(f"[Gathering] Alliance help kattintás (marching közben) → {coords}")
                         safe_click(coords)
@@ -11,18 +11,23 @@ ROK Auto Farm - Training Manager
 - Gather troops opcionális (idle esetén kihagyva)
 - Konszenzus alapú OCR (3 olvasás, többségi szavazás)
 """
-import time
 import json
 import re
 from pathlib import Path
-from collections import Counter
 
 from library import safe_click, press_key, wait_random, find_and_close_popups, is_garbage_ocr_text
 from utils.logger import FarmLogger as log
+from utils.clock import clock
 from utils.queue_manager import queue_manager
 from utils.timer_manager import timer_manager
 from utils.time_utils import parse_time, format_time
 from library import ImageManager
+from utils.ocr_grammar import TIME, DIGIT_TIME, TIMER_STATUS, keywords
+from utils.ocr_consensus import ocr_consensus
+
+
+# Erőforrás hiány feliratok
+INSUFFICIENT = keywords('insufficient', 'not enough', 'need', 'require')
 
 
 class TrainingManager:
@@ -149,7 +154,7 @@ class TrainingManager:
             # 1. Queue menü megnyitása
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"[Training] Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
 
             log.click(f"[Training] PANEL MEGNYITÁS → {open_panel_coords}")
             safe_click(open_panel_coords)
@@ -157,6 +162,7 @@ class TrainingManager:
             log.success("[Training] Panel megnyitva")
 
             # 2. Mind a 4 épület ellenőrzése
+            enabled_buildings = []
             for building_name in self.BUILDINGS:
                 # Ellenőrzés: enabled-e
                 building_config = self.buildings.get(building_name, {})
@@ -166,15 +172,21 @@ class TrainingManager:
                     log.info(f"[Training] {building_name.upper()}: Disabled, skip")
                     continue
 
+                enabled_buildings.append(building_name)
+
+            # Státuszok egy menetben (panel frame-enként 1 capture + párhuzamos OCR)
+            statuses = self._read_panel_statuses(enabled_buildings)
+
+            for index, building_name in enumerate(enabled_buildings):
                 # Épület ellenőrzés
-                result = self._check_and_process_building(building_name)
+                result = self._check_and_process_building(building_name, statuses.get(building_name))
 
                 # Ha restart szükséges
                 if result['action'] == 'restart_needed':
                     # Queue menü bezárása
                     delay = wait_random(self.human_wait_min, self.human_wait_max)
                     log.wait(f"[Training] Várakozás {delay:.1f} mp")
-                    time.sleep(delay)
+                    clock.sleep(delay)
 
                     log.click(f"[Training] PANEL BEZÁRÁS → {close_panel_coords}")
                     safe_click(close_panel_coords)
@@ -187,19 +199,22 @@ class TrainingManager:
                     # Queue menü ÚJRA megnyitása (következő épülethez)
                     delay = wait_random(self.human_wait_min, self.human_wait_max)
                     log.wait(f"[Training] Várakozás {delay:.1f} mp")
-                    time.sleep(delay)
+                    clock.sleep(delay)
 
                     log.click(f"[Training] PANEL ÚJRA MEGNYITÁS → {open_panel_coords}")
                     safe_click(open_panel_coords)
                     queue_open = True
                     log.success("[Training] Panel újra megnyitva")
 
+                    # A korábbi batch idők elavultak → maradék épületek újraolvasása
+                    statuses = self._read_panel_statuses(enabled_buildings[index + 1:])
+
         finally:
             # Panel bezárása (ha még nyitva)
             if queue_open:
                 delay = wait_random(self.human_wait_min, self.human_wait_max)
                 log.wait(f"[Training] Várakozás {delay:.1f} mp")
-                time.sleep(delay)
+                clock.sleep(delay)
 
                 log.click(f"[Training] PANEL BEZÁRÁS → {close_panel_coords}")
                 safe_click(close_panel_coords)
@@ -208,18 +223,18 @@ class TrainingManager:
                 # 2x SPACE reset → clean state biztosan
                 delay = wait_random(self.human_wait_min, self.human_wait_max)
                 log.wait(f"[Training] Várakozás {delay:.1f} mp")
-                time.sleep(delay)
+                clock.sleep(delay)
 
                 log.action("[Training] SPACE #1 lenyomása (kigugrás)")
                 press_key('space')
-                time.sleep(1.0)
+                clock.sleep(1.0)
                 log.action("[Training] SPACE #2 lenyomása (városba vissza)")
                 press_key('space')
 
                 # POPUP CLEANUP: Várakozás
                 delay = wait_random(2, 4)
                 log.wait(f"[Training] Várakozás {delay:.1f} mp (popup cleanup)")
-                time.sleep(delay)
+                clock.sleep(delay)
 
                 log.info("[Training] Scan befejezve → 2x SPACE → clean state")
 
@@ -252,7 +267,7 @@ class TrainingManager:
         region_1 = self.time_regions.get('upgrade_name_region_1')
         if region_1 and region_1.get('x', 0) != 0:
             log.ocr(f"[Training] {building_name.upper()} upgrade check → Region 1")
-            ocr_text_1 = ImageManager.read_text_from_region(region_1)
+            ocr_text_1 = ImageManager.read_text_from_region(region_1, grammar=keywords(search_name))
             if ocr_text_1:
                 log.info(f"[Training] Upgrade Region 1 OCR: '{ocr_text_1}'")
                 if search_name.lower() in ocr_text_1.lower():
@@ -270,7 +285,7 @@ class TrainingManager:
         region_2 = self.time_regions.get('upgrade_name_region_2')
         if region_2 and region_2.get('x', 0) != 0:
             log.ocr(f"[Training] {building_name.upper()} upgrade check → Region 2")
-            ocr_text_2 = ImageManager.read_text_from_region(region_2)
+            ocr_text_2 = ImageManager.read_text_from_region(region_2, grammar=keywords(search_name))
             if ocr_text_2:
                 log.info(f"[Training] Upgrade Region 2 OCR: '{ocr_text_2}'")
                 if search_name.lower() in ocr_text_2.lower():
@@ -304,10 +319,11 @@ class TrainingManager:
         log.ocr(f"[Training] {building_name.upper()} UPGRADE TIME OCR → {region_name}")
 
         for attempt in range(1, max_attempts + 1):
-            ocr_text = ImageManager.read_text_from_region(region)
+            # Csak HH:MM:SS (számjegy + kettőspont whitelist)
+            ocr_text = ImageManager.read_text_from_region(region, grammar=DIGIT_TIME)
 
             if not ocr_text:
-                time.sleep(0.7)
+                clock.sleep(0.7)
                 continue
 
             log.info(f"[Training] {building_name.upper()} UPGRADE TIME ({region_name}, kísérlet {attempt}/{max_attempts}): '{ocr_text}'")
@@ -319,7 +335,7 @@ class TrainingManager:
                 log.success(f"[Training] {building_name.upper()} → UPGRADE TIME: {format_time(time_sec)} ({time_sec} sec)")
                 return time_sec
 
-            time.sleep(0.7)
+            clock.sleep(0.7)
 
         log.warning(f"[Training] {building_name.upper()} UPGRADE TIME OCR sikertelen → fallback 2 óra")
         return 7200
@@ -348,103 +364,151 @@ class TrainingManager:
 
         for main_attempt in range(1, max_attempts + 1):
             # ===== KONSZENZUS ALAPÚ OCR =====
-            # 3 OCR olvasás gyors egymásutánban (0.2s késleltetéssel)
-            ocr_results = []
-
-            for sub_attempt in range(consensus_count):
-                if sub_attempt > 0:
-                    time.sleep(0.2)  # Rövid delay OCR-ek között
-
-                debug_save = (main_attempt % 5 == 0 and sub_attempt == 0)
-                ocr_text = ImageManager.read_text_from_region(region, debug_save=debug_save)
-
-                if ocr_text:  # Csak nem-üres eredményeket számolunk
-                    ocr_results.append(ocr_text)
+            # consensus_count frame, párhuzamos OCR, többségi szavazás
+            consensus = ocr_consensus.read(region, grammar=TIMER_STATUS, votes=consensus_count)
+            consensus_text = consensus['text']
 
             # Ha nincs egyetlen valid OCR sem → retry
-            if not ocr_results:
-                log.warning(f"[Training] {building_name.upper()} OCR üres ({consensus_count} próba), retry {main_attempt}/{max_attempts}")
-                time.sleep(0.7)
+            if not consensus_text:
+                log.warning(f"[Training] {building_name.upper()} OCR üres ({consensus['total']} próba), retry {main_attempt}/{max_attempts}")
+                clock.sleep(0.7)
                 continue
 
-            # Leggyakoribb eredmény kiválasztása (többségi szavazás)
-            ocr_counter = Counter(ocr_results)
-            consensus_text, consensus_votes = ocr_counter.most_common(1)[0]
-
-            log.info(f"[Training] {building_name.upper()} OCR konszenzus ({consensus_votes}/{len(ocr_results)}): '{consensus_text}'")
-            if len(ocr_results) > 1:
-                log.info(f"[Training]   └─ Összes: {ocr_results}")
+            log.info(f"[Training] {building_name.upper()} OCR konszenzus ({consensus['votes']}/{consensus['total']}, "
+                     f"{consensus['latency']:.2f}s): '{consensus_text}'")
+            if len(consensus['readings']) > 1:
+                log.info(f"[Training]   └─ Összes: {consensus['readings']}")
             # ======================================
 
-            # ===== 1. COMPLETED EXPLICIT CHECK =====
-            if re.search(r'completed', consensus_text.lower()):
-                log.success(f"[Training] {building_name.upper()} → COMPLETED")
-                return {'type': 'completed', 'value': None}
+            # ===== 1-3. COMPLETED / IDLE / IDŐ =====
+            status = self._classify_status_text(building_name, consensus_text)
+            if status is not None:
+                return status
 
-            # ===== 2. IDLE EXPLICIT CHECK =====
-            # CSAK akkor IDLE, ha tényleg "idle" pattern van benne!
-            text_lower = consensus_text.lower().replace(' ', '').replace('-', '').replace('_', '')
-            idle_patterns = ['idle', 'idl', 'ldle', 'idie', 'id1e', '1dle', 'idel']
+            # ===== 4. SIKERTELEN OCR → INTELLIGENS POPUP DETEKTÁLÁS =====
+            # Nem értelmezhető szöveg (sikertelen OCR); szemét szövegnél popup valószínű
+            log.warning(f"[Training] {building_name.upper()} OCR nem értelmezhető ('{consensus_text}'), retry {main_attempt}/{max_attempts}")
 
-            if any(pattern in text_lower for pattern in idle_patterns):
-                log.success(f"[Training] {building_name.upper()} → IDLE (OCR: '{consensus_text}')")
-                return {'type': 'idle', 'value': None}
+            # INTELLIGENS POPUP DETEKTÁLÁS
+            # Csak ha 2+ egymást követő sikertelen OCR van ÉS szemét szöveg
+            if main_attempt >= 2 and is_garbage_ocr_text(consensus_text):
+                log.warning(f"⚠️ Szemét OCR szöveg detektálva: '{consensus_text}' → Popup valószínű!")
+                log.info("🔍 X gomb keresés aktiválva (popup bezárás)...")
 
-            # ===== 3. IDŐ PARSE KÍSÉRLET =====
-            time_sec = parse_time(consensus_text)
+                # X gomb keresés és bezárás (régió alapú)
+                search_region = self.popup_regions.get('popup_search_region')
+                popup_closed = find_and_close_popups(search_region=search_region, max_attempts=2, threshold=0.75)
 
-            if time_sec is not None and time_sec > 0:
-                log.success(f"[Training] {building_name.upper()} → TIME: {format_time(time_sec)} ({time_sec} sec)")
-                return {'type': 'time', 'value': time_sec}
+                if popup_closed:
+                    log.success("✅ Popup bezárva! Queue panel újranyitása...")
 
-            if time_sec == 0:
-                log.success(f"[Training] {building_name.upper()} → COMPLETED (OCR: '{consensus_text}')")
-                return {'type': 'completed', 'value': 0}
+                    # Queue panel újranyitása
+                    delay = wait_random(2, 4)
+                    clock.sleep(delay)
 
-            # ===== 4. SIKERTELEN OCR → INTELLIGENS POPUP DETEKTÁLÁS =====
-            # Ha parse_time None-t adott (sikertelen OCR) ÉS szemét szöveg
-            if time_sec is None:
-                log.warning(f"[Training] {building_name.upper()} OCR nem értelmezhető ('{consensus_text}'), retry {main_attempt}/{max_attempts}")
-
-                # INTELLIGENS POPUP DETEKTÁLÁS
-                # Csak ha 2+ egymást követő sikertelen OCR van ÉS szemét szöveg
-                if main_attempt >= 2 and is_garbage_ocr_text(consensus_text):
-                    log.warning(f"⚠️ Szemét OCR szöveg detektálva: '{consensus_text}' → Popup valószínű!")
-                    log.info("🔍 X gomb keresés aktiválva (popup bezárás)...")
-
-                    # X gomb keresés és bezárás (régió alapú)
-                    search_region = self.popup_regions.get('popup_search_region')
-                    popup_closed = find_and_close_popups(search_region=search_region, max_attempts=2, threshold=0.75)
-
-                    if popup_closed:
-                        log.success("✅ Popup bezárva! Queue panel újranyitása...")
-
-                        # Queue panel újranyitása
-                        delay = wait_random(2, 4)
-                        time.sleep(delay)
-
-                        # Queue menü bezárása + újranyitása
-                        coords = self.training_coords.get('close_queue_menu', [0, 0])
-                        safe_click(coords)
-                        time.sleep(1.0)
-
-                        coords = self.training_coords.get('open_queue_menu', [0, 0])
-                        safe_click(coords)
-                        time.sleep(1.0)
-
-                        # OCR újrapróbálás (ne növeljük a main_attempt-et, csak retry)
-                        log.info(f"[Training] {building_name.upper()} OCR újrapróbálás (popup bezárás után)...")
-                        continue
-                    else:
-                        log.warning("⚠️ X gomb nem található")
+                    # Queue menü bezárása + újranyitása
+                    coords = self.training_coords.get('close_queue_menu', [0, 0])
+                    safe_click(coords)
+                    clock.sleep(1.0)
 
-                time.sleep(0.7)
-                continue
+                    coords = self.training_coords.get('open_queue_menu', [0, 0])
+                    safe_click(coords)
+                    clock.sleep(1.0)
+
+                    # OCR újrapróbálás (ne növeljük a main_attempt-et, csak retry)
+                    log.info(f"[Training] {building_name.upper()} OCR újrapróbálás (popup bezárás után)...")
+                    continue
+                else:
+                    log.warning("⚠️ X gomb nem található")
+
+            clock.sleep(0.7)
+            continue
 
         log.warning(f"[Training] {building_name.upper()} OCR sikertelen {max_attempts} próba után!")
         return {'type': 'unknown', 'value': None}
 
-    def _check_and_process_building(self, building_name):
+    def _classify_status_text(self, building_name, text):
+        """
+        Státusz szöveg értelmezése (completed / idle / idő)
+
+        Args:
+            building_name: str (log-hoz)
+            text: OCR (konszenzus) szöveg
+
+        Returns:
+            dict: {'type': 'time'/'completed'/'idle', 'value': seconds/None}, None ha nem értelmezhető
+        """
+        # ===== 1. COMPLETED EXPLICIT CHECK =====
+        if re.search(r'completed', text.lower()):
+            log.success(f"[Training] {building_name.upper()} → COMPLETED")
+            return {'type': 'completed', 'value': None}
+
+        # ===== 2. IDLE EXPLICIT CHECK =====
+        # CSAK akkor IDLE, ha tényleg "idle" pattern van benne!
+        text_lower = text.lower().replace(' ', '').replace('-', '').replace('_', '')
+        idle_patterns = ['idle', 'idl', 'ldle', 'idie', 'id1e', '1dle', 'idel']
+
+        if any(pattern in text_lower for pattern in idle_patterns):
+            log.success(f"[Training] {building_name.upper()} → IDLE (OCR: '{text}')")
+            return {'type': 'idle', 'value': None}
+
+        # ===== 3. IDŐ PARSE KÍSÉRLET =====
+        time_sec = parse_time(text)
+
+        if time_sec is not None and time_sec > 0:
+            log.success(f"[Training] {building_name.upper()} → TIME: {format_time(time_sec)} ({time_sec} sec)")
+            return {'type': 'time', 'value': time_sec}
+
+        if time_sec == 0:
+            log.success(f"[Training] {building_name.upper()} → COMPLETED (OCR: '{text}')")
+            return {'type': 'completed', 'value': 0}
+
+        return None
+
+    def _read_panel_statuses(self, building_names, consensus_count=3):
+        """
+        Több building státusza egyszerre (olvasásonként egy frame, párhuzamos OCR)
+
+        Ami nem értelmezhető, kimarad → a hívó a building-enkénti
+        _read_training_status() retry logikára esik vissza.
+
+        Args:
+            building_names: Building nevek
+            consensus_count: Szavazatok (frame-ek) száma körönként (ocr_consensus.read_many)
+
+        Returns:
+            dict: {building_name: status dict}
+        """
+        regions = {}
+        for building_name in building_names:
+            region = self.time_regions.get(f"{building_name}_time")
+            if region:
+                regions[building_name] = region
+
+        if not regions:
+            return {}
+
+        log.ocr(f"[Training] Panel batch OCR → {', '.join(b.upper() for b in regions)}")
+
+        # Konszenzus az összes building-re: egy capture / szavazat, párhuzamos OCR
+        consensus = ocr_consensus.read_many(regions, grammar=TIMER_STATUS, votes=consensus_count)
+
+        statuses = {}
+        for building_name, result in consensus.items():
+            consensus_text = result['text']
+            if not consensus_text:
+                continue
+
+            log.info(f"[Training] {building_name.upper()} OCR konszenzus ({result['votes']}/{result['total']}, "
+                     f"{result['latency']:.2f}s): '{consensus_text}'")
+
+            status = self._classify_status_text(building_name, consensus_text)
+            if status is not None:
+                statuses[building_name] = status
+
+        return statuses
+
+    def _check_and_process_building(self, building_name, status=None):
         """
         Egy épület teljes ellenőrzése és feldolgozása
 
@@ -452,6 +516,7 @@ class TrainingManager:
 
         Args:
             building_name: str (barracks, archery, stable, siege)
+            status: Előre (panel batch-ben) kiolvasott státusz, None = OCR most
 
         Returns:
             dict: {
@@ -462,8 +527,8 @@ class TrainingManager:
         """
         log.info(f"[Training] {building_name.upper()} ellenőrzése...")
 
-        # 1. Épület time OCR
-        result = self._read_training_status(building_name)
+        # 1. Épület time OCR (ha nincs batch-ből)
+        result = status or self._read_training_status(building_name)
         result_type = result.get('type')
         result_value = result.get('value')
 
@@ -496,7 +561,7 @@ class TrainingManager:
             if upgrade_check_coords != [0, 0]:
                 delay = wait_random(self.human_wait_min, self.human_wait_max)
                 log.wait(f"[Training] Várakozás {delay:.1f} mp")
-                time.sleep(delay)
+                clock.sleep(delay)
 
                 log.click(f"[Training] UPGRADE MENÜ megnyitás → {upgrade_check_coords}")
                 safe_click(upgrade_check_coords)
@@ -508,7 +573,7 @@ class TrainingManager:
             if upgrade_check_coords != [0, 0]:
                 delay = wait_random(self.human_wait_min, self.human_wait_max)
                 log.wait(f"[Training] Várakozás {delay:.1f} mp")
-                time.sleep(delay)
+                clock.sleep(delay)
 
                 log.click(f"[Training] UPGRADE MENÜ bezárás → {upgrade_check_coords}")
                 safe_click(upgrade_check_coords)
@@ -597,10 +662,10 @@ class TrainingManager:
         log.ocr(f"[Training] {building_name.upper()} TIME OCR (confirm után) → Region: (x:{region.get('x',0)}, y:{region.get('y',0)})")
 
         for attempt in range(1, max_attempts + 1):
-            ocr_text = ImageManager.read_text_from_region(region)
+            ocr_text = ImageManager.read_text_from_region(region, grammar=TIME)
 
             if not ocr_text:
-                time.sleep(0.5)
+                clock.sleep(0.5)
                 continue
 
             log.info(f"[Training] {building_name.upper()} TIME OCR (kísérlet {attempt}/{max_attempts}): '{ocr_text}'")
@@ -612,7 +677,7 @@ class TrainingManager:
                 log.success(f"[Training] {building_name.upper()} → TRAINING TIME: {format_time(time_sec)} ({time_sec} sec)")
                 return time_sec
 
-            time.sleep(0.5)
+            clock.sleep(0.5)
 
         log.warning(f"[Training] {building_name.upper()} TIME OCR sikertelen {max_attempts} kísérlet után")
         return None
@@ -638,22 +703,24 @@ class TrainingManager:
 
         log.ocr(f"[Training] {building_name.upper()} RESOURCE CHECK")
 
-        # 3 gyors OCR olvasás
+        # Max 3 gyors OCR olvasás - megbízható (nagy confidence) olvasásnál korai kilépés
         for attempt in range(3):
-            ocr_text = ImageManager.read_text_from_region(region)
+            result = ImageManager.read_region(region, grammar=INSUFFICIENT)
 
-            if ocr_text:
-                text_lower = ocr_text.lower()
-                log.info(f"[Training] {building_name.upper()} RESOURCE OCR: '{ocr_text}'")
+            if result:
+                log.info(f"[Training] {building_name.upper()} RESOURCE OCR: {result!r} "
+                         f"({result.capture_ms + result.inference_ms:.0f} ms)")
 
                 # Keresünk "insufficient", "not enough", "need more" stb. szövegeket
-                insufficient_patterns = ['insufficient', 'not enough', 'need', 'require']
-
-                if any(pattern in text_lower for pattern in insufficient_patterns):
+                if INSUFFICIENT.validate(result.text):
                     log.warning(f"[Training] {building_name.upper()} → INSUFFICIENT RESOURCES detektálva!")
                     return True
 
-            time.sleep(0.3)
+                # Biztos olvasás, nem insufficient szöveg → nincs értelme újrapróbálni
+                if result.is_confident():
+                    break
+
+            clock.sleep(0.3)
 
         log.success(f"[Training] {building_name.upper()} → Resources OK")
         return False
@@ -697,7 +764,7 @@ class TrainingManager:
             if not skip_gather:
                 delay = wait_random(self.human_wait_min, self.human_wait_max)
                 log.wait(f"[Training] Várakozás {delay:.1f} mp")
-                time.sleep(delay)
+                clock.sleep(delay)
 
                 troop_gather_coords = coords.get('troop_gather', [0, 0])
                 log.click(f"[Training] TROOP GATHER kattintás → {troop_gather_coords}")
@@ -709,7 +776,7 @@ class TrainingManager:
             # 2. Building
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"[Training] Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
 
             building_coords = coords.get('building', [0, 0])
             log.click(f"[Training] BUILDING kattintás → {building_coords}")
@@ -719,7 +786,7 @@ class TrainingManager:
             # 3. Button
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"[Training] Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
 
             button_coords = coords.get('button', [0, 0])
             log.click(f"[Training] BUTTON kattintás → {button_coords}")
@@ -729,7 +796,7 @@ class TrainingManager:
             # 4. Tier (DINAMIKUS: config alapján választott tier)
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"[Training] Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
 
             # Tier koordináta kiválasztása (új struktúra: tiers{t1, t2, t3, t4, t5})
             tiers_dict = coords.get('tiers', {})
@@ -747,7 +814,7 @@ class TrainingManager:
             # 5. Confirm #1
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"[Training] Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
 
             confirm_coords = coords.get('confirm', [0, 0])
             log.click(f"[Training] CONFIRM #1 kattintás → {confirm_coords}")
@@ -757,7 +824,7 @@ class TrainingManager:
             # 6. Training time OCR (CONFIRM UTÁN - ne menj vissza queue-ba!)
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"[Training] Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
 
             log.info(f"[Training] {building_name.upper()} → Training time beolvasása (confirm után)...")
             training_time_sec = self._read_training_time_after_confirm(building_name)
@@ -784,7 +851,7 @@ class TrainingManager:
                 if buy_resource_1 != [0, 0]:
                     delay = wait_random(self.human_wait_min, self.human_wait_max)
                     log.wait(f"[Training] Várakozás {delay:.1f} mp")
-                    time.sleep(delay)
+                    clock.sleep(delay)
 
                     log.click(f"[Training] BUY RESOURCE #1 → {buy_resource_1}")
                     safe_click(buy_resource_1)
@@ -795,7 +862,7 @@ class TrainingManager:
                 if buy_resource_2 != [0, 0]:
                     delay = wait_random(self.human_wait_min, self.human_wait_max)
                     log.wait(f"[Training] Várakozás {delay:.1f} mp")
-                    time.sleep(delay)
+                    clock.sleep(delay)
 
                     log.click(f"[Training] BUY RESOURCE #2 → {buy_resource_2}")
                     safe_click(buy_resource_2)
@@ -804,7 +871,7 @@ class TrainingManager:
                 # Confirm #2 (final confirm)
                 delay = wait_random(self.human_wait_min, self.human_wait_max)
                 log.wait(f"[Training] Várakozás {delay:.1f} mp")
-                time.sleep(delay)
+                clock.sleep(delay)
 
                 log.click(f"[Training] CONFIRM #2 kattintás → {confirm_coords}")
                 safe_click(confirm_coords)
@@ -815,7 +882,7 @@ class TrainingManager:
             # 9. SPACE #1
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"[Training] Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
             log.action("[Training] SPACE #1 lenyomása")
             press_key('space')
             log.success("[Training] SPACE #1 OK")
@@ -823,7 +890,7 @@ class TrainingManager:
             # 10. SPACE #2
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"[Training] Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
             log.action("[Training] SPACE #2 lenyomása")
             press_key('space')
             log.success("[Training] SPACE #2 OK")
@@ -831,7 +898,7 @@ class TrainingManager:
             # 11. POPUP CLEANUP: Várakozás (animáció lezárás)
             delay = wait_random(2, 4)
             log.wait(f"[Training] Várakozás {delay:.1f} mp (animáció lezárás)")
-            time.sleep(delay)
+            clock.sleep(delay)
             log.success("[Training] Popup cleanup befejezve")
 
             # 12. Timer beállítása (az OCR-ből kapott idővel)
@@ -912,7 +979,7 @@ class TrainingManager:
             # 1. Queue menü megnyitás
             delay = wait_random(self.human_wait_min, self.human_wait_max)
             log.wait(f"[Training] Várakozás {delay:.1f} mp")
-            time.sleep(delay)
+            clock.sleep(delay)
 
             log.click(f"[Training] PANEL MEGNYITÁS → {open_panel_coords}")
             safe_click(open_panel_coords)
@@ -929,7 +996,7 @@ class TrainingManager:
 
                 delay = wait_random(self.human_wait_min, self.human_wait_max)
                 log.wait(f"[Training] Várakozás {delay:.1f} mp")
-                time.sleep(delay)
+                clock.sleep(delay)
 
                 log.click(f"[Training] PANEL BEZÁRÁS → {close_panel_coords}")
                 safe_click(close_panel_coords)
@@ -944,7 +1011,7 @@ class TrainingManager:
 
                 delay = wait_random(self.human_wait_min, self.human_wait_max)
                 log.wait(f"[Training] Várakozás {delay:.1f} mp")
-                time.sleep(delay)
+                clock.sleep(delay)
 
                 log.click(f"[Training] PANEL BEZÁRÁS → {close_panel_coords}")
                 safe_click(close_panel_coords)
@@ -964,7 +1031,7 @@ class TrainingManager:
             if queue_open:
                 delay = wait_random(self.human_wait_min, self.human_wait_max)
                 log.wait(f"[Training] Várakozás {delay:.1f} mp")
-                time.sleep(delay)
+                clock.sleep(delay)
 
                 log.click(f"[Training] PANEL BEZÁRÁS → {close_panel_coords}")
                 safe_click(close_panel_coords)
@@ -20,6 +20,8 @@ from pynput import mouse, keyboard
 
 from library import initialize_game_window
 from utils.region_selector import RegionSelector
+from utils.easyocr_engine import easyocr_engine
+from utils.scale_calibration import scale_calibration
 
 
 class SetupWizardMenu:
@@ -319,7 +321,7 @@ class SetupWizardMenu:
             x, y, w, h = region['x'], region['y'], region['width'], region['height']
             cropped = screen_np[y:y+h, x:x+w]
 
-            cv2.imwrite(str(gather_path), cropped)
+            self.save_template(gather_path, cropped)
             print(f"\n✅ Gather template mentve: {gather_path}")
 
         input("\nNyomj ENTER-t a folytatáshoz...")
@@ -349,7 +351,7 @@ class SetupWizardMenu:
             x, y, w, h = region['x'], region['y'], region['width'], region['height']
             cropped = screen_np[y:y+h, x:x+w]
 
-            cv2.imwrite(str(march_path), cropped)
+            self.save_template(march_path, cropped)
             print(f"\n✅ March template mentve: {march_path}")
 
         input("\nNyomj ENTER-t a folytatáshoz...")
@@ -878,7 +880,7 @@ class SetupWizardMenu:
             x, y, w, h = region['x'], region['y'], region['width'], region['height']
             cropped = screen_np[y:y+h, x:x+w]
 
-            cv2.imwrite(str(hand_path), cropped)
+            self.save_template(hand_path, cropped)
             print(f"\n✅ Hand template mentve: {hand_path}")
 
         input("\nNyomj ENTER-t a folytatáshoz...")
@@ -930,7 +932,7 @@ class SetupWizardMenu:
                 x, y, w, h = region['x'], region['y'], region['width'], region['height']
                 cropped = screen_np[y:y+h, x:x+w]
 
-                cv2.imwrite(str(resource_path), cropped)
+                self.save_template(resource_path, cropped)
                 print(f"✅ resource{i}.png mentve")
 
         input("\nNyomj ENTER-t a folytatáshoz...")
@@ -1706,6 +1708,8 @@ class SetupWizardMenu:
 
         # OCR teszt - EasyOCR
         print(f"\n🤖 EasyOCR teszt: {region_name}")
+        if not easyocr_engine.wait_ready():
+            print("   ⚠️  EasyOCR nem elérhető, fallback engine eredmény")
         text_easyocr = ImageManager.read_text_from_region(region, use_easyocr=True, debug_save=True)
         print(f"   Eredmény: '{text_easyocr}'")
 
@@ -1860,7 +1864,7 @@ class SetupWizardMenu:
             x, y, w, h = region['x'], region['y'], region['width'], region['height']
             cropped = screen_np[y:y+h, x:x+w]
 
-            cv2.imwrite(str(template_path), cropped)
+            self.save_template(template_path, cropped)
             print(f"\n✅ X-button template mentve: {template_path}")
             print(f"   Méret: {w}x{h} pixel")
             print(f"\nℹ️  Ez a template automatikusan használva lesz:")
@@ -1930,6 +1934,22 @@ class SetupWizardMenu:
 
     # ===== UTILITY METHODS =====
 
+    def save_template(self, template_path, image):
+        """
+        Template mentése + a játék ablak méretének rögzítése (skála kalibráció)
+
+        Args:
+            template_path: Mentési útvonal
+            image: BGR kép (kijelölt régió)
+        """
+        from library import WindowManager
+
+        cv2.imwrite(str(template_path), image)
+
+        rect = WindowManager.get_window_rect()
+        if rect:
+            scale_calibration.record_capture(template_path, rect[2:])
+
     def get_menu_choice(self, min_val, max_val):
         """Menüválasztás input validációval"""
         while True:
@@ -0,0 +1,116 @@
+"""
+QueueManager persistence tesztek: snapshot + journal visszajátszás, compaction
+"""
+import json
+
+from utils.queue_manager import QueueManager, URGENT_PRIORITY, DEFAULT_PRIORITY
+
+
+def make_task(task_id, task_type="gathering", priority=DEFAULT_PRIORITY):
+    return {"task_id": task_id, "type": task_type, "status": "pending",
+            "priority": priority, "timestamp": "2025-01-01 00:00:00", "data": {}}
+
+
+def write_snapshot(config_dir, seq, tasks):
+    with open(config_dir / 'task_queue.json', 'w', encoding='utf-8') as f:
+        json.dump({'seq': seq, 'tasks': tasks}, f)
+
+
+def write_journal(config_dir, records, tail=""):
+    lines = [json.dumps(record, separators=(',', ':')) for record in records]
+    with open(config_dir / 'task_queue.journal', 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n' + tail)
+
+
+def task_ids(manager):
+    return [task['task_id'] for task in manager.get_all_tasks()]
+
+
+def test_journal_replayed_over_snapshot(tmp_path):
+    """Snapshot utáni rekordok visszajátszása: sáv sorrend + index"""
+    write_snapshot(tmp_path, 2, [make_task("a"), make_task("b")])
+    write_journal(tmp_path, [
+        # seq <= snapshot seq: már a snapshot-ban (kihagyva, nem duplikál)
+        {"op": "append", "task": make_task("a"), "seq": 1},
+        {"op": "append", "task": make_task("b"), "seq": 2},
+        {"op": "append", "task": make_task("c"), "seq": 3},
+        {"op": "prepend", "task": make_task("u", "anti_afk", URGENT_PRIORITY), "seq": 4},
+        {"op": "remove", "task_id": "b", "seq": 5},
+        {"op": "status", "task_id": "c", "status": "marching", "seq": 6},
+    ])
+
+    manager = QueueManager(config_dir=tmp_path)
+
+    assert task_ids(manager) == ["u", "a", "c"]
+    assert set(manager.index) == {"u", "a", "c"}
+    assert manager.index["c"]["status"] == "marching"
+    assert sorted(manager.lanes) == [URGENT_PRIORITY, DEFAULT_PRIORITY]
+    assert manager.seq == 6
+
+
+def test_replay_compacts_into_snapshot(tmp_path):
+    """Visszajátszás után snapshot (utolsó seq-kel) + üres journal"""
+    write_snapshot(tmp_path, 0, [])
+    write_journal(tmp_path, [
+        {"op": "append", "task": make_task("a"), "seq": 1},
+        {"op": "pop", "seq": 2},
+        {"op": "append", "task": make_task("b"), "seq": 3},
+    ])
+
+    QueueManager(config_dir=tmp_path)
+
+    snapshot = json.loads((tmp_path / 'task_queue.json').read_text(encoding='utf-8'))
+    assert snapshot['seq'] == 3
+    assert [task['task_id'] for task in snapshot['tasks']] == ["b"]
+    assert (tmp_path / 'task_queue.journal').read_text(encoding='utf-8') == ""
+
+
+def test_truncated_last_journal_line_ignored(tmp_path):
+    """Írás közbeni leállás: csonka utolsó sor figyelmen kívül"""
+    write_journal(tmp_path, [
+        {"op": "append", "task": make_task("a"), "seq": 1},
+        {"op": "append", "task": make_task("b"), "seq": 2},
+    ], tail='{"op":"append","task":{"task_id":"c"')
+
+    manager = QueueManager(config_dir=tmp_path)
+
+    assert task_ids(manager) == ["a", "b"]
+    assert manager.seq == 2
+
+
+def test_crash_between_snapshot_and_journal_truncate(tmp_path):
+    """Snapshot kiírva, journal még nem ürítve → a régi rekordok nem duplikálnak"""
+    manager = QueueManager(config_dir=tmp_path)
+    manager.add_task("a", "gathering")
+    manager.add_task("b", "training")
+    manager.add_priority_task("u", "anti_afk")
+    manager.get_next_task()
+    manager._flush()
+
+    # Compaction első fele (snapshot), a journal ürítése előtti leállás
+    with manager.lock:
+        snapshot = {'seq': manager.seq, 'tasks': [task.copy() for task in manager._iter_tasks()]}
+    manager._write_snapshot(snapshot)
+    assert (tmp_path / 'task_queue.journal').read_text(encoding='utf-8').count('\n') == 4
+
+    reloaded = QueueManager(config_dir=tmp_path)
+
+    assert task_ids(reloaded) == ["a", "b"]
+    assert set(reloaded.index) == {"a", "b"}
+    assert reloaded.seq == manager.seq
+
+
+def test_legacy_list_snapshot_loaded(tmp_path):
+    """Journal előtti formátum (task lista) betöltése, típus szerinti prioritással"""
+    (tmp_path / 'settings.json').write_text(
+        json.dumps({'queue': {'priorities': {'anti_afk': 0, 'explorer': 2}}}), encoding='utf-8')
+    legacy = [make_task("e", "explorer"), make_task("g", "gathering"), make_task("x", "anti_afk")]
+    for task in legacy:
+        del task['priority']
+    with open(tmp_path / 'task_queue.json', 'w', encoding='utf-8') as f:
+        json.dump(legacy, f)
+
+    manager = QueueManager(config_dir=tmp_path)
+
+    assert task_ids(manager) == ["x", "g", "e"]
+    assert manager.get_next_task()['task_id'] == "x"
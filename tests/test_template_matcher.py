@@ -0,0 +1,141 @@
+"""
+TemplateMatcher tesztek: coarse-to-fine = teljes frame-es TM_CCOEFF_NORMED
+(ugyanaz a pozíció és confidence, a teljes felbontású fallback útvonalakon is)
+"""
+import cv2
+import numpy as np
+import pytest
+
+from utils.template_cache import TemplateCache, PYRAMID_FACTOR
+from utils.template_matcher import TemplateMatcher, MIN_COARSE_SIDE
+
+
+THRESHOLD = 0.7
+
+# Kis ablakos vs teljes frame-es matchTemplate: float32 (DFT) kerekítési eltérés
+CONFIDENCE_TOLERANCE = 1e-4
+
+
+def make_frame(rng, height=240, width=320):
+    """Sima, de egyértelmű textúra (egy valódi csúcs template-enként)"""
+    noise = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    return cv2.GaussianBlur(noise, (7, 7), 0)
+
+
+def add_noise(rng, image, sigma=4.0):
+    noisy = image.astype(np.float32) + rng.normal(0, sigma, image.shape)
+    return np.clip(noisy, 0, 255).astype(np.uint8)
+
+
+def load_entry(tmp_path, name, image):
+    """Template a valódi cache pipeline-on át (PNG → piramis + durva szint)"""
+    path = tmp_path / f"{name}.png"
+    cv2.imwrite(str(path), image)
+    return TemplateCache(images_dir=tmp_path).get(path)
+
+
+def full_frame_match(screen, template):
+    """Referencia: teljes frame-es matchTemplate (a coarse-to-fine előtti viselkedés)"""
+    result = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
+    _, max_val, _, max_loc = cv2.minMaxLoc(result)
+    return (max_val, max_loc) if max_val > THRESHOLD else None
+
+
+def assert_same(match, reference, template):
+    if reference is None:
+        assert match is None
+        return
+
+    assert match is not None
+    confidence, loc, size = match
+    assert loc == reference[1]
+    assert confidence == pytest.approx(reference[0], abs=CONFIDENCE_TOLERANCE)
+    assert size == (template.shape[1], template.shape[0])
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_coarse_to_fine_matches_full_frame(tmp_path, seed):
+    rng = np.random.default_rng(seed)
+    frame = make_frame(rng)
+
+    height, width = int(rng.integers(24, 72)), int(rng.integers(24, 72))
+    top = int(rng.integers(0, frame.shape[0] - height))
+    left = int(rng.integers(0, frame.shape[1] - width))
+    template = add_noise(rng, frame[top:top + height, left:left + width])
+
+    matcher = TemplateMatcher()
+    entry = load_entry(tmp_path, "template", template)
+    match = matcher.match(matcher.prepare(frame), entry, THRESHOLD)
+
+    assert_same(match, full_frame_match(frame, template), template)
+    assert matcher.get_stats()['coarse_matches'] == 1
+
+
+def test_absent_template_not_found(tmp_path):
+    rng = np.random.default_rng(100)
+    frame = make_frame(rng)
+    template = make_frame(rng, 48, 48)
+
+    matcher = TemplateMatcher()
+    entry = load_entry(tmp_path, "absent", template)
+
+    assert full_frame_match(frame, template) is None
+    assert matcher.match(matcher.prepare(frame), entry, THRESHOLD) is None
+
+
+def test_small_template_falls_back_to_full_resolution(tmp_path):
+    """Durva szinten MIN_COARSE_SIDE alatti template → teljes felbontású match"""
+    rng = np.random.default_rng(200)
+    frame = make_frame(rng)
+    side = int(MIN_COARSE_SIDE / PYRAMID_FACTOR) - 2
+    template = add_noise(rng, frame[100:100 + side, 150:150 + side])
+
+    matcher = TemplateMatcher()
+    entry = load_entry(tmp_path, "small", template)
+    match = matcher.match(matcher.prepare(frame), entry, THRESHOLD)
+
+    assert_same(match, full_frame_match(frame, template), template)
+    assert matcher.get_stats() == {'coarse_matches': 0, 'full_matches': 1, 'refinements': 0}
+
+
+def test_template_larger_than_coarse_frame_falls_back(tmp_path):
+    """Durva template nagyobb a durva keresési képnél (kerekítés) → teljes felbontású match"""
+    rng = np.random.default_rng(300)
+    frame = make_frame(rng)
+    template = add_noise(rng, frame[60:100, 80:140])
+    screen = frame[55:105, 75:145]
+
+    matcher = TemplateMatcher()
+    entry = load_entry(tmp_path, "large", template)
+
+    prepared = matcher.prepare(screen)
+    coarse_template = entry['coarse_scales'][1.0]
+    prepared['coarse'] = prepared['coarse'][:coarse_template.shape[0] - 1, :]
+
+    match = matcher.match(prepared, entry, THRESHOLD)
+
+    assert_same(match, full_frame_match(screen, template), template)
+    assert matcher.get_stats()['full_matches'] == 1
+
+
+def test_match_many_matches_individual_results(tmp_path):
+    """Párhuzamos csoport match = template-enkénti teljes frame-es eredmény"""
+    rng = np.random.default_rng(400)
+    frame = make_frame(rng)
+
+    templates = [
+        add_noise(rng, frame[10:50, 20:80]),
+        add_noise(rng, frame[150:200, 200:260]),
+        add_noise(rng, frame[80:86, 30:36]),
+        make_frame(rng, 40, 40),
+    ]
+    entries = [load_entry(tmp_path, f"group_{index}", template) for index, template in enumerate(templates)]
+
+    matcher = TemplateMatcher()
+    try:
+        matches = matcher.match_many(matcher.prepare(frame), entries, THRESHOLD)
+    finally:
+        matcher.shutdown()
+
+    for match, template in zip(matches, templates):
+        assert_same(match, full_frame_match(frame, template), template)
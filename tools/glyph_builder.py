@@ -0,0 +1,79 @@
+"""
+ROK Auto Farm - Glyph Library Builder
+
+Címkézett capture-ökből glyph library építése a gyors számjegy OCR-hez
+(images/glyphs/). Egy capture = egy OCR régió kép + a rajta látható szöveg.
+
+Használat:
+    python tools/glyph_builder.py --image logs/ocr_debug/ocr_x_0_original.png --text 01:23:45
+    python tools/glyph_builder.py --config time_regions.json --key march_time --text 00:05:12
+    python tools/glyph_builder.py --test --config farm_regions.json --key wheat
+"""
+import sys
+import json
+import argparse
+from pathlib import Path
+
+import cv2
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.glyph_ocr import glyph_recognizer
+
+
+def load_region(config_name, key):
+    """Régió betöltése egy config fájlból"""
+    config_file = Path(__file__).parent.parent / 'config' / config_name
+    with open(config_file, 'r', encoding='utf-8') as f:
+        return json.load(f).get(key)
+
+
+def capture(args):
+    """Capture kép: fájlból vagy élő képernyőről"""
+    if args.image:
+        image = cv2.imread(args.image)
+        if image is None:
+            print(f"❌ Kép nem olvasható: {args.image}")
+        return image
+
+    region = load_region(args.config, args.key)
+    if not region:
+        print(f"❌ Régió nem található: {args.config} → {args.key}")
+        return None
+
+    from library import ImageManager, initialize_game_window
+    initialize_game_window()
+    return ImageManager.capture_region(region)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Glyph library builder")
+    parser.add_argument('--image', help="OCR régió kép (PNG)")
+    parser.add_argument('--config', help="Régió config fájl (pl. time_regions.json)")
+    parser.add_argument('--key', help="Régió kulcs a config fájlban")
+    parser.add_argument('--text', help="A képen látható szöveg (címke)")
+    parser.add_argument('--test', action='store_true', help="Csak felismerés (nem ment)")
+    args = parser.parse_args()
+
+    if not args.image and not (args.config and args.key):
+        parser.error("--image vagy --config + --key szükséges")
+
+    image = capture(args)
+    if image is None:
+        return
+
+    if args.test or not args.text:
+        text, confidence = glyph_recognizer.recognize(image)
+        print(f"🔍 Felismerés: '{text}' (confidence: {confidence:.3f})")
+        return
+
+    saved = glyph_recognizer.add_capture(image, args.text)
+    if saved:
+        print(f"✅ {saved} glyph mentve → {glyph_recognizer.glyphs_dir}")
+    else:
+        print(f"❌ A szegmentálás nem egyezik a szöveggel ('{args.text}'), nincs mentés")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,22 @@ Auto Farm - Utils Package
 from .logger import FarmLogger
 from .ocr_parser import parse_resource_value
 from .time_utils import parse_time, format_time, add_times
-from .coordinate_helper import CoordinateHelper
-from .region_selector import RegionSelector
 from .queue_manager import queue_manager
 from .timer_manager import timer_manager
 from .scheduler import scheduler
+from .template_cache import template_cache
+from .template_matcher import template_matcher
+from .template_hints import template_hints
+from .scale_calibration import scale_calibration
+from .capture import screen_capture
+from .clock import clock
+from .input_backend import input_controller
+from .farm_stats import farm_stats
+from .ocr_engine import ocr_engine
+from .glyph_ocr import glyph_recognizer
+from .ocr_cache import ocr_cache
+from .easyocr_engine import easyocr_engine
+from .ocr_consensus import ocr_consensus
 
 __all__ = [
     'FarmLogger',
@@ -20,5 +31,34 @@ __all__ = [
     'RegionSelector',
     'queue_manager',
     'timer_manager',
-    'scheduler'
-]
\ No newline at end of file
+    'scheduler',
+    'template_cache',
+    'template_matcher',
+    'template_hints',
+    'scale_calibration',
+    'screen_capture',
+    'clock',
+    'input_controller',
+    'farm_stats',
+    'ocr_engine',
+    'glyph_recognizer',
+    'ocr_cache',
+    'easyocr_engine',
+    'ocr_consensus'
+]
+
+
+def __getattr__(name):
+    """
+    GUI-only helper-ek lazy importja (pynput / PIL.ImageGrab)
+
+    Headless futásnál (replay) a package import nem igényel X display-t;
+    a setup wizard / tools első használatkor tölti be őket.
+    """
+    if name == 'CoordinateHelper':
+        from .coordinate_helper import CoordinateHelper
+        return CoordinateHelper
+    if name == 'RegionSelector':
+        from .region_selector import RegionSelector
+        return RegionSelector
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -0,0 +1,86 @@
+"""
+Auto Farm - Burst Capture
+Villogó szöveg (pl. gather time) kiolvasása: N gyors frame egy régióról,
+a legjobb (kontraszt + tinta lefedettség) frame-ek kerülnek OCR-re
+
+A 60 × 1 sec vakon próbálkozás helyett egy burst (~1 sec) lefedi a villogási ciklust.
+"""
+import cv2
+import numpy as np
+
+from utils.capture import screen_capture
+from utils.clock import clock
+
+
+# Alapértelmezett burst: 16 frame × 60 ms ≈ 1 villogási ciklus
+DEFAULT_BURST_FRAMES = 16
+DEFAULT_BURST_INTERVAL = 0.06
+
+# Szöveg tinta arány elfogadható tartománya (alatta: halvány / eltűnt szöveg, fölötte: zaj / háttér)
+MIN_INK_RATIO = 0.02
+MAX_INK_RATIO = 0.45
+
+
+def score_frame(gray):
+    """
+    Frame olvashatósági pontszám
+
+    Kontraszt: az OTSU szerinti tinta és háttér átlag különbsége (0-1)
+    Tinta lefedettség: a kisebbségi osztály aránya; tartományon kívül büntetett
+
+    Args:
+        gray: Grayscale numpy kép (régió)
+
+    Returns:
+        float: Pontszám (nagyobb = olvashatóbb)
+    """
+    if gray.size == 0:
+        return 0.0
+
+    threshold, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    mask = binary > 0
+
+    bright = np.count_nonzero(mask)
+    if bright == 0 or bright == mask.size:
+        return 0.0
+
+    contrast = (float(gray[mask].mean()) - float(gray[~mask].mean())) / 255.0
+
+    ink_ratio = min(bright, mask.size - bright) / mask.size
+    if MIN_INK_RATIO <= ink_ratio <= MAX_INK_RATIO:
+        coverage = 1.0
+    else:
+        coverage = 0.25
+
+    return contrast * coverage
+
+
+def capture_burst(region, frames=DEFAULT_BURST_FRAMES, interval=DEFAULT_BURST_INTERVAL):
+    """
+    N frame gyors egymásutánban egy régióról (frame cache nélkül, mindig friss capture)
+
+    Args:
+        region: dict - {'x', 'y', 'width', 'height'}
+        frames: Frame-ek száma
+        interval: Frame-ek közti szünet (sec)
+
+    Returns:
+        list: [(score, gray), ...] pontszám szerint csökkenő sorrendben
+    """
+    scored = []
+
+    for index in range(frames):
+        if index > 0:
+            clock.sleep(interval)
+
+        try:
+            image = screen_capture.grab_region(region)
+        except Exception as e:
+            print(f"Burst capture hiba: {e}")
+            continue
+
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        scored.append((score_frame(gray), index, gray))
+
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return [(score, gray) for score, _, gray in scored]
@@ -0,0 +1,404 @@
+"""
+Auto Farm - Screen Capture
+Cserélhető képernyő capture backend: csak a kért bbox-ot olvassa be
+(nem teljes desktop grab + crop)
+
+Backendek:
+- win32:  perzisztens device context + újrahasznált bitmap bufferek (leggyorsabb)
+- pil:    PIL ImageGrab (eredeti útvonal)
+- file:   egyetlen PNG képernyő (teszteléshez)
+- replay: felvett frame-ek könyvtárból vagy videóból (Linux teszteléshez)
+"""
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+
+class CaptureBackend:
+    """
+    Capture backend interfész
+
+    grab(bbox) → BGR numpy kép, bbox = (left, top, right, bottom) abszolút
+    képernyő koordinátákban, vagy None = teljes képernyő
+    """
+
+    name = "base"
+
+    def grab(self, bbox=None):
+        raise NotImplementedError
+
+    def close(self):
+        """Erőforrások felszabadítása (ha van)"""
+        pass
+
+
+class PILCaptureBackend(CaptureBackend):
+    """PIL ImageGrab - csak a bbox-ot másolja"""
+
+    name = "pil"
+
+    def __init__(self):
+        from PIL import ImageGrab
+        self._image_grab = ImageGrab
+
+    def grab(self, bbox=None):
+        img = self._image_grab.grab(bbox=bbox)
+        return cv2.cvtColor(np.asarray(img), cv2.COLOR_RGB2BGR)
+
+
+class FileCaptureBackend(CaptureBackend):
+    """
+    Fájl alapú "képernyő" (teszteléshez)
+
+    Egy teljes képernyős PNG-ből (vagy numpy tömbből) vágja ki a kért bbox-ot,
+    így az OCR / template matching élő ablak nélkül is futtatható.
+    """
+
+    name = "file"
+
+    def __init__(self, source):
+        """
+        Args:
+            source: PNG útvonal (str / Path) vagy BGR numpy tömb
+        """
+        if isinstance(source, np.ndarray):
+            self.screen = source
+        else:
+            self.screen = cv2.imread(str(source))
+            if self.screen is None:
+                raise ValueError(f"Képernyő kép nem olvasható: {source}")
+
+    def grab(self, bbox=None):
+        return crop_bbox(self.screen, bbox)
+
+
+class Win32CaptureBackend(CaptureBackend):
+    """
+    Perzisztens DC backend (Windows)
+
+    A desktop DC, a memória DC és a bitmap-ek frame-ek között újrahasznosulnak
+    (méret szerint cache-elve), így egy grab csak BitBlt + GetBitmapBits.
+    """
+
+    name = "win32"
+
+    # Ennyi különböző méretű bitmap marad meg (OCR régiók + ablak frame)
+    MAX_BITMAPS = 8
+
+    def __init__(self):
+        import win32api
+        import win32con
+        import win32gui
+        import win32ui
+
+        self._win32con = win32con
+        self._win32gui = win32gui
+        self._win32ui = win32ui
+
+        self.lock = threading.Lock()
+
+        self.desktop_hwnd = win32gui.GetDesktopWindow()
+        self.desktop_dc = win32gui.GetWindowDC(self.desktop_hwnd)
+        self.src_dc = win32ui.CreateDCFromHandle(self.desktop_dc)
+        self.mem_dc = self.src_dc.CreateCompatibleDC()
+
+        # {(width, height): bitmap} - LRU sorrendben
+        self.bitmaps = OrderedDict()
+
+        self.screen_size = (
+            win32api.GetSystemMetrics(win32con.SM_CXSCREEN),
+            win32api.GetSystemMetrics(win32con.SM_CYSCREEN)
+        )
+
+    def grab(self, bbox=None):
+        if bbox is None:
+            bbox = (0, 0, self.screen_size[0], self.screen_size[1])
+
+        left, top, right, bottom = bbox
+        width, height = right - left, bottom - top
+
+        with self.lock:
+            bitmap = self._get_bitmap(width, height)
+            self.mem_dc.SelectObject(bitmap)
+            self.mem_dc.BitBlt((0, 0), (width, height), self.src_dc, (left, top), self._win32con.SRCCOPY)
+            raw = bitmap.GetBitmapBits(True)
+
+        # BGRA → BGR (a másolat elengedi a raw buffert)
+        img = np.frombuffer(raw, dtype=np.uint8).reshape(height, width, 4)
+        return img[:, :, :3].copy()
+
+    def _get_bitmap(self, width, height):
+        """Méret szerinti bitmap (újrahasznosítva, lock alatt hívandó)"""
+        key = (width, height)
+        bitmap = self.bitmaps.get(key)
+
+        if bitmap is not None:
+            self.bitmaps.move_to_end(key)
+            return bitmap
+
+        bitmap = self._win32ui.CreateBitmap()
+        bitmap.CreateCompatibleBitmap(self.src_dc, width, height)
+        self.bitmaps[key] = bitmap
+
+        # Legrégebben használt bitmap felszabadítása
+        while len(self.bitmaps) > self.MAX_BITMAPS:
+            _, old_bitmap = self.bitmaps.popitem(last=False)
+            self._win32gui.DeleteObject(old_bitmap.GetHandle())
+
+        return bitmap
+
+    def close(self):
+        with self.lock:
+            for bitmap in self.bitmaps.values():
+                try:
+                    self._win32gui.DeleteObject(bitmap.GetHandle())
+                except:
+                    pass
+            self.bitmaps.clear()
+
+            try:
+                self.mem_dc.DeleteDC()
+                self.src_dc.DeleteDC()
+                self._win32gui.ReleaseDC(self.desktop_hwnd, self.desktop_dc)
+            except:
+                pass
+
+
+class ReplayCaptureBackend(CaptureBackend):
+    """
+    Felvett frame-ek visszajátszása (könyvtár vagy videó)
+
+    Minden grab() az aktuális frame-ből vág, majd (advance_on_grab esetén)
+    a következő frame-re lép. A frame-ek végén az utolsó frame marad
+    (loop=True esetén elölről kezdi).
+    """
+
+    name = "replay"
+
+    VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mkv', '.mov')
+
+    def __init__(self, source, origin=(0, 0), advance_on_grab=True, loop=False):
+        """
+        Args:
+            source: Könyvtár (*.png frame-ek névsorrendben) vagy videó fájl
+            origin: A frame (0, 0) pixelének abszolút képernyő koordinátája
+            advance_on_grab: Ha True, minden grab után következő frame
+            loop: Ha True, a végén elölről kezdi
+        """
+        self.source = Path(source)
+        self.origin = tuple(origin)
+        self.advance_on_grab = advance_on_grab
+        self.loop = loop
+
+        self.lock = threading.Lock()
+
+        self.video = None
+        self.frame_paths = []
+
+        if self.source.is_dir():
+            self.frame_paths = sorted(self.source.glob('*.png'))
+            if not self.frame_paths:
+                raise ValueError(f"Nincs PNG frame a könyvtárban: {self.source}")
+        elif self.source.suffix.lower() in self.VIDEO_EXTENSIONS:
+            self.video = cv2.VideoCapture(str(self.source))
+            if not self.video.isOpened():
+                raise ValueError(f"Videó nem nyitható meg: {self.source}")
+        else:
+            raise ValueError(f"Ismeretlen replay forrás: {self.source}")
+
+        self.index = 0
+        self.frame = None
+        self._load_current()
+
+    def grab(self, bbox=None):
+        with self.lock:
+            frame = self.frame
+            if self.advance_on_grab:
+                self._advance()
+
+        if bbox is not None:
+            left, top, right, bottom = bbox
+            bbox = (left - self.origin[0], top - self.origin[1],
+                    right - self.origin[0], bottom - self.origin[1])
+
+        return crop_bbox(frame, bbox)
+
+    def advance(self):
+        """Következő frame-re lépés (kézi léptetés)"""
+        with self.lock:
+            self._advance()
+
+    def _advance(self):
+        """Lock alatt hívandó!"""
+        if self.video is not None:
+            ok, frame = self.video.read()
+            if ok:
+                self.frame = frame
+                self.index += 1
+            elif self.loop:
+                self.video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                self.index = 0
+                self._load_current()
+            return
+
+        if self.index + 1 < len(self.frame_paths):
+            self.index += 1
+        elif self.loop:
+            self.index = 0
+        else:
+            return
+
+        self._load_current()
+
+    def _load_current(self):
+        """Aktuális frame betöltése"""
+        if self.video is not None:
+            ok, frame = self.video.read()
+            if not ok:
+                raise ValueError(f"Üres videó: {self.source}")
+            self.frame = frame
+            return
+
+        frame = cv2.imread(str(self.frame_paths[self.index]))
+        if frame is None:
+            raise ValueError(f"Frame nem olvasható: {self.frame_paths[self.index]}")
+        self.frame = frame
+
+    def close(self):
+        if self.video is not None:
+            self.video.release()
+
+
+def crop_bbox(screen, bbox):
+    """
+    bbox kivágása egy képernyő képből
+
+    Kilógó bbox → fekete kitöltés (mint egy valódi képernyő széle)
+
+    Args:
+        screen: BGR numpy kép
+        bbox: (left, top, right, bottom) vagy None (teljes kép)
+
+    Returns:
+        numpy.ndarray: BGR kivágás (másolat)
+    """
+    if bbox is None:
+        return screen.copy()
+
+    left, top, right, bottom = bbox
+    height, width = screen.shape[:2]
+
+    out = np.zeros((bottom - top, right - left, 3), dtype=np.uint8)
+    src_left, src_top = max(0, left), max(0, top)
+    src_right, src_bottom = min(width, right), min(height, bottom)
+
+    if src_left < src_right and src_top < src_bottom:
+        out[src_top - top:src_bottom - top, src_left - left:src_right - left] = \
+            screen[src_top:src_bottom, src_left:src_right]
+
+    return out
+
+
+# Automatikusan választható backendek (gyorsabb elöl)
+AUTO_BACKENDS = OrderedDict([
+    ('win32', Win32CaptureBackend),
+    ('pil', PILCaptureBackend),
+])
+
+
+class ScreenCapture:
+    """Aktív capture backend (thread-safe csere)"""
+
+    def __init__(self, backend=None):
+        self.lock = threading.Lock()
+        self.backend = backend
+
+    def set_backend(self, backend):
+        """
+        Backend csere (pl. FileCaptureBackend tesztekhez)
+
+        Args:
+            backend: CaptureBackend példány
+        """
+        with self.lock:
+            old_backend = self.backend
+            self.backend = backend
+
+        if old_backend is not None and old_backend is not backend:
+            old_backend.close()
+
+    def select_backend(self, preferred="auto"):
+        """
+        Backend kiválasztása induláskor
+
+        Args:
+            preferred: "auto" (leggyorsabb elérhető), "win32" vagy "pil"
+
+        Returns:
+            str: A kiválasztott backend neve
+        """
+        if preferred in AUTO_BACKENDS:
+            candidates = [preferred] + [name for name in AUTO_BACKENDS if name != preferred]
+        else:
+            candidates = list(AUTO_BACKENDS)
+
+        for name in candidates:
+            try:
+                backend = AUTO_BACKENDS[name]()
+            except Exception as e:
+                self._log_action(f"'{name}' backend nem elérhető: {e}")
+                continue
+
+            self.set_backend(backend)
+            self._log_action(f"Capture backend: {name}")
+            return name
+
+        raise RuntimeError("Nincs elérhető capture backend")
+
+    def get_backend(self):
+        """Aktív backend (lazy default: PIL)"""
+        with self.lock:
+            if self.backend is None:
+                self.backend = PILCaptureBackend()
+            return self.backend
+
+    def grab(self, bbox=None):
+        """
+        Képernyő bbox beolvasása
+
+        Args:
+            bbox: (left, top, right, bottom) vagy None (teljes képernyő)
+
+        Returns:
+            numpy.ndarray: BGR kép
+        """
+        return self.get_backend().grab(bbox)
+
+    def grab_region(self, region):
+        """
+        OCR / keresési régió beolvasása
+
+        Args:
+            region: dict - {'x', 'y', 'width', 'height'} (abszolút koordináták)
+
+        Returns:
+            numpy.ndarray: BGR kép (csak a régió)
+        """
+        x, y, w, h = region['x'], region['y'], region['width'], region['height']
+        return self.grab((x, y, x + w, y + h))
+
+    def _log_action(self, message):
+        """Logging capture műveletekhez"""
+        try:
+            from utils.logger import FarmLogger as log
+            log.info(f"[Capture] {message}")
+        except:
+            # Ha logger még nincs inicializálva
+            print(f"[Capture] {message}")
+
+
+# Globális singleton instance
+screen_capture = ScreenCapture()
@@ -0,0 +1,132 @@
+"""
+Auto Farm - Clock
+Cserélhető óra: valós idő vagy gyorsított virtuális idő (replay / szimuláció)
+"""
+import time
+import threading
+from datetime import datetime
+
+
+class RealClock:
+    """Valós idő (time / datetime wrapper)"""
+
+    name = "real"
+
+    def time(self):
+        """Epoch másodperc"""
+        return time.time()
+
+    def monotonic(self):
+        """Monoton másodperc (intervallum méréshez)"""
+        return time.monotonic()
+
+    def now(self):
+        """Aktuális datetime"""
+        return datetime.now()
+
+    def sleep(self, seconds):
+        """Várakozás"""
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def wait(self, waitable, timeout=None):
+        """
+        Várakozás threading.Event / Condition-re timeout-tal
+
+        Args:
+            waitable: Event vagy (lockolt) Condition
+            timeout: Max várakozás (másodperc, None = végtelen)
+
+        Returns:
+            bool: A waitable.wait() eredménye
+        """
+        return waitable.wait(timeout)
+
+
+class VirtualClock(RealClock):
+    """
+    Gyorsított virtuális idő
+
+    A virtuális idő speed-szer gyorsabban telik a valósnál: sleep(300)
+    speed=1000 mellett 0.3 valós mp. Mivel az idő a valós monoton órából
+    skálázódik, több háttérszál is konzisztensen látja.
+    """
+
+    name = "virtual"
+
+    def __init__(self, speed=1000.0, start=None):
+        """
+        Args:
+            speed: Gyorsítási szorzó (1000 = 1000x valós idő)
+            start: Virtuális kezdő időpont (datetime, None = most)
+        """
+        if speed <= 0:
+            raise ValueError(f"Érvénytelen speed: {speed}")
+
+        self.speed = float(speed)
+        self._real_start = time.monotonic()
+        self._epoch_start = (start or datetime.now()).timestamp()
+
+    def _elapsed(self):
+        """Eltelt virtuális másodperc"""
+        return (time.monotonic() - self._real_start) * self.speed
+
+    def time(self):
+        return self._epoch_start + self._elapsed()
+
+    def monotonic(self):
+        # Folytonos a valós monoton órával (óra csere előtt felvett deadline-ok is érvényesek)
+        return self._real_start + self._elapsed()
+
+    def now(self):
+        return datetime.fromtimestamp(self.time())
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds / self.speed)
+
+    def wait(self, waitable, timeout=None):
+        if timeout is not None:
+            timeout = max(0.0, timeout) / self.speed
+        return waitable.wait(timeout)
+
+
+class Clock:
+    """Aktív óra proxy (a modulok ezt importálják, az implementáció cserélhető)"""
+
+    def __init__(self, impl=None):
+        self.lock = threading.Lock()
+        self.impl = impl or RealClock()
+
+    def set_clock(self, impl):
+        """
+        Óra implementáció csere (pl. VirtualClock replay módban)
+
+        Args:
+            impl: RealClock / VirtualClock példány
+        """
+        with self.lock:
+            self.impl = impl
+
+    @property
+    def name(self):
+        return self.impl.name
+
+    def time(self):
+        return self.impl.time()
+
+    def monotonic(self):
+        return self.impl.monotonic()
+
+    def now(self):
+        return self.impl.now()
+
+    def sleep(self, seconds):
+        self.impl.sleep(seconds)
+
+    def wait(self, waitable, timeout=None):
+        return self.impl.wait(waitable, timeout)
+
+
+# Globális singleton instance
+clock = Clock()
@@ -0,0 +1,135 @@
+"""
+Auto Farm - EasyOCR Engine
+EasyOCR modell háttér betöltése (warmup) + readiness future
+
+A modell betöltése több másodperc; induláskor háttérszálon indul, így a scheduler
+és az első task nem áll meg. Amíg a modell nincs kész, read() None-t ad
+→ a hívó a gyors fallback engine-ekre (glyph / Tesseract) esik vissza.
+"""
+import threading
+from concurrent.futures import Future
+
+import numpy as np
+
+from utils.ocr_result import OCRResult
+
+# EasyOCR support (optional)
+try:
+    import easyocr
+    EASYOCR_AVAILABLE = True
+except ImportError:
+    EASYOCR_AVAILABLE = False
+
+
+class EasyOCREngine:
+    """EasyOCR reader háttér betöltéssel"""
+
+    def __init__(self, languages=('en',), gpu=False):
+        """
+        Args:
+            languages: EasyOCR nyelvek
+            gpu: GPU használat
+        """
+        self.languages = list(languages)
+        self.gpu = gpu
+
+        self.lock = threading.Lock()
+        self.reader = None
+
+        # Inferencia szerializálás: a reader nem thread-safe (batch / konszenzus /
+        # connection monitor szálak), külön lock, hogy a warmup állapot ne blokkoljon
+        self.inference_lock = threading.Lock()
+        self.thread = None
+
+        # Readiness future: result = True (kész) / False (nem elérhető / hiba)
+        self.ready = Future()
+
+    @property
+    def available(self):
+        """Telepítve van-e az EasyOCR"""
+        return EASYOCR_AVAILABLE
+
+    def start_warmup(self):
+        """
+        Modell betöltés indítása háttérszálon (többszöri hívás = no-op)
+
+        Returns:
+            Future: Readiness future
+        """
+        with self.lock:
+            if self.thread is not None or self.ready.done():
+                return self.ready
+
+            if not EASYOCR_AVAILABLE:
+                self.ready.set_result(False)
+                return self.ready
+
+            self.thread = threading.Thread(target=self._warmup, name='easyocr-warmup', daemon=True)
+            self.thread.start()
+
+        return self.ready
+
+    def _warmup(self):
+        """Reader létrehozás + egy próba inferencia (lusta inicializálások előre)"""
+        try:
+            reader = easyocr.Reader(self.languages, gpu=self.gpu, verbose=False)
+            reader.readtext(np.zeros((32, 96), dtype=np.uint8), detail=0)
+        except Exception as e:
+            print(f"⚠️  EasyOCR betöltési hiba: {e}, Tesseract fallback")
+            self.ready.set_result(False)
+            return
+
+        with self.lock:
+            self.reader = reader
+        self.ready.set_result(True)
+
+    def is_ready(self):
+        """Betöltve és használható-e a modell (nem blokkol)"""
+        return self.ready.done() and self.ready.result()
+
+    def wait_ready(self, timeout=None):
+        """
+        Várakozás a modell betöltésére (warmup indítással)
+
+        Args:
+            timeout: Max várakozás (sec, None = végtelen)
+
+        Returns:
+            bool: True ha kész
+        """
+        ready = self.start_warmup()
+        try:
+            return ready.result(timeout=timeout)
+        except Exception:
+            return False
+
+    def read(self, gray, whitelist=None):
+        """
+        EasyOCR olvasás (nem blokkol a modell betöltésére)
+
+        Args:
+            gray: Grayscale numpy kép
+            whitelist: Engedélyezett karakterek (allowlist, None = mind)
+
+        Returns:
+            OCRResult: Összefűzött szöveg + átlagos confidence,
+                       vagy None ha a modell még nincs kész / nem elérhető
+        """
+        if not self.is_ready():
+            # Nincs elindítva (pl. tool-ból) → indítás, ez a hívás már fallback
+            self.start_warmup()
+            return None
+
+        # detail=1: [(bbox, text, confidence), ...]
+        with self.inference_lock:
+            results = self.reader.readtext(gray, detail=1, allowlist=whitelist)
+        if not results:
+            return OCRResult(engine='easyocr')
+
+        text = " ".join(item[1] for item in results).strip()
+        confidence = sum(float(item[2]) for item in results) / len(results)
+        return OCRResult(text, confidence, engine='easyocr')
+
+
+# Globális singleton instance
+easyocr_engine = EasyOCREngine()
@@ -0,0 +1,175 @@
+"""
+Auto Farm - Farm Stats
+Throughput statisztika (gathering / task futás / commander idle idő / OCR latency)
+
+Minden időmérés a clock-on keresztül megy, így replay / VirtualClock mellett
+több órás ütemezés is másodpercek alatt mérhető.
+"""
+import threading
+
+from utils.clock import clock
+
+
+class FarmStats:
+    """Thread-safe throughput számlálók"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Számlálók nullázása (mérés kezdete = most)"""
+        with self.lock:
+            self.started_at = clock.monotonic()
+
+            # Gathering: {commander_id: {...}}
+            self.commanders = {}
+            self.gathers_by_resource = {}
+
+            # Scheduler: {task_type: {'count', 'seconds'}}
+            self.tasks = {}
+
+            # OCR: {engine: {'count', 'cached', 'capture_ms', 'inference_ms'}}
+            self.ocr = {}
+
+    def record_commander_start(self, commander_id):
+        """
+        Commander futás kezdete (idle idő = mióta visszaért / szabad)
+
+        Args:
+            commander_id: Commander ID
+        """
+        now = clock.monotonic()
+
+        with self.lock:
+            stats = self._commander(commander_id)
+            if stats['ready_at'] is not None:
+                stats['idle_seconds'] += max(0.0, now - stats['ready_at'])
+                stats['ready_at'] = None
+
+    def record_gather(self, commander_id, resource, march_seconds, gather_seconds):
+        """
+        Sikeres gathering kiküldés
+
+        Args:
+            commander_id: Commander ID
+            resource: Erőforrás típus (wheat / wood / stone / gold)
+            march_seconds: Menetidő (egy irány)
+            gather_seconds: Gyűjtési idő
+        """
+        now = clock.monotonic()
+
+        with self.lock:
+            stats = self._commander(commander_id)
+            stats['gathers'] += 1
+            stats['gather_seconds'] += gather_seconds
+            stats['march_seconds'] += march_seconds
+            # Szabad: oda menet + gyűjtés + vissza menet után
+            stats['ready_at'] = now + march_seconds + gather_seconds + march_seconds
+
+            resource = resource or 'unknown'
+            self.gathers_by_resource[resource] = self.gathers_by_resource.get(resource, 0) + 1
+
+    def record_commander_failure(self, commander_id):
+        """
+        Sikertelen commander ciklus (retry / restart) - a commander szabad marad
+
+        Args:
+            commander_id: Commander ID
+        """
+        now = clock.monotonic()
+
+        with self.lock:
+            stats = self._commander(commander_id)
+            stats['failures'] += 1
+            stats['ready_at'] = now
+
+    def record_task(self, task_type, duration):
+        """
+        Scheduler task futásidő
+
+        Args:
+            task_type: Task típus
+            duration: Futásidő (másodperc)
+        """
+        with self.lock:
+            stats = self.tasks.setdefault(task_type, {'count': 0, 'seconds': 0.0})
+            stats['count'] += 1
+            stats['seconds'] += duration
+
+    def record_ocr(self, result):
+        """
+        OCR olvasás időzítése (engine szerint)
+
+        Args:
+            result: OCRResult
+        """
+        with self.lock:
+            stats = self.ocr.setdefault(result.engine or 'none', {
+                'count': 0, 'cached': 0, 'capture_ms': 0.0, 'inference_ms': 0.0
+            })
+            stats['count'] += 1
+            stats['capture_ms'] += result.capture_ms
+            stats['inference_ms'] += result.inference_ms
+            if result.cached:
+                stats['cached'] += 1
+
+    def get_summary(self):
+        """
+        Throughput összesítő
+
+        Returns:
+            dict: {'elapsed_hours', 'gathers', 'gathers_per_hour', 'gather_hours',
+                   'idle_hours', 'by_resource', 'commanders', 'tasks', 'ocr'}
+                  ocr: {engine: {'count', 'cached', 'avg_capture_ms', 'avg_inference_ms'}}
+        """
+        with self.lock:
+            now = clock.monotonic()
+            elapsed = max(now - self.started_at, 1e-9)
+            hours = elapsed / 3600
+
+            # Nyitott idle intervallumok lezárása (visszaért, de még nem indult újra)
+            commanders = {}
+            for cid, c in self.commanders.items():
+                commander = dict(c)
+                if commander['ready_at'] is not None and commander['ready_at'] < now:
+                    commander['idle_seconds'] += now - commander['ready_at']
+                commanders[cid] = commander
+
+            gathers = sum(c['gathers'] for c in commanders.values())
+            gather_seconds = sum(c['gather_seconds'] for c in commanders.values())
+            idle_seconds = sum(c['idle_seconds'] for c in commanders.values())
+
+            return {
+                'elapsed_hours': round(hours, 2),
+                'gathers': gathers,
+                'gathers_per_hour': round(gathers / hours, 2),
+                'gather_hours': round(gather_seconds / 3600, 2),
+                'idle_hours': round(idle_seconds / 3600, 2),
+                'by_resource': dict(self.gathers_by_resource),
+                'commanders': commanders,
+                'tasks': {t: dict(s) for t, s in self.tasks.items()},
+                'ocr': {engine: {
+                    'count': s['count'],
+                    'cached': s['cached'],
+                    'avg_capture_ms': round(s['capture_ms'] / s['count'], 1),
+                    'avg_inference_ms': round(s['inference_ms'] / s['count'], 1)
+                } for engine, s in self.ocr.items()}
+            }
+
+    def _commander(self, commander_id):
+        """Commander számlálók (lock alatt hívandó!)"""
+        if commander_id not in self.commanders:
+            self.commanders[commander_id] = {
+                'gathers': 0,
+                'failures': 0,
+                'gather_seconds': 0,
+                'march_seconds': 0,
+                'idle_seconds': 0.0,
+                'ready_at': None
+            }
+        return self.commanders[commander_id]
+
+
+# Globális singleton instance
+farm_stats = FarmStats()
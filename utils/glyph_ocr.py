@@ -0,0 +1,342 @@
+"""
+Auto Farm - Glyph OCR
+Fix játék font felismerő (timerek, erőforrás számlálók, explorer %)
+
+Karakterkészlet: 0-9 : . K M %
+- Glyph library: címkézett capture-ökből kivágott karakter képek (images/glyphs/)
+- Felismerés: bináris kép → connected components → normalizált glyph vektorok
+  → egyetlen mátrixszorzás (korreláció) az összes template-tel
+
+Nagyságrendben sub-milliszekundum / régió, ezért az EasyOCR / Tesseract elé kerül;
+alacsony confidence esetén a hívó a lassabb engine-ekre esik vissza.
+"""
+import threading
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from utils.ocr_result import OCRResult
+
+
+# Támogatott karakterek és fájlnév kódjuk (images/glyphs/<kód>_<n>.png)
+GLYPH_CHARSET = "0123456789:.KM%"
+GLYPH_FILE_NAMES = {':': 'colon', '.': 'dot', '%': 'percent'}
+
+# Normalizált glyph méret (szélesség, magasság)
+GLYPH_SIZE = (12, 18)
+
+# Alapértelmezett minimális confidence (leggyengébb karakter korrelációja)
+DEFAULT_MIN_CONFIDENCE = 0.75
+
+
+def char_to_file_name(char):
+    """Karakter → glyph fájlnév prefix"""
+    return GLYPH_FILE_NAMES.get(char, char)
+
+
+def file_name_to_char(name):
+    """Glyph fájlnév prefix → karakter (None ha ismeretlen)"""
+    for char, file_name in GLYPH_FILE_NAMES.items():
+        if name == file_name:
+            return char
+    return name if len(name) == 1 and name in GLYPH_CHARSET else None
+
+
+def binarize(image):
+    """
+    Kép → bináris (tinta = 255), polaritás automatikusan
+
+    Args:
+        image: BGR vagy grayscale numpy kép
+
+    Returns:
+        numpy.ndarray: Bináris kép (uint8, 0 / 255)
+    """
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+
+    # A tinta a kisebbség (világos szöveg sötét háttéren vagy fordítva)
+    if np.count_nonzero(binary) > binary.size / 2:
+        binary = cv2.bitwise_not(binary)
+
+    return binary
+
+
+def segment(binary, min_area=3):
+    """
+    Bináris kép → karakter dobozok (balról jobbra)
+
+    Az x irányban átfedő komponensek (pl. ':' két pontja, '%' részei) összevonva.
+
+    Args:
+        binary: Bináris kép (tinta = 255)
+        min_area: Ennél kisebb komponens = zaj
+
+    Returns:
+        list: [(x, y, w, h), ...] balról jobbra
+    """
+    count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+
+    boxes = []
+    for label in range(1, count):
+        x, y, w, h, area = stats[label]
+        if area >= min_area:
+            boxes.append([x, y, x + w, y + h])
+
+    boxes.sort(key=lambda b: b[0])
+
+    merged = []
+    for box in boxes:
+        if merged:
+            last = merged[-1]
+            # Átfedés: a kisebbik szélesség legalább fele közös
+            overlap = min(last[2], box[2]) - max(last[0], box[0])
+            if overlap > 0 and overlap >= 0.5 * min(last[2] - last[0], box[2] - box[0]):
+                last[0], last[1] = min(last[0], box[0]), min(last[1], box[1])
+                last[2], last[3] = max(last[2], box[2]), max(last[3], box[3])
+                continue
+        merged.append(box)
+
+    return [(x1, y1, x2 - x1, y2 - y1) for x1, y1, x2, y2 in merged]
+
+
+def glyph_features(binary, box, line_top, line_height):
+    """
+    Glyph → (normalizált vektor, relatív magasság, relatív középpont)
+
+    Args:
+        binary: Bináris kép
+        box: (x, y, w, h)
+        line_top: Szövegsor teteje (y)
+        line_height: Szövegsor magassága
+
+    Returns:
+        tuple: (vector, rel_height, rel_center)
+    """
+    x, y, w, h = box
+    crop = binary[y:y + h, x:x + w].astype(np.float32)
+
+    vector = cv2.resize(crop, GLYPH_SIZE, interpolation=cv2.INTER_AREA).ravel()
+    vector -= vector.mean()
+    norm = np.linalg.norm(vector)
+    if norm > 0:
+        vector /= norm
+
+    rel_height = h / max(line_height, 1)
+    rel_center = (y + h / 2 - line_top) / max(line_height, 1)
+
+    return vector, rel_height, rel_center
+
+
+def extract_glyphs(image):
+    """
+    Régió kép → glyph-ek (bináris kép, dobozok, sor metrikák)
+
+    Returns:
+        tuple: (binary, boxes, line_top, line_height)
+    """
+    binary = binarize(image)
+    boxes = segment(binary)
+
+    if not boxes:
+        return binary, [], 0, 0
+
+    line_top = min(b[1] for b in boxes)
+    line_height = max(b[1] + b[3] for b in boxes) - line_top
+
+    return binary, boxes, line_top, line_height
+
+
+class GlyphRecognizer:
+    """Glyph template library + vektorizált korrelációs osztályozó"""
+
+    def __init__(self, glyphs_dir=None, min_confidence=DEFAULT_MIN_CONFIDENCE):
+        if glyphs_dir is None:
+            glyphs_dir = Path(__file__).parent.parent / 'images' / 'glyphs'
+
+        self.glyphs_dir = Path(glyphs_dir)
+        self.min_confidence = min_confidence
+
+        self.lock = threading.Lock()
+
+        # Template mátrix: (N, D) + címkék / geometria
+        self.matrix = None
+        self.labels = []
+        self.rel_heights = None
+        self.rel_centers = None
+        self.loaded = False
+
+    def is_ready(self):
+        """Van-e betöltött glyph library?"""
+        self._ensure_loaded()
+        return self.matrix is not None
+
+    def load(self):
+        """
+        Glyph library betöltése (images/glyphs/*.png)
+
+        Returns:
+            int: Betöltött template-ek száma
+        """
+        vectors, labels, heights, centers = [], [], [], []
+
+        if self.glyphs_dir.exists():
+            for glyph_path in sorted(self.glyphs_dir.glob('*.png')):
+                char = file_name_to_char(glyph_path.stem.rsplit('_', 1)[0])
+                if char is None:
+                    continue
+
+                image = cv2.imread(str(glyph_path), cv2.IMREAD_GRAYSCALE)
+                if image is None:
+                    continue
+
+                # A glyph fájl már bináris (tinta = 255), sor magasságú vászon
+                binary = np.where(image > 127, 255, 0).astype(np.uint8)
+                boxes = segment(binary)
+                if not boxes:
+                    continue
+
+                box = self._union(boxes)
+                vector, rel_height, rel_center = glyph_features(binary, box, 0, binary.shape[0])
+
+                vectors.append(vector)
+                labels.append(char)
+                heights.append(rel_height)
+                centers.append(rel_center)
+
+        with self.lock:
+            self.loaded = True
+            if vectors:
+                self.matrix = np.vstack(vectors)
+                self.labels = labels
+                self.rel_heights = np.array(heights, dtype=np.float32)
+                self.rel_centers = np.array(centers, dtype=np.float32)
+            else:
+                self.matrix = None
+                self.labels = []
+
+        return len(labels)
+
+    def recognize(self, image):
+        """
+        Régió felismerése
+
+        Args:
+            image: BGR vagy grayscale numpy kép (OCR régió)
+
+        Returns:
+            tuple: (text, confidence) - confidence = leggyengébb karakter pontszáma,
+                   ("", 0.0) ha nincs library / glyph
+        """
+        self._ensure_loaded()
+
+        with self.lock:
+            matrix, labels = self.matrix, self.labels
+            rel_heights, rel_centers = self.rel_heights, self.rel_centers
+
+        if matrix is None:
+            return "", 0.0
+
+        binary, boxes, line_top, line_height = extract_glyphs(image)
+        if not boxes:
+            return "", 0.0
+
+        features = [glyph_features(binary, box, line_top, line_height) for box in boxes]
+        vectors = np.vstack([f[0] for f in features])
+        heights = np.array([f[1] for f in features], dtype=np.float32)
+        centers = np.array([f[2] for f in features], dtype=np.float32)
+
+        # (glyph, template) korreláció - egyetlen mátrixszorzás
+        scores = vectors @ matrix.T
+
+        # Geometria büntetés ('.' vs ':' vs számjegy azonos alakú foltoknál)
+        scores -= np.abs(heights[:, None] - rel_heights[None, :])
+        scores -= np.abs(centers[:, None] - rel_centers[None, :])
+
+        best = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(boxes)), best]
+
+        text = "".join(labels[i] for i in best)
+        return text, float(best_scores.min())
+
+    def read(self, image, validator=None):
+        """
+        Felismerés confidence + opcionális validátor ellenőrzéssel
+
+        Args:
+            image: OCR régió kép
+            validator: Opcionális callable(text) → bool
+
+        Returns:
+            OCRResult: Felismert szöveg + confidence, vagy None ha nem elég biztos (→ fallback engine)
+        """
+        text, confidence = self.recognize(image)
+
+        if not text or confidence < self.min_confidence:
+            return None
+        if validator is not None and not validator(text):
+            return None
+
+        return OCRResult(text, confidence, engine='glyph')
+
+    def add_capture(self, image, text):
+        """
+        Címkézett capture → glyph fájlok (library bővítés)
+
+        Args:
+            image: OCR régió kép (BGR / grayscale)
+            text: A képen látható szöveg (szóközök nélkül, pl. "01:23:45")
+
+        Returns:
+            int: Mentett glyph-ek száma (0 ha a szegmentálás nem egyezik a szöveggel)
+        """
+        text = text.replace(' ', '')
+        binary, boxes, line_top, line_height = extract_glyphs(image)
+
+        if len(boxes) != len(text):
+            return 0
+
+        self.glyphs_dir.mkdir(parents=True, exist_ok=True)
+
+        saved = 0
+        for char, (x, y, w, h) in zip(text, boxes):
+            if char not in GLYPH_CHARSET:
+                continue
+
+            # Sor magasságú vászon → a relatív magasság / pozíció megmarad
+            glyph = binary[line_top:line_top + line_height, x:x + w]
+
+            prefix = char_to_file_name(char)
+            index = self._next_index(prefix)
+            cv2.imwrite(str(self.glyphs_dir / f'{prefix}_{index}.png'), glyph)
+            saved += 1
+
+        self.load()
+        return saved
+
+    def _next_index(self, prefix):
+        """Következő szabad fájl sorszám (legnagyobb meglévő + 1, törölt glyph helye nem íródik felül)"""
+        indices = []
+        for path in self.glyphs_dir.glob(f'{prefix}_*.png'):
+            suffix = path.stem[len(prefix) + 1:]
+            if suffix.isdigit():
+                indices.append(int(suffix))
+        return max(indices) + 1 if indices else 0
+
+    def _ensure_loaded(self):
+        if not self.loaded:
+            self.load()
+
+    @staticmethod
+    def _union(boxes):
+        """Dobozok befoglaló doboza"""
+        x1 = min(b[0] for b in boxes)
+        y1 = min(b[1] for b in boxes)
+        x2 = max(b[0] + b[2] for b in boxes)
+        y2 = max(b[1] + b[3] for b in boxes)
+        return (x1, y1, x2 - x1, y2 - y1)
+
+
+# Globális singleton instance
+glyph_recognizer = GlyphRecognizer()
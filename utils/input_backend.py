@@ -0,0 +1,163 @@
+"""
+Auto Farm - Input Backend
+Cserélhető egér / billentyű backend: valós (pyautogui + pynput) vagy
+rögzítő (replay módban nem küld semmit, csak feljegyzi az eseményeket)
+"""
+import json
+import threading
+from pathlib import Path
+
+
+class InputBackend:
+    """Input backend interfész"""
+
+    name = "base"
+
+    def click(self, x, y):
+        raise NotImplementedError
+
+    def press(self, key):
+        raise NotImplementedError
+
+    def screen_size(self):
+        """Képernyő méret (width, height)"""
+        raise NotImplementedError
+
+
+class PyAutoGUIInputBackend(InputBackend):
+    """Valós input: pyautogui kattintás + pynput billentyűzet"""
+
+    name = "pyautogui"
+
+    def __init__(self):
+        import pyautogui
+        from pynput.keyboard import Controller, Key
+
+        self._pyautogui = pyautogui
+        self.keyboard = Controller()
+
+        # pyautogui beállítások
+        pyautogui.FAILSAFE = True
+        pyautogui.PAUSE = 0.1
+
+        self.key_map = {
+            'space': Key.space,
+            'enter': Key.enter,
+            'esc': Key.esc,
+            'f': 'f',
+            'b': 'b',
+            'tab': Key.tab
+        }
+
+    def click(self, x, y):
+        self._pyautogui.click(x, y)
+
+    def press(self, key):
+        mapped_key = self.key_map.get(key.lower(), key)
+        self.keyboard.press(mapped_key)
+        self.keyboard.release(mapped_key)
+
+    def screen_size(self):
+        width, height = self._pyautogui.size()
+        return (width, height)
+
+
+class RecordingInputBackend(InputBackend):
+    """
+    Rögzítő input (replay / benchmark)
+
+    Nem küld eseményt a rendszernek, csak feljegyzi (virtuális időbélyeggel),
+    opcionálisan JSONL fájlba is.
+    """
+
+    name = "recording"
+
+    def __init__(self, screen_size=(1920, 1080), output_file=None):
+        """
+        Args:
+            screen_size: Szimulált képernyő méret (width, height)
+            output_file: JSONL fájl az eseményeknek (None = csak memória)
+        """
+        self.size = tuple(screen_size)
+        self.output_file = Path(output_file) if output_file else None
+
+        self.lock = threading.Lock()
+        self.events = []
+
+        if self.output_file:
+            self.output_file.parent.mkdir(parents=True, exist_ok=True)
+            self.output_file.write_text('', encoding='utf-8')
+
+    def click(self, x, y):
+        self._record({'event': 'click', 'x': int(x), 'y': int(y)})
+
+    def press(self, key):
+        self._record({'event': 'key', 'key': key})
+
+    def screen_size(self):
+        return self.size
+
+    def get_events(self):
+        """Rögzített események (másolat)"""
+        with self.lock:
+            return list(self.events)
+
+    def get_summary(self):
+        """
+        Esemény összesítő
+
+        Returns:
+            dict: {'clicks': n, 'keys': n}
+        """
+        with self.lock:
+            clicks = sum(1 for e in self.events if e['event'] == 'click')
+            return {'clicks': clicks, 'keys': len(self.events) - clicks}
+
+    def _record(self, event):
+        from utils.clock import clock
+
+        event['t'] = round(clock.time(), 3)
+
+        with self.lock:
+            self.events.append(event)
+
+            if self.output_file:
+                with open(self.output_file, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(event) + '\n')
+
+
+class InputController:
+    """Aktív input backend (lazy default: pyautogui)"""
+
+    def __init__(self, backend=None):
+        self.lock = threading.Lock()
+        self.backend = backend
+
+    def set_backend(self, backend):
+        """
+        Backend csere (pl. RecordingInputBackend replay módban)
+
+        Args:
+            backend: InputBackend példány
+        """
+        with self.lock:
+            self.backend = backend
+
+    def get_backend(self):
+        with self.lock:
+            if self.backend is None:
+                self.backend = PyAutoGUIInputBackend()
+            return self.backend
+
+    def click(self, x, y):
+        self.get_backend().click(x, y)
+
+    def press(self, key):
+        self.get_backend().press(key)
+
+    def screen_size(self):
+        return self.get_backend().screen_size()
+
+
+# Globális singleton instance
+input_controller = InputController()
@@ -3,10 +3,11 @@ Auto Farm - Logger
 Színes, részletes logging minden művelethez + File logging + Log rotáció
 MÓDOSÍTVA: Mozgás tracking (click, action, search) Anti-AFK számára
 """
-from datetime import datetime
 from pathlib import Path
 import threading
 
+from utils.clock import clock
+
 
 class FarmLogger:
     """Részletes logging rendszer file logging-gal + movement tracking"""
@@ -44,7 +45,7 @@ class FarmLogger:
         cls._logs_dir.mkdir(parents=True, exist_ok=True)
         
         # Log fájl név generálás
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = clock.now().strftime("%Y%m%d_%H%M%S")
         log_filename = f"farm_{timestamp}.log"
         log_path = cls._logs_dir / log_filename
         
@@ -112,7 +113,7 @@ class FarmLogger:
         ✅ ÚJ: Mozgás regisztrálása (click, action, search)
         Anti-AFK idle detection használja
         """
-        cls._last_movement_time = datetime.now()
+        cls._last_movement_time = clock.now()
     
     @classmethod
     def get_last_movement_time(cls):
@@ -127,7 +128,7 @@ class FarmLogger:
     @staticmethod
     def _timestamp():
         """Időbélyeg generálás"""
-        FarmLogger._last_log_time = datetime.now()
+        FarmLogger._last_log_time = clock.now()
         return FarmLogger._last_log_time.strftime("%H:%M:%S")
     
     @staticmethod
@@ -0,0 +1,105 @@
+"""
+Auto Farm - OCR Cache
+Tartalom-alapú OCR eredmény cache (LRU)
+
+Kulcs: a grayscale crop pixeleinek gyors hash-e + az OCR beállítások.
+Azonos pixelek (statikus "Idle" / "Completed" feliratok, változatlan explorer %)
+újraolvasása mikroszekundumos cache találat OCR futtatás helyett.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class OCRCache:
+    """Thread-safe LRU cache: pixel hash + beállítások → OCR eredmény"""
+
+    def __init__(self, max_entries=256):
+        """
+        Args:
+            max_entries: Max cache bejegyzés (0 = kikapcsolva)
+        """
+        self.max_entries = max_entries
+
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+        # Statisztika
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(image, settings=()):
+        """
+        Cache kulcs
+
+        Args:
+            image: Grayscale numpy kép (a crop)
+            settings: Hashelhető tuple az OCR beállításokból (engine, whitelist, ...)
+
+        Returns:
+            tuple: (digest, shape, settings)
+        """
+        digest = hashlib.blake2b(image.tobytes(), digest_size=16).digest()
+        return (digest, image.shape, settings)
+
+    def get(self, key):
+        """
+        Cache lekérés
+
+        Returns:
+            OCRResult: Cache-elt eredmény vagy None ha nincs
+        """
+        with self.lock:
+            result = self.entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key, result):
+        """
+        Eredmény mentése (legrégebben használt bejegyzés kiesik)
+
+        Args:
+            key: make_key() kulcs
+            result: OCRResult
+        """
+        if self.max_entries <= 0 or result is None:
+            return
+
+        with self.lock:
+            self.entries[key] = result
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        """Cache ürítés"""
+        with self.lock:
+            self.entries.clear()
+
+    def get_stats(self):
+        """
+        Cache statisztika (tuning-hoz)
+
+        Returns:
+            dict: {'entries', 'max_entries', 'hits', 'misses', 'hit_rate'}
+        """
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0
+            }
+
+
+# Globális singleton instance
+ocr_cache = OCRCache()
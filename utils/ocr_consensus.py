@@ -0,0 +1,209 @@
+"""
+Auto Farm - OCR Consensus
+Többségi szavazás több frame OCR-jén (egy szolgáltatás minden managernek)
+
+Egy kör: `votes` friss frame gyors egymásutánban, az OCR-ek párhuzamosan
+(ocr_engine.read_batch) → a konszenzus kb. egy OCR késleltetése, nem N-é.
+Ha nincs többség és van még idő a deadline-ig, újabb kör.
+Több régió (read_many): egy capture a befoglaló téglalapról, régiónként szavazás.
+"""
+from collections import Counter
+
+import cv2
+
+from utils.capture import screen_capture
+from utils.clock import clock
+from utils.ocr_engine import ocr_engine
+from utils.ocr_result import OCRResult
+
+
+class OCRConsensus:
+    """Régió konszenzus olvasás: frame-ek → párhuzamos OCR → szavazás"""
+
+    def __init__(self, frame_interval=0.05):
+        """
+        Args:
+            frame_interval: Frame-ek közti szünet egy körön belül (sec)
+        """
+        self.frame_interval = frame_interval
+
+    def read(self, region, grammar=None, votes=3, deadline=2.0, use_easyocr=True, whitelist=None):
+        """
+        Konszenzus olvasás
+
+        Args:
+            region: dict - OCR régió
+            grammar: Várt formátum (szavazás a grammar.parse() értékeken; None = nem üres szöveg)
+            votes: Frame-ek (szavazatok) száma körönként
+            deadline: Max idő (sec) - ha nincs többség, addig újabb körök
+            use_easyocr / whitelist: lásd ImageManager.read_text_from_region
+
+        Returns:
+            dict: {
+                'text': győztes szöveg ("" ha nincs olvasható),
+                'value': győztes érték (grammar.parse, None ha nincs),
+                'valid': illeszkedik-e a grammar-ra,
+                'votes': győztes szavazatai, 'total': összes olvasás,
+                'share': szavazati arány (0-1), 'latency': teljes idő (sec),
+                'confidence': a győztes olvasások legjobb confidence-e (None ha ismeretlen),
+                'readings': összes nem üres olvasás
+            }
+        """
+        return self.read_many({'region': region}, grammar=grammar, votes=votes, deadline=deadline,
+                              use_easyocr=use_easyocr, whitelist=whitelist)['region']
+
+    def read_many(self, regions, grammar=None, votes=3, deadline=2.0, use_easyocr=True, whitelist=None):
+        """
+        Konszenzus olvasás több régióra egyszerre (pl. training panel összes building-je)
+
+        Körönként `votes` capture a régiók befoglaló téglalapjáról, régiónként kivágva,
+        az összes kivágás OCR-je párhuzamosan. A következő kör csak a még többség
+        nélküli régiókat olvassa.
+
+        Args:
+            regions: dict - {név: OCR régió} (üres régió → üres eredmény)
+            (többi: lásd read)
+
+        Returns:
+            dict: {név: read() eredmény dict}
+        """
+        from library import ImageManager
+
+        started = clock.monotonic()
+
+        readings = {name: [] for name in regions}
+        totals = {name: 0 for name in regions}
+        results = {name: self._tally([], grammar) for name in regions}
+
+        # Nincs beállított régió → üres eredmény
+        pending = [name for name, region in regions.items() if region]
+
+        def read_one(item):
+            name, gray = item
+            return ImageManager.ocr_cached(gray, use_easyocr=use_easyocr, whitelist=whitelist,
+                                           grammar=grammar, region_key=self._region_key(regions[name]))
+
+        while pending:
+            bounds = self._bounds([regions[name] for name in pending])
+            frames = self._capture(bounds, votes)
+            if not frames:
+                # Egy frame sem olvasható (nincs ablak / capture hiba) → nincs mire szavazni
+                self._log_warning("Konszenzus: egyik capture sem sikerült, olvasás megszakítva")
+                break
+
+            items = [(name, self._crop(gray, bounds, regions[name])) for gray in frames for name in pending]
+            for (name, _), result in zip(items, ocr_engine.read_batch(read_one, items, default=OCRResult())):
+                totals[name] += 1
+                if result:
+                    readings[name].append(result)
+
+            undecided = []
+            for name in pending:
+                results[name] = self._tally(readings[name], grammar)
+                if not (results[name]['valid'] and results[name]['votes'] * 2 > totals[name]):
+                    undecided.append(name)
+            pending = undecided
+
+            if clock.monotonic() - started >= deadline:
+                break
+
+        latency = round(clock.monotonic() - started, 3)
+        for name, result in results.items():
+            total = totals[name]
+            result.update({
+                'total': total,
+                'share': round(result['votes'] / total, 2) if total else 0.0,
+                'latency': latency,
+                'readings': [reading.text for reading in readings[name]]
+            })
+        return results
+
+    def _capture(self, region, count):
+        """count friss frame a régióról (grayscale)"""
+        frames = []
+        for index in range(count):
+            if index > 0:
+                clock.sleep(self.frame_interval)
+
+            try:
+                image = screen_capture.grab_region(region)
+            except Exception as e:
+                self._log_warning(f"Konszenzus capture hiba: {e}")
+                continue
+
+            frames.append(image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY))
+
+        return frames
+
+    @staticmethod
+    def _bounds(regions):
+        """Régiók befoglaló téglalapja (egy capture az összes régióhoz)"""
+        left = min(region['x'] for region in regions)
+        top = min(region['y'] for region in regions)
+        right = max(region['x'] + region['width'] for region in regions)
+        bottom = max(region['y'] + region['height'] for region in regions)
+        return {'x': left, 'y': top, 'width': right - left, 'height': bottom - top}
+
+    @staticmethod
+    def _crop(gray, bounds, region):
+        """Régió kivágása a befoglaló téglalap capture-ből"""
+        x = region['x'] - bounds['x']
+        y = region['y'] - bounds['y']
+        return gray[y:y + region['height'], x:x + region['width']]
+
+    @staticmethod
+    def _region_key(region):
+        """Régió azonosító (nyerő variáns statisztika)"""
+        return (region.get('x', 0), region.get('y', 0), region.get('width', 0), region.get('height', 0))
+
+    @staticmethod
+    def _tally(readings, grammar):
+        """
+        Szavazás: illeszkedő olvasások értékei; ha nincs illeszkedő, a leggyakoribb nyers szöveg
+
+        Args:
+            readings: OCRResult lista (nem üres olvasások)
+
+        Returns:
+            dict: {'text', 'value', 'valid', 'votes', 'confidence'}
+        """
+        valid = []
+        for reading in readings:
+            if grammar is None:
+                valid.append((reading.text.strip(), reading))
+            elif grammar.validate(reading.text):
+                valid.append((grammar.parse(reading.text), reading))
+
+        if valid:
+            value, count = Counter(value for value, _ in valid).most_common(1)[0]
+            winners = [reading for v, reading in valid if v == value]
+            return {'text': winners[0].text, 'value': value, 'valid': True, 'votes': count,
+                    'confidence': OCRConsensus._best_confidence(winners)}
+
+        if readings:
+            # Nincs illeszkedő: a hívó a nyers szöveggel dönthet (pl. szemét → popup)
+            text, count = Counter(reading.text for reading in readings).most_common(1)[0]
+            winners = [reading for reading in readings if reading.text == text]
+            return {'text': text, 'value': None, 'valid': False, 'votes': count,
+                    'confidence': OCRConsensus._best_confidence(winners)}
+
+        return {'text': "", 'value': None, 'valid': False, 'votes': 0, 'confidence': None}
+
+    @staticmethod
+    def _best_confidence(readings):
+        """Legjobb ismert confidence (None ha egyik olvasásé sem ismert)"""
+        known = [reading.confidence for reading in readings if reading.confidence is not None]
+        return max(known) if known else None
+
+    def _log_warning(self, message):
+        """Logging konszenzus hibákhoz"""
+        try:
+            from utils.logger import FarmLogger as log
+            log.warning(f"[OCRConsensus] {message}")
+        except:
+            # Ha logger még nincs inicializálva
+            print(f"[OCRConsensus] {message}")
+
+
+# Globális singleton instance
+ocr_consensus = OCRConsensus()
@@ -0,0 +1,336 @@
+"""
+Auto Farm - OCR Engine
+Tesseract preprocessing variánsok párhuzamos futtatása worker pool-ban
+
+A három variáns (OTSU, Adaptive, CLAHE) egyszerre indul; az olvasás
+az első validált eredménynél (validator) vagy az összes befejeződésekor tér vissza.
+
+Régiónkénti nyerő variáns statisztika: a grammar-os (cascade) olvasás a régión
+legtöbbször validált variánst próbálja először, egyedül.
+
+Tesseract backend:
+- tesserocr (ha telepítve): worker szálanként perzisztens API handle (PSM 7),
+  numpy buffer közvetlenül, nincs temp fájl / process indítás
+- pytesseract: fallback (tesseract.exe subprocess hívásonként)
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import cv2
+import numpy as np
+import pytesseract
+
+from utils.ocr_result import OCRResult
+
+# In-process Tesseract binding (optional)
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+
+# Számjegy + kettőspont whitelist (HH:MM:SS timerek)
+DIGIT_WHITELIST = "0123456789:"
+
+
+def preprocess_otsu(gray):
+    """MÓDSZER 1: OTSU Threshold"""
+    _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return thresh
+
+
+def preprocess_adaptive(gray):
+    """MÓDSZER 2: Adaptive Threshold"""
+    return cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                 cv2.THRESH_BINARY, 11, 2)
+
+
+def preprocess_clahe(gray):
+    """MÓDSZER 3: Kontrasztfokozás + OTSU"""
+    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+    enhanced = clahe.apply(gray)
+    _, thresh = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return thresh
+
+
+# Preprocessing variánsok (sorrend = holtversenynél preferált)
+TESSERACT_VARIANTS = (
+    ('otsu', preprocess_otsu),
+    ('adaptive', preprocess_adaptive),
+    ('clahe', preprocess_clahe),
+)
+VARIANT_PREPROCESS = dict(TESSERACT_VARIANTS)
+
+
+class OCREngine:
+    """Tesseract variánsok párhuzamos futtatása (bounded thread pool)"""
+
+    def __init__(self, max_workers=3, tessdata_path=None, batch_workers=4):
+        """
+        Args:
+            max_workers: Párhuzamos Tesseract hívások max száma
+            tessdata_path: tessdata könyvtár (tesserocr, None = alapértelmezett)
+            batch_workers: Párhuzamosan OCR-ezett régiók max száma (read_batch)
+        """
+        self.max_workers = max_workers
+        self.tessdata_path = tessdata_path
+        self.batch_workers = batch_workers
+        self.lock = threading.Lock()
+        self.executor = None
+        self.batch_executor = None
+
+        # Szálanként perzisztens tesserocr API-k: {whitelist: api}
+        self.thread_local = threading.local()
+        self.apis = []
+        self.tesserocr_failed = False
+
+        # Régiónként nyerő (validált) variánsok: {region_key: {variant: count}}
+        self.variant_wins = {}
+
+    @property
+    def backend_name(self):
+        """Aktív Tesseract backend neve"""
+        if TESSEROCR_AVAILABLE and not self.tesserocr_failed:
+            return "tesserocr"
+        return "pytesseract"
+
+    def get_executor(self):
+        """Worker pool (lazy indítás)"""
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                   thread_name_prefix='ocr')
+            return self.executor
+
+    def read_batch(self, func, items, default=""):
+        """
+        Több régió OCR-je párhuzamosan, külön worker pool-ban
+
+        Külön pool, mert a régió worker-ek a variáns pool-ra (read_tesseract) várnak.
+
+        Args:
+            func: callable(item) → eredmény
+            items: Régiónkénti bemenetek listája
+            default: Eredmény hiba esetén
+
+        Returns:
+            list: Eredmények a bemenetek sorrendjében
+        """
+        if len(items) <= 1:
+            return [self._safe_call(func, item, default) for item in items]
+
+        with self.lock:
+            if self.batch_executor is None:
+                self.batch_executor = ThreadPoolExecutor(max_workers=self.batch_workers,
+                                                         thread_name_prefix='ocr_batch')
+            executor = self.batch_executor
+
+        futures = [executor.submit(self._safe_call, func, item, default) for item in items]
+        return [future.result() for future in futures]
+
+    @staticmethod
+    def _safe_call(func, item, default):
+        try:
+            return func(item)
+        except Exception as e:
+            print(f"OCR batch hiba: {e}")
+            return default
+
+    def get_variant_order(self, region_key=None):
+        """
+        Variánsok próbálási sorrendje egy régióra
+
+        Args:
+            region_key: Régió azonosító (None = alapértelmezett sorrend)
+
+        Returns:
+            list: Variáns nevek, a régión legtöbbször nyerő elöl
+        """
+        default_order = [name for name, _ in TESSERACT_VARIANTS]
+        if region_key is None:
+            return default_order
+
+        with self.lock:
+            wins = dict(self.variant_wins.get(region_key, {}))
+
+        return sorted(default_order, key=lambda name: (-wins.get(name, 0), default_order.index(name)))
+
+    def record_win(self, region_key, variant):
+        """Validált eredményt adó variáns feljegyzése a régióhoz"""
+        if region_key is None or variant is None:
+            return
+
+        with self.lock:
+            wins = self.variant_wins.setdefault(region_key, {})
+            wins[variant] = wins.get(variant, 0) + 1
+
+    def read_variant(self, gray, variant, debug_images=None, whitelist=None):
+        """
+        Egyetlen variáns olvasása a hívó szálon (cascade első lépése)
+
+        Returns:
+            OCRResult: Eredmény (üres szöveg hiba esetén)
+        """
+        try:
+            text, confidence = self._run_variant(gray, VARIANT_PREPROCESS[variant], debug_images, variant, whitelist)
+        except Exception as e:
+            print(f"Tesseract hiba ({variant}): {e}")
+            return OCRResult(engine='tesseract', variant=variant)
+
+        return OCRResult(text, confidence, engine='tesseract', variant=variant)
+
+    def read_tesseract(self, gray, validator=None, debug_images=None, whitelist=None, variants=None):
+        """
+        Tesseract olvasás az összes preprocessing variánssal, párhuzamosan
+
+        Args:
+            gray: Grayscale numpy kép
+            validator: Opcionális callable(text) → bool; az első valid eredménynél visszatér
+            debug_images: Opcionális dict, ide kerülnek a preprocessed képek {variant: kép}
+            whitelist: Engedélyezett karakterek (pl. DIGIT_WHITELIST, None = mind)
+            variants: Futtatandó variánsok (sorrend = holtversenynél preferált, None = mind)
+
+        Returns:
+            OCRResult: Validált vagy leghosszabb szöveg (üres eredmény ha nincs szöveg)
+        """
+        if variants is None:
+            variants = [name for name, _ in TESSERACT_VARIANTS]
+        if not variants:
+            return OCRResult(engine='tesseract')
+
+        executor = self.get_executor()
+
+        futures = {}
+        for order, variant in enumerate(variants):
+            future = executor.submit(self._run_variant, gray, VARIANT_PREPROCESS[variant],
+                                     debug_images, variant, whitelist)
+            futures[future] = (order, variant)
+
+        results = []
+        try:
+            for future in as_completed(futures):
+                order, variant = futures[future]
+                try:
+                    text, confidence = future.result()
+                except Exception as e:
+                    print(f"Tesseract hiba ({variant}): {e}")
+                    continue
+
+                if validator is not None and text and validator(text):
+                    return OCRResult(text, confidence, engine='tesseract', variant=variant)
+
+                results.append((order, variant, text, confidence))
+        finally:
+            # Early exit: a még el nem indult variánsok törlése
+            for future in futures:
+                future.cancel()
+
+        # Nincs validált: leghosszabb szöveg (holtversenynél a variáns sorrend dönt)
+        valid_results = [r for r in sorted(results, key=lambda r: r[0]) if r[2]]
+        if not valid_results:
+            return OCRResult(engine='tesseract')
+
+        _, variant, text, confidence = max(valid_results, key=lambda r: len(r[2]))
+        return OCRResult(text, confidence, engine='tesseract', variant=variant)
+
+    def _run_variant(self, gray, preprocess, debug_images, variant, whitelist):
+        """Egy variáns: preprocessing + Tesseract → (text, confidence)"""
+        thresh = preprocess(gray)
+
+        if debug_images is not None:
+            debug_images[variant] = thresh
+
+        return self.recognize(thresh, whitelist)
+
+    def recognize(self, image, whitelist=None):
+        """
+        Egysoros Tesseract felismerés (PSM 7)
+
+        Args:
+            image: Grayscale / bináris numpy kép (uint8)
+            whitelist: Engedélyezett karakterek (None = mind)
+
+        Returns:
+            tuple: (text, confidence) - confidence 0-1 (szavankénti átlag), None ha nincs szó
+        """
+        if TESSEROCR_AVAILABLE and not self.tesserocr_failed:
+            api = self._get_api(whitelist)
+            if api is not None:
+                image = np.ascontiguousarray(image, dtype=np.uint8)
+                height, width = image.shape[:2]
+                api.SetImageBytes(image.tobytes(), width, height, 1, width)
+                text = api.GetUTF8Text().strip()
+                return text, (api.MeanTextConf() / 100.0 if text else None)
+
+        config = '--psm 7'
+        if whitelist:
+            config += f' -c tessedit_char_whitelist={whitelist}'
+
+        # image_to_data: szavak + szavankénti confidence (egy tesseract hívás, mint image_to_string)
+        data = pytesseract.image_to_data(image, config=config, output_type=pytesseract.Output.DICT)
+        words = [(word.strip(), float(conf)) for word, conf in zip(data['text'], data['conf'])
+                 if word.strip() and float(conf) >= 0]
+
+        if not words:
+            return "", None
+
+        text = " ".join(word for word, _ in words)
+        return text, sum(conf for _, conf in words) / len(words) / 100.0
+
+    def _get_api(self, whitelist):
+        """
+        Az aktuális szál perzisztens tesserocr API-ja (egyszer konfigurálva)
+
+        Returns:
+            tesserocr.PyTessBaseAPI vagy None ha nem inicializálható
+        """
+        apis = getattr(self.thread_local, 'apis', None)
+        if apis is None:
+            apis = self.thread_local.apis = {}
+
+        api = apis.get(whitelist)
+        if api is not None:
+            return api
+
+        try:
+            kwargs = {'psm': tesserocr.PSM.SINGLE_LINE}
+            if self.tessdata_path:
+                kwargs['path'] = self.tessdata_path
+            api = tesserocr.PyTessBaseAPI(**kwargs)
+            if whitelist:
+                api.SetVariable('tessedit_char_whitelist', whitelist)
+        except Exception as e:
+            # Pl. hiányzó tessdata → pytesseract fallback végleg
+            print(f"⚠️  tesserocr init hiba: {e}, pytesseract fallback")
+            self.tesserocr_failed = True
+            return None
+
+        apis[whitelist] = api
+        with self.lock:
+            self.apis.append(api)
+        return api
+
+    def shutdown(self):
+        """Worker pool + tesserocr API-k leállítása"""
+        with self.lock:
+            executors = [self.batch_executor, self.executor]
+            self.batch_executor = self.executor = None
+
+        # Lock-on kívül: a worker-ek _get_api()-ban lockolhatnak
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+        with self.lock:
+            apis, self.apis = self.apis, []
+
+        for api in apis:
+            try:
+                api.End()
+            except:
+                pass
+
+
+# Globális singleton instance
+ocr_engine = OCREngine()
@@ -0,0 +1,112 @@
+"""
+Auto Farm - OCR Grammar
+A hívó által várt szöveg formátum (idő, erőforrás, százalék, kulcsszó)
+
+Az OCR engine lánc a grammar validátorával az első illeszkedő kimenetnél megáll
+(olcsó engine / preprocessing először), így nem kell minden variánst lefuttatni.
+"""
+import re
+
+from utils.time_utils import parse_time
+from utils.ocr_parser import parse_resource_value
+from utils.ocr_engine import DIGIT_WHITELIST
+
+
+# Idő token: HH:MM:SS / MM:SS (OCR gyakran pontot lát kettőspont helyett)
+TIME_PATTERN = re.compile(r'\d{1,3}[:.]\d{2}(?:[:.]\d{2})?')
+
+# Erőforrás szám: 1.2M, 100.0K, 99,000, 500
+RESOURCE_PATTERN = re.compile(r'^\d[\d.,]*\s*[KM]?$', re.IGNORECASE)
+
+# Százalék: 95%, 12.5%
+PERCENT_PATTERN = re.compile(r'\d{1,3}(?:[.,]\d+)?\s*%')
+
+
+class Grammar:
+    """Várt OCR formátum: validátor + engine tippek"""
+
+    def __init__(self, name, validator, whitelist=None, glyphs=True, parser=None):
+        """
+        Args:
+            name: Grammar neve (log / cache kulcs)
+            validator: callable(text) → bool
+            whitelist: Engedélyezett karakterek az engine-eknek (None = mind)
+            glyphs: Kiolvasható-e a glyph OCR karakterkészletével (számjegy, :, ., K, M, %)
+            parser: callable(text) → érték (pl. parse_time), None = a szöveg maga
+        """
+        self.name = name
+        self.validator = validator
+        self.whitelist = whitelist
+        self.glyphs = glyphs
+        self.parser = parser
+
+    def validate(self, text):
+        """Illeszkedik-e a szöveg a grammar-ra"""
+        if not text:
+            return False
+        try:
+            return bool(self.validator(text))
+        except Exception:
+            return False
+
+    __call__ = validate
+
+    def parse(self, text):
+        """Szöveg → érték (konszenzus szavazás kulcsa)"""
+        if self.parser is None:
+            return text.strip()
+        return self.parser(text)
+
+    def __repr__(self):
+        return f"Grammar({self.name})"
+
+
+def keywords(*words):
+    """
+    Kulcsszó grammar (pl. "NETWORK DISCONNECTED")
+
+    Kis/nagybetű és szóköz független részszöveg egyezés, bármelyik szó elég.
+    """
+    normalized = [w.lower().replace(' ', '') for w in words if w]
+
+    def validator(text):
+        text = text.lower().replace(' ', '')
+        return any(word in text for word in normalized)
+
+    return Grammar(f"keywords({', '.join(words)})", validator, glyphs=False)
+
+
+def any_of(*grammars):
+    """Több grammar közül bármelyik illeszkedése elég"""
+    whitelists = {g.whitelist for g in grammars}
+    whitelist = whitelists.pop() if len(whitelists) == 1 else None
+
+    return Grammar(
+        f"any_of({', '.join(g.name for g in grammars)})",
+        lambda text: any(g.validate(text) for g in grammars),
+        whitelist=whitelist,
+        glyphs=any(g.glyphs for g in grammars)
+    )
+
+
+def is_time(text):
+    """Idő token van benne ÉS parse_time > 0"""
+    return bool(TIME_PATTERN.search(text)) and bool(parse_time(text))
+
+
+# Idő (HH:MM:SS / MM:SS, > 0 sec)
+TIME = Grammar('time', is_time, parser=parse_time)
+
+# Csak számjegyes timer régió (whitelist-tel)
+DIGIT_TIME = Grammar('digit_time', is_time, whitelist=DIGIT_WHITELIST, parser=parse_time)
+
+# Erőforrás mennyiség (> 0)
+RESOURCE = Grammar('resource',
+                   lambda text: bool(RESOURCE_PATTERN.match(text.strip())) and parse_resource_value(text) > 0,
+                   parser=parse_resource_value)
+
+# Százalék (explorer)
+PERCENT = Grammar('percent', lambda text: bool(PERCENT_PATTERN.search(text)))
+
+# Timer státusz: idő / Completed / Idle (training queue)
+TIMER_STATUS = any_of(TIME, keywords('completed', 'idl', 'ldle'))
@@ -0,0 +1,76 @@
+"""
+Auto Farm - OCR Result
+Strukturált OCR eredmény: szöveg + confidence, engine, variáns, időzítés, frame
+
+A confidence engine-enként:
+- glyph: leggyengébb karakter korrelációja
+- easyocr: a szövegdobozok átlagos confidence-e
+- tesseract: szavankénti confidence átlaga (MeanTextConf / image_to_data)
+"""
+
+
+# Ennyi confidence felett az olvasás megbízható (retry loop korai kilépés)
+HIGH_CONFIDENCE = 0.85
+
+
+class OCRResult:
+    """Egy OCR olvasás eredménye"""
+
+    def __init__(self, text="", confidence=None, engine=None, variant=None,
+                 capture_ms=0.0, inference_ms=0.0, frame_id=None, cached=False):
+        """
+        Args:
+            text: Felismert szöveg
+            confidence: 0-1 (None = ismeretlen)
+            engine: 'glyph' / 'easyocr' / 'tesseract' (None = nincs eredmény)
+            variant: Tesseract preprocessing variáns (otsu / adaptive / clahe)
+            capture_ms: Capture idő (ms)
+            inference_ms: OCR idő (ms)
+            frame_id: Frame cache frame azonosító (None = külön régió capture)
+            cached: OCR cache találat
+        """
+        self.text = text or ""
+        self.confidence = confidence
+        self.engine = engine
+        self.variant = variant
+        self.capture_ms = capture_ms
+        self.inference_ms = inference_ms
+        self.frame_id = frame_id
+        self.cached = cached
+
+    def __bool__(self):
+        return bool(self.text)
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        confidence = f"{self.confidence:.2f}" if self.confidence is not None else "?"
+        return f"OCRResult('{self.text}', {self.engine}/{self.variant}, conf={confidence})"
+
+    def is_confident(self, threshold=HIGH_CONFIDENCE):
+        """Megbízható-e az olvasás (ismeretlen confidence = nem)"""
+        return self.confidence is not None and self.confidence >= threshold
+
+    def copy(self, **changes):
+        """Másolat módosított mezőkkel (pl. cache találat időzítése)"""
+        result = OCRResult(**self.to_dict())
+        for name, value in changes.items():
+            setattr(result, name, value)
+        return result
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: Összes mező (log / dashboard)
+        """
+        return {
+            'text': self.text,
+            'confidence': self.confidence,
+            'engine': self.engine,
+            'variant': self.variant,
+            'capture_ms': self.capture_ms,
+            'inference_ms': self.inference_ms,
+            'frame_id': self.frame_id,
+            'cached': self.cached
+        }
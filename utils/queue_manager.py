@@ -1,15 +1,36 @@
 """
 Auto Farm - Queue Manager
-FIFO task queue thread-safe implementáció JSON persistence-szel
+Prioritásos task queue thread-safe implementáció JSON persistence-szel
+
+Felépítés:
+- Típusonkénti prioritás sávok (settings.json → queue.priorities), sávon belül
+  FIFO; add_priority_task / requeue_task → URGENT sáv eleje
+- task_id → task index: O(1) keresés / törlés (lazy törlés a sávokból)
+- Duplikált task_id nem kerül újra a queue-ba (coalescing)
+
+Persistence: append-only journal (task_queue.journal, 1 tömör JSON sor /
+módosítás) + periodikus compaction a task_queue.json snapshot-ba. A lemez
+I/O háttérszálon fut, a queue műveletek (deque) nem várnak a fájlírásra.
 """
+import os
 import json
 import threading
+from collections import deque
 from pathlib import Path
-from datetime import datetime
+
+from utils.clock import clock
+
+
+# Prioritás: kisebb szám = előbb fut
+URGENT_PRIORITY = 0
+DEFAULT_PRIORITY = 1
 
 
 class QueueManager:
-    """Thread-safe FIFO task queue JSON mentéssel"""
+    """Thread-safe prioritásos task queue JSON mentéssel"""
+
+    # Ennyi journal rekord után snapshot + journal ürítés
+    COMPACT_EVERY = 200
     
     def __init__(self, config_dir=None):
         if config_dir is None:
@@ -17,77 +38,106 @@ class QueueManager:
         
         self.config_dir = Path(config_dir)
         self.queue_file = self.config_dir / 'task_queue.json'
+        self.journal_file = self.config_dir / 'task_queue.journal'
+
+        # Típusonkénti prioritás (settings.json → queue.priorities)
+        self.type_priorities = self._load_priorities()
         
-        # Thread lock
+        # Thread lock + condition (új task → scheduler ébresztés)
         self.lock = threading.Lock()
+        self.condition = threading.Condition(self.lock)
         
-        # Queue (list)
-        self.queue = []
+        # Prioritás sávok: {priority: deque(task)} + index {task_id: task}
+        # Sávban maradt törölt task: index-ben már nem ő szerepel (lazy törlés)
+        self.lanes = {}
+        self.index = {}
+
+        # Journal: utolsó rekord sorszám, kiírásra váró rekordok
+        self.seq = 0
+        self.journal_size = 0
+        self.pending_records = []
+
+        # Háttér író szál (lazy indítás)
+        self.io_lock = threading.Lock()
+        self.write_event = threading.Event()
+        self.writer_thread = None
         
         # Automatikus betöltés
         self.load_from_file()
     
     def add_task(self, task_id, task_type, data=None, status="pending"):
         """
-        Task hozzáadása queue végére
+        Task hozzáadása a típusa szerinti prioritás sáv végére
+
+        Ha ugyanilyen task_id már vár a queue-ban, nem kerül be újra (coalescing).
 
         Args:
             task_id: Egyedi azonosító (pl. "commander_1_restart")
             task_type: Task típus ("gathering", "training", "alliance", "anti_afk", "explorer")
             data: Opcionális extra adat (dict)
             status: Task állapot ("pending", "sending", "marching", "gathering", "returning")
+
+        Returns:
+            bool: True ha bekerült, False ha már a queue-ban volt
         """
         with self.lock:
-            task = {
-                "task_id": task_id,
-                "type": task_type,
-                "status": status,
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "data": data or {}
-            }
-
-            self.queue.append(task)
-            self._log_action(f"Task hozzáadva: {task_id} ({task_type}, status={status})")
-            self.save_to_file()
+            if task_id in self.index:
+                self._log_action(f"Task már a queue-ban, összevonva: {task_id} ({task_type})")
+                return False
+
+            task = self._make_task(task_id, task_type, data, status, self.get_priority(task_type))
+
+            self._commit({"op": "append", "task": task})
+            self._log_action(f"Task hozzáadva: {task_id} ({task_type}, status={status}, prioritás={task['priority']})")
+            self.condition.notify_all()
+            return True
     
     def add_priority_task(self, task_id, task_type, data=None, status="pending"):
         """
-        PRIORITÁSOS task hozzáadása (queue elejére)
+        PRIORITÁSOS task hozzáadása (URGENT sáv elejére)
         Anti-AFK használja
 
+        Ha már vár a queue-ban, előre kerül (nem duplikálódik).
+
         Args:
             task_id: Egyedi azonosító
             task_type: Task típus
             data: Opcionális extra adat
             status: Task állapot
+
+        Returns:
+            bool: True ha új task, False ha a meglévő lett előresorolva
         """
         with self.lock:
-            task = {
-                "task_id": task_id,
-                "type": task_type,
-                "status": status,
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "data": data or {}
-            }
-
-            self.queue.insert(0, task)  # Elejére!
+            existing = self.index.get(task_id)
+            if existing is not None and existing['priority'] == URGENT_PRIORITY:
+                self._log_action(f"PRIORITÁS task már a queue-ban, összevonva: {task_id}")
+                return False
+
+            if existing is not None:
+                self._commit({"op": "remove", "task_id": task_id})
+
+            task = self._make_task(task_id, task_type, data, status, URGENT_PRIORITY)
+
+            self._commit({"op": "prepend", "task": task})  # Elejére!
             self._log_action(f"PRIORITÁS task hozzáadva: {task_id} ({task_type}, status={status})")
-            self.save_to_file()
+            self.condition.notify_all()
+            return existing is None
     
     def get_next_task(self):
         """
-        Következő task lekérése ÉS törlése (FIFO)
+        Következő task lekérése ÉS törlése (legmagasabb prioritás, sávon belül FIFO)
         
         Returns:
             dict: Task vagy None ha üres
         """
         with self.lock:
-            if not self.queue:
+            task = self._front()
+            if task is None:
                 return None
             
-            task = self.queue.pop(0)
+            self._commit({"op": "pop"})
             self._log_action(f"Task kivéve: {task['task_id']} ({task['type']})")
-            self.save_to_file()
             return task
     
     def peek_next_task(self):
@@ -98,14 +148,15 @@ class QueueManager:
             dict: Task vagy None ha üres
         """
         with self.lock:
-            if not self.queue:
+            task = self._front()
+            if task is None:
                 return None
             
-            return self.queue[0].copy()  # Másolat (ne módosítsa kívülről)
+            return task.copy()  # Másolat (ne módosítsa kívülről)
     
     def remove_task(self, task_id):
         """
-        Adott task törlése ID alapján
+        Adott task törlése ID alapján (O(1) index)
         
         Args:
             task_id: Task azonosító
@@ -114,32 +165,42 @@ class QueueManager:
             bool: Sikeres törlés
         """
         with self.lock:
-            for i, task in enumerate(self.queue):
-                if task['task_id'] == task_id:
-                    del self.queue[i]
-                    self._log_action(f"Task törölve: {task_id}")
-                    self.save_to_file()
-                    return True
-            
-            return False
+            if task_id not in self.index:
+                return False
+
+            self._commit({"op": "remove", "task_id": task_id})
+            self._log_action(f"Task törölve: {task_id}")
+            return True
+
+    def has_task(self, task_id):
+        """
+        Vár-e már ilyen task a queue-ban?
+
+        Args:
+            task_id: Task azonosító
+
+        Returns:
+            bool: True ha a queue-ban van
+        """
+        with self.lock:
+            return task_id in self.index
     
     def get_all_tasks(self):
         """
-        Teljes queue lista lekérése
+        Teljes queue lista lekérése (futási sorrendben)
         
         Returns:
             list: Összes task (másolat)
         """
         with self.lock:
-            return [task.copy() for task in self.queue]
+            return [task.copy() for task in self._iter_tasks()]
     
     def clear_queue(self):
         """Teljes queue törlése"""
         with self.lock:
-            count = len(self.queue)
-            self.queue = []
+            count = len(self.index)
+            self._commit({"op": "clear"})
             self._log_action(f"Queue törölve ({count} task)")
-            self.save_to_file()
 
     def cleanup_on_startup(self):
         """
@@ -149,18 +210,29 @@ class QueueManager:
         - Összes taskot (clean slate)
         """
         with self.lock:
-            count = len(self.queue)
+            count = len(self.index)
             if count > 0:
-                self.queue = []
+                self._commit({"op": "clear"})
                 self._log_action(f"[STARTUP CLEANUP] Queue törölve ({count} régi task eltávolítva)")
-                self.save_to_file()
             else:
                 self._log_action("[STARTUP CLEANUP] Queue üres, nincs teendő")
     
     def get_queue_size(self):
         """Queue méret"""
         with self.lock:
-            return len(self.queue)
+            return len(self.index)
+
+    def get_priority(self, task_type):
+        """
+        Task típus prioritása
+
+        Args:
+            task_type: Task típus
+
+        Returns:
+            int: Prioritás (kisebb = előbb)
+        """
+        return self.type_priorities.get(task_type, DEFAULT_PRIORITY)
 
     def update_task_status(self, task_id, status):
         """
@@ -174,15 +246,14 @@ class QueueManager:
             bool: Sikeres frissítés
         """
         with self.lock:
-            for task in self.queue:
-                if task['task_id'] == task_id:
-                    old_status = task.get('status', 'unknown')
-                    task['status'] = status
-                    self._log_action(f"Task status frissítve: {task_id} ({old_status} → {status})")
-                    self.save_to_file()
-                    return True
+            task = self.index.get(task_id)
+            if task is None:
+                return False
 
-            return False
+            old_status = task.get('status', 'unknown')
+            self._commit({"op": "status", "task_id": task_id, "status": status})
+            self._log_action(f"Task status frissítve: {task_id} ({old_status} → {status})")
+            return True
 
     def get_current_task(self):
         """
@@ -204,42 +275,283 @@ class QueueManager:
         with self.lock:
             # Reset status
             task['status'] = 'pending'
-            task['timestamp'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            task['timestamp'] = clock.now().strftime("%Y-%m-%d %H:%M:%S")
+            task['priority'] = URGENT_PRIORITY
+
+            # Ha közben újra bekerült, a régi példány helyett ez fut
+            if task['task_id'] in self.index:
+                self._commit({"op": "remove", "task_id": task['task_id']})
 
             # Queue elejére
-            self.queue.insert(0, task)
+            self._commit({"op": "prepend", "task": task})
             self._log_action(f"Task újra queue-ba: {task['task_id']} ({task['type']})")
-            self.save_to_file()
+            self.condition.notify_all()
+
+    def wait_for_task(self, timeout=None):
+        """
+        Blokkoló várakozás amíg a queue nem üres (vagy timeout / wake())
+
+        Args:
+            timeout: Max várakozás (másodperc, None = végtelen)
+
+        Returns:
+            bool: True ha van task a queue-ban
+        """
+        with self.condition:
+            if not self.index:
+                clock.wait(self.condition, timeout)
+            return len(self.index) > 0
+
+    def wake(self):
+        """Várakozó scheduler ébresztése (pl. leállításkor)"""
+        with self.condition:
+            self.condition.notify_all()
+
+    def set_state_dir(self, state_dir):
+        """
+        Queue fájlok áthelyezése (replay: scratch könyvtár, a valódi config/ érintetlen)
+
+        A settings.json prioritások továbbra is a config könyvtárból jönnek.
+
+        Args:
+            state_dir: Új könyvtár a task_queue.json / task_queue.journal fájloknak
+        """
+        state_dir = Path(state_dir)
+        state_dir.mkdir(parents=True, exist_ok=True)
+
+        with self.io_lock:
+            with self.lock:
+                self.pending_records = []
+                self.journal_size = 0
+            self.queue_file = state_dir / 'task_queue.json'
+            self.journal_file = state_dir / 'task_queue.journal'
+
+        self.load_from_file()
 
     def save_to_file(self):
-        """Queue mentése JSON fájlba"""
-        try:
-            # Könyvtár létrehozása ha kell
-            self.config_dir.mkdir(parents=True, exist_ok=True)
-            
-            with open(self.queue_file, 'w', encoding='utf-8') as f:
-                json.dump(self.queue, f, indent=2, ensure_ascii=False)
-        
-        except Exception as e:
-            print(f"Queue mentési hiba: {e}")
+        """Queue mentése: függő journal rekordok + compaction (szinkron, pl. leállításkor)"""
+        self._flush(compact=True)
     
     def load_from_file(self):
-        """Queue betöltése JSON fájlból"""
+        """Queue betöltése: snapshot + journal visszajátszás"""
         try:
+            snapshot_seq = 0
+            tasks = []
+
             if self.queue_file.exists():
                 with open(self.queue_file, 'r', encoding='utf-8') as f:
                     content = f.read().strip()
-                    if content:
-                        self.queue = json.loads(content)
-                        self._log_action(f"Queue betöltve: {len(self.queue)} task")
+                if content:
+                    snapshot = json.loads(content)
+                    if isinstance(snapshot, list):
+                        tasks = snapshot  # Régi formátum (journal előtti)
                     else:
-                        self.queue = []
-            else:
-                self.queue = []
+                        snapshot_seq = snapshot.get('seq', 0)
+                        tasks = snapshot.get('tasks', [])
+
+            with self.lock:
+                self.lanes = {}
+                self.index = {}
+                for task in tasks:
+                    task.setdefault('priority', self.get_priority(task.get('type')))
+                    self._apply({"op": "append", "task": task})
+                self.seq = snapshot_seq
+
+                replayed = 0
+                for record in self._read_journal():
+                    # Snapshot-ban már benne lévő rekord (compaction közbeni leállás)
+                    if record.get('seq', 0) <= snapshot_seq:
+                        continue
+                    self._apply(record)
+                    self.seq = record['seq']
+                    replayed += 1
+
+            if replayed:
+                self._flush(compact=True)
+
+            if self.index:
+                self._log_action(f"Queue betöltve: {len(self.index)} task (journal: {replayed} rekord)")
         
         except Exception as e:
             print(f"Queue betöltési hiba: {e}")
-            self.queue = []
+            self.lanes = {}
+            self.index = {}
+
+    def _commit(self, record):
+        """
+        Módosítás alkalmazása + journal rekord sorba állítása (lock alatt hívandó!)
+
+        Args:
+            record: {'op': ..., ...} journal rekord
+        """
+        self._apply(record)
+
+        self.seq += 1
+        record['seq'] = self.seq
+        self.pending_records.append(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+        self.journal_size += 1
+
+        if self.writer_thread is None:
+            self.writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+            self.writer_thread.start()
+
+        self.write_event.set()
+
+    def _apply(self, record):
+        """
+        Journal rekord végrehajtása a sávokon (élő módosítás és visszajátszás is)
+
+        Args:
+            record: {'op': 'append' | 'prepend' | 'pop' | 'remove' | 'status' | 'clear', ...}
+        """
+        op = record['op']
+
+        if op in ('append', 'prepend'):
+            task = record['task']
+            priority = task.get('priority', DEFAULT_PRIORITY)
+            lane = self.lanes.get(priority)
+            if lane is None:
+                lane = self.lanes[priority] = deque()
+
+            if op == 'append':
+                lane.append(task)
+            else:
+                lane.appendleft(task)
+            self.index[task['task_id']] = task
+        elif op == 'pop':
+            task = self._front()
+            if task is not None:
+                self.lanes[task['priority']].popleft()
+                del self.index[task['task_id']]
+        elif op == 'remove':
+            # Lazy: a sávból akkor esik ki, amikor az elejére ér
+            self.index.pop(record['task_id'], None)
+        elif op == 'status':
+            task = self.index.get(record['task_id'])
+            if task is not None:
+                task['status'] = record['status']
+        elif op == 'clear':
+            self.lanes = {}
+            self.index = {}
+
+    def _front(self):
+        """
+        Következő élő task (lock alatt hívandó!)
+
+        A sávok elején álló törölt / felülírt taskokat közben eldobja.
+
+        Returns:
+            dict: Task vagy None ha üres
+        """
+        for priority in sorted(self.lanes):
+            lane = self.lanes[priority]
+            while lane:
+                task = lane[0]
+                if self.index.get(task['task_id']) is task:
+                    return task
+                lane.popleft()
+        return None
+
+    def _iter_tasks(self):
+        """Élő taskok futási sorrendben (lock alatt hívandó!)"""
+        for priority in sorted(self.lanes):
+            for task in self.lanes[priority]:
+                if self.index.get(task['task_id']) is task:
+                    yield task
+
+    def _make_task(self, task_id, task_type, data, status, priority):
+        """Task dict összeállítása"""
+        return {
+            "task_id": task_id,
+            "type": task_type,
+            "status": status,
+            "priority": priority,
+            "timestamp": clock.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "data": data or {}
+        }
+
+    def _load_priorities(self):
+        """settings.json 'queue.priorities' (ha nincs, minden típus DEFAULT_PRIORITY)"""
+        settings_file = self.config_dir / 'settings.json'
+        try:
+            with open(settings_file, 'r', encoding='utf-8') as f:
+                priorities = json.load(f).get('queue', {}).get('priorities', {})
+            return {task_type: int(priority) for task_type, priority in priorities.items()}
+        except Exception:
+            return {}
+
+    def _writer_loop(self):
+        """Háttérszál: függő rekordok kiírása (batch-elve)"""
+        while True:
+            self.write_event.wait()
+            self.write_event.clear()
+            self._flush()
+
+    def _flush(self, compact=False):
+        """
+        Függő rekordok hozzáfűzése a journal-hoz, vagy compaction
+
+        Args:
+            compact: True = snapshot írás + journal ürítés (COMPACT_EVERY után automatikus)
+        """
+        with self.io_lock:
+            with self.lock:
+                records = self.pending_records
+                self.pending_records = []
+
+                compact = compact or self.journal_size >= self.COMPACT_EVERY
+                if compact:
+                    # A snapshot már tartalmazza a függő rekordokat
+                    snapshot = {'seq': self.seq, 'tasks': [task.copy() for task in self._iter_tasks()]}
+                    self.journal_size = 0
+
+            try:
+                self.config_dir.mkdir(parents=True, exist_ok=True)
+
+                if compact:
+                    self._write_snapshot(snapshot)
+                    # Snapshot után → journal ürítés (ha előtte áll le, a seq szűrés kezeli)
+                    open(self.journal_file, 'w', encoding='utf-8').close()
+                elif records:
+                    with open(self.journal_file, 'a', encoding='utf-8') as f:
+                        f.write('\n'.join(records) + '\n')
+
+            except Exception as e:
+                print(f"Queue mentési hiba: {e}")
+
+    def _write_snapshot(self, snapshot):
+        """Atomikus snapshot írás (tmp fájl + csere)"""
+        tmp_file = self.queue_file.with_suffix('.json.tmp')
+
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, indent=2, ensure_ascii=False)
+
+        os.replace(tmp_file, self.queue_file)
+
+    def _read_journal(self):
+        """
+        Journal rekordok beolvasása
+
+        Csonka utolsó sor (írás közbeni leállás) → figyelmen kívül hagyva
+
+        Returns:
+            list: Rekord dict-ek
+        """
+        if not self.journal_file.exists():
+            return []
+
+        records = []
+        with open(self.journal_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+
+        return records
     
     def _log_action(self, message):
         """Logging queue műveletekhez"""
@@ -0,0 +1,126 @@
+"""
+Auto Farm - Replay Harness
+Offline futtatás felvett képernyő frame-eken (élő BlueStacks ablak nélkül)
+
+Session könyvtár:
+- *.png frame-ek (névsorrendben játszódnak le)
+- session.json (opcionális): {"window_rect": [x, y, w, h], "screen_size": [w, h]}
+
+A replay mód négy cserét végez:
+- capture: ReplayCaptureBackend (frame-ek a session könyvtárból)
+- input:   RecordingInputBackend (kattintás / billentyű csak feljegyezve)
+- óra:     VirtualClock (gyorsított idő)
+- állapot: queue / timer / template hint fájlok scratch könyvtárban
+           (a valódi config/ nem íródik, a startup cleanup nem törli az élő timer-eket)
+"""
+import json
+from datetime import datetime
+from pathlib import Path
+
+from utils.capture import screen_capture, ReplayCaptureBackend
+from utils.input_backend import input_controller, RecordingInputBackend
+from utils.clock import clock, VirtualClock
+from utils.queue_manager import queue_manager
+from utils.timer_manager import timer_manager
+from utils.template_hints import template_hints
+
+
+# Alapértelmezett virtuális képernyő (ha nincs session.json)
+DEFAULT_SCREEN_SIZE = (1920, 1080)
+
+# Replay indulás (virtuális monoton idő)
+replay_started_at = None
+
+
+def load_session_info(session_dir):
+    """
+    session.json beolvasása
+
+    Args:
+        session_dir: Session könyvtár
+
+    Returns:
+        dict: {'window_rect': (x, y, w, h), 'screen_size': (w, h)}
+    """
+    session_file = Path(session_dir) / 'session.json'
+
+    info = {}
+    if session_file.exists():
+        with open(session_file, 'r', encoding='utf-8') as f:
+            info = json.load(f)
+
+    screen_size = tuple(info.get('screen_size', DEFAULT_SCREEN_SIZE))
+    window_rect = tuple(info.get('window_rect', (0, 0, screen_size[0], screen_size[1])))
+
+    return {'window_rect': window_rect, 'screen_size': screen_size}
+
+
+def setup_replay(session_dir, speed=1000.0, loop=False, input_log=None, state_dir=None):
+    """
+    Replay mód bekapcsolása (a managerek indítása ELŐTT hívandó)
+
+    Args:
+        session_dir: Felvett session könyvtár (PNG frame-ek) vagy videó fájl
+        speed: Virtuális idő gyorsítás (1000 = 1000x)
+        loop: Frame-ek ismétlése a végén
+        input_log: JSONL fájl az input eseményeknek (None = logs/replay_input_<ts>.jsonl)
+        state_dir: Scratch könyvtár a queue / timer / hint fájloknak (None = logs/replay_state_<ts>)
+
+    Returns:
+        dict: {'window_rect', 'screen_size', 'input_log', 'state_dir', 'speed'}
+    """
+    from library import WindowManager, frame_cache
+    global replay_started_at
+
+    session_dir = Path(session_dir)
+    info = load_session_info(session_dir if session_dir.is_dir() else session_dir.parent)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if input_log is None:
+        input_log = Path(__file__).parent.parent / 'logs' / f'replay_input_{timestamp}.jsonl'
+    if state_dir is None:
+        state_dir = Path(__file__).parent.parent / 'logs' / f'replay_state_{timestamp}'
+
+    # Írható állapot → scratch könyvtár (a valódi config/ érintetlen marad)
+    queue_manager.set_state_dir(state_dir)
+    timer_manager.set_state_dir(state_dir)
+    template_hints.set_state_dir(state_dir)
+
+    window_x, window_y = info['window_rect'][0], info['window_rect'][1]
+
+    # A frame-ek ablak képek → (0, 0) pixel = ablak bal felső sarka
+    screen_capture.set_backend(
+        ReplayCaptureBackend(session_dir, origin=(window_x, window_y), loop=loop)
+    )
+    input_controller.set_backend(
+        RecordingInputBackend(screen_size=info['screen_size'], output_file=input_log)
+    )
+    clock.set_clock(VirtualClock(speed=speed))
+    replay_started_at = clock.monotonic()
+
+    WindowManager.set_virtual_window(info['window_rect'])
+    frame_cache.invalidate()
+
+    return {
+        'window_rect': info['window_rect'],
+        'screen_size': info['screen_size'],
+        'input_log': str(input_log),
+        'state_dir': str(state_dir),
+        'speed': speed
+    }
+
+
+def get_replay_summary():
+    """
+    Replay futás összesítő (input események + virtuális idő)
+
+    Returns:
+        dict: {'clicks', 'keys', 'virtual_seconds'} vagy None ha nem replay mód
+    """
+    backend = input_controller.backend  # get_backend() nem (lazy pyautogui init)
+    if not isinstance(backend, RecordingInputBackend):
+        return None
+
+    summary = backend.get_summary()
+    summary['virtual_seconds'] = round(clock.monotonic() - (replay_started_at or 0.0), 1)
+    return summary
@@ -0,0 +1,228 @@
+"""
+Auto Farm - Scale Calibration
+Session szintű skála kalibráció a multi-scale template matchinghez
+
+A setup wizard template mentéskor rögzíti a játék ablak méretét
+(config/template_resolutions.json). Az aktuális ablak méretből template
+családonként (azonos capture felbontás) egyetlen skála számolható, így a
+find_image(multi_scale=True) 5 skála helyett pontosan egyen matchel.
+
+Rögzített felbontás nélküli (régi) template-eknél template-enként az első
+multi-scale találat skálája tanult skála; ha azon a skálán nincs találat, a
+tanult skála törlődik (újra teljes multi-scale keresés). Ablak méret váltáskor
+újrakalibrálás (a tanult skálák is törlődnek).
+"""
+import json
+import threading
+from pathlib import Path
+
+from utils.template_cache import template_cache, template_key, IMAGES_DIR, MULTI_SCALES
+
+
+# Ennyi eltérésen belül a skála 1.0 (nincs átméretezés)
+SCALE_TOLERANCE = 0.01
+
+
+class ScaleCalibration:
+    """Template család → skála (aktuális ablak méretre)"""
+
+    def __init__(self, config_dir=None):
+        if config_dir is None:
+            config_dir = Path(__file__).parent.parent / 'config'
+
+        self.config_dir = Path(config_dir)
+        self.resolutions_file = self.config_dir / 'template_resolutions.json'
+
+        self.lock = threading.Lock()
+
+        # Capture felbontások: {template kulcs: (width, height)}
+        self.resolutions = {}
+
+        # Kalibráció: aktuális ablak méret + {család: skála}
+        # Család = capture felbontás (width, height)
+        self.window_size = None
+        self.family_scales = {}
+
+        # Rögzítetlen template-ek tanult skálája: {template kulcs: skála} (aktuális ablak méretig)
+        self.learned_scales = {}
+
+        # Automatikus betöltés
+        self.load_from_file()
+
+    def record_capture(self, template_path, window_size):
+        """
+        Template capture felbontás rögzítése (setup wizard, mentéskor)
+
+        Args:
+            template_path: Mentett template útvonala
+            window_size: (width, height) játék ablak méret a capture-kor
+        """
+        if not window_size:
+            return
+
+        with self.lock:
+            self.resolutions[template_key(template_path)] = tuple(int(v) for v in window_size)
+
+        self.save_to_file()
+
+    def calibrate(self, window_size, force=False):
+        """
+        Kalibráció az aktuális ablak méretre (csak ha változott, vagy force)
+
+        Családonként skála = aktuális / capture méret; a kalibrált template-ek
+        előre átméretezve a template cache-be kerülnek.
+
+        Args:
+            window_size: (width, height) aktuális játék ablak méret
+            force: Újrakalibrálás akkor is, ha a méret nem változott
+
+        Returns:
+            bool: True ha (újra)kalibrált
+        """
+        window_size = tuple(int(v) for v in window_size)
+
+        with self.lock:
+            if window_size == self.window_size and not force:
+                return False
+
+            family_scales = {size: self._ratio(size, window_size)
+                             for size in set(self.resolutions.values())}
+            resolutions = dict(self.resolutions)
+
+            self.window_size = window_size
+            self.family_scales = family_scales
+            self.learned_scales = {}
+
+        # Kalibrált template-ek előre átméretezve (nem a match hot path-ban)
+        for key, size in resolutions.items():
+            scale = family_scales[size]
+            if scale != 1.0:
+                template_cache.get_scaled(IMAGES_DIR / key, scale)
+
+        self._log_action(f"Kalibráció: ablak {window_size[0]}x{window_size[1]}, "
+                         f"{len(family_scales)} template család")
+        return True
+
+    def get_scale(self, template_path):
+        """
+        Template kalibrált skálája
+
+        Returns:
+            float: Skála (rögzített felbontásból vagy tanult), vagy None ha nincs
+                   kalibrálva (→ teljes multi-scale keresés)
+        """
+        with self.lock:
+            if self.window_size is None:
+                return None
+            key = template_key(template_path)
+            if key in self.resolutions:
+                return self.family_scales.get(self.resolutions[key])
+            return self.learned_scales.get(key)
+
+    def learn(self, template_path, scale):
+        """
+        Rögzített felbontás nélküli template multi-scale találatának skálája
+        → a template tanult skálája (az aktuális ablak méretig, vagy egy miss-ig)
+
+        Args:
+            template_path: Template útvonal
+            scale: A nyerő skála
+        """
+        key = template_key(template_path)
+        with self.lock:
+            if self.window_size is None or key in self.resolutions:
+                return
+            learned = self.learned_scales.get(key) != scale
+            self.learned_scales[key] = scale
+
+        if learned:
+            self._log_action(f"{Path(template_path).name} tanult skála: {scale:g}")
+
+    def unlearn(self, template_path):
+        """
+        Tanult skála törlése (miss a tanult skálán, pl. téves első találat)
+        → a következő keresés újra teljes multi-scale
+
+        Rögzített felbontású template-nél no-op.
+
+        Args:
+            template_path: Template útvonal
+        """
+        with self.lock:
+            scale = self.learned_scales.pop(template_key(template_path), None)
+
+        if scale is not None:
+            self._log_action(f"{Path(template_path).name} tanult skála ({scale:g}) törölve: nincs találat")
+
+    def get_stats(self):
+        """
+        Kalibráció állapot
+
+        Returns:
+            dict: {'window_size', 'templates', 'families': {család: skála}, 'learned': tanult skálák száma}
+        """
+        with self.lock:
+            return {
+                'window_size': self.window_size,
+                'templates': len(self.resolutions),
+                'families': {'x'.join(map(str, family)): scale
+                             for family, scale in self.family_scales.items()},
+                'learned': len(self.learned_scales)
+            }
+
+    def save_to_file(self):
+        """Capture felbontások mentése JSON-ba"""
+        try:
+            self.config_dir.mkdir(parents=True, exist_ok=True)
+
+            with self.lock:
+                data = {key: list(size) for key, size in self.resolutions.items()}
+
+            with open(self.resolutions_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+
+        except Exception as e:
+            print(f"Template felbontás mentési hiba: {e}")
+
+    def load_from_file(self):
+        """Capture felbontások betöltése JSON-ból"""
+        try:
+            if not self.resolutions_file.exists():
+                return
+
+            with open(self.resolutions_file, 'r', encoding='utf-8') as f:
+                content = f.read().strip()
+                data = json.loads(content) if content else {}
+
+            with self.lock:
+                self.resolutions = {key: tuple(int(v) for v in size) for key, size in data.items()}
+
+        except Exception as e:
+            print(f"Template felbontás betöltési hiba: {e}")
+            self.resolutions = {}
+
+    @staticmethod
+    def _ratio(capture_size, window_size):
+        """Skála: szélesség és magasság arány átlaga (1.0 közelében pontosan 1.0)"""
+        ratio = (window_size[0] / capture_size[0] + window_size[1] / capture_size[1]) / 2
+        if abs(ratio - 1.0) <= SCALE_TOLERANCE:
+            return 1.0
+        return round(ratio, 3)
+
+    @staticmethod
+    def nearest_scale(scale):
+        """Legközelebbi MULTI_SCALES elem (tanult skála a cache-elt piramisból)"""
+        return min(MULTI_SCALES, key=lambda candidate: abs(candidate - scale))
+
+    def _log_action(self, message):
+        """Logging kalibrációs műveletekhez"""
+        try:
+            from utils.logger import FarmLogger as log
+            log.info(f"[ScaleCalibration] {message}")
+        except:
+            # Ha logger még nincs inicializálva
+            print(f"[ScaleCalibration] {message}")
+
+
+# Globális singleton instance
+scale_calibration = ScaleCalibration()
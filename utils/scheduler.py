@@ -1,9 +1,13 @@
 """
 Auto Farm - Scheduler
 Queue-ból task-ok futtatása (NEM szál, main loop hívja)
+
+Event-driven: run_pending() a queue condition-jén blokkol, új task esetén
+azonnal ébred, és egymás után lefuttat minden várakozó taskot
 """
-from datetime import datetime
 from utils.logger import FarmLogger as log
+from utils.clock import clock
+from utils.farm_stats import farm_stats
 
 
 class Scheduler:
@@ -32,9 +36,10 @@ class Scheduler:
         if self.is_task_running():
             return False
         
-        # Queue peek
+        # Queue-ból kivétel EGY atomi lépésben (get_next törli is) - peek + külön
+        # get között egy add_priority_task előre kerülhetne, és rossz task törlődne
         from utils.queue_manager import queue_manager
-        next_task = queue_manager.peek_next_task()
+        next_task = queue_manager.get_next_task()
         
         # Ha üres queue
         if not next_task:
@@ -45,14 +50,32 @@ class Scheduler:
         log.action(f"Scheduler: Task futtatása → {next_task['task_id']} ({next_task['type']})")
         log.separator('=', 60)
         
-        # Queue-ból kivétel (get_next törli is)
-        queue_manager.get_next_task()
-        
-        # Task execute
+        # Task execute (ugyanaz a kivett task)
         self.execute_task(next_task)
         
         return True
     
+    def run_pending(self, timeout=None):
+        """
+        Várakozás taskra (max timeout), majd a queue kiürítése
+
+        Args:
+            timeout: Max várakozás ha üres a queue (másodperc, None = végtelen)
+
+        Returns:
+            int: Lefuttatott taskok száma
+        """
+        from utils.queue_manager import queue_manager
+
+        if not queue_manager.wait_for_task(timeout):
+            return 0
+
+        executed = 0
+        while self.tick():
+            executed += 1
+
+        return executed
+    
     def execute_task(self, task):
         """
         Task futtatás típus szerint
@@ -156,14 +179,15 @@ class Scheduler:
             task: Task dict
         """
         self.current_task = task
-        self.task_start_time = datetime.now()
+        self.task_start_time = clock.now()
         log.info(f"Task indítva: {task['task_id']}")
     
     def mark_task_finished(self):
         """Task befejezés jelzés"""
         if self.current_task:
-            duration = (datetime.now() - self.task_start_time).total_seconds()
+            duration = (clock.now() - self.task_start_time).total_seconds()
             log.success(f"Task befejezve: {self.current_task['task_id']} ({duration:.1f} sec)")
+            farm_stats.record_task(self.current_task.get('type'), duration)
         
         self.current_task = None
         self.task_start_time = None
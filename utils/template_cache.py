@@ -0,0 +1,243 @@
+"""
+Auto Farm - Template Cache
+Process-szintű template registry: minden PNG egyszer betöltve, előre konvertálva
+(BGR + grayscale + multi-scale piramis + durva matching szint), mtime alapú invalidálással
+"""
+import threading
+from pathlib import Path
+
+import cv2
+
+
+# Multi-scale matching skálái (ImageManager.find_image multi_scale=True)
+MULTI_SCALES = (0.8, 0.9, 1.0, 1.1, 1.2)
+
+# Coarse-to-fine matching durva szintje (utils.template_matcher)
+PYRAMID_FACTOR = 0.5
+
+IMAGES_DIR = Path(__file__).parent.parent / 'images'
+
+
+def template_key(template_path):
+    """
+    Template kulcs perzisztált adatokhoz (hint-ek, capture felbontás)
+
+    Returns:
+        str: images/-hez relatív útvonal (gépek között hordozható), egyébként abszolút
+    """
+    path = Path(template_path).resolve()
+    try:
+        return path.relative_to(IMAGES_DIR.resolve()).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+class TemplateCache:
+    """Thread-safe template registry (decode egyszer, match sokszor)"""
+
+    def __init__(self, images_dir=None):
+        if images_dir is None:
+            images_dir = IMAGES_DIR
+
+        self.images_dir = Path(images_dir)
+
+        # Thread lock (connection monitor / alliance szál is keres)
+        self.lock = threading.Lock()
+
+        # Cache: {abs_path_str: entry dict}
+        self.entries = {}
+
+        # Statisztika
+        self.hits = 0
+        self.loads = 0
+
+    def preload(self):
+        """
+        Összes PNG betöltése az images/ könyvtárból (induláskor)
+
+        Returns:
+            int: Betöltött template-ek száma
+        """
+        if not self.images_dir.exists():
+            return 0
+
+        count = 0
+        for template_path in sorted(self.images_dir.rglob('*.png')):
+            if self.get(template_path) is not None:
+                count += 1
+
+        self._log_action(f"Template-ek előtöltve: {count} db ({self.images_dir})")
+        return count
+
+    def get(self, template_path):
+        """
+        Template entry lekérése (cache-ből, vagy betöltés ha új / módosult)
+
+        Args:
+            template_path: Template fájl útvonala (str vagy Path)
+
+        Returns:
+            dict: {'path', 'mtime', 'bgr', 'gray', 'scales': {scale: bgr},
+                   'gray_scales': {scale: gray}, 'coarse_scales': {scale: gray × PYRAMID_FACTOR},
+                   'calibrated': {scale: entry}} vagy None ha nem olvasható
+        """
+        key = str(Path(template_path).resolve())
+
+        try:
+            mtime = Path(key).stat().st_mtime
+        except OSError:
+            # Fájl törölve → cache entry is törlése
+            with self.lock:
+                self.entries.pop(key, None)
+            return None
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry['mtime'] == mtime:
+                self.hits += 1
+                return entry
+
+        # Betöltés lock-on kívül (decode lassú)
+        entry = self._load(key, mtime)
+
+        with self.lock:
+            if entry is None:
+                self.entries.pop(key, None)
+            else:
+                self.entries[key] = entry
+                self.loads += 1
+
+        return entry
+
+    def get_scaled(self, template_path, scale):
+        """
+        Egyetlen (kalibrált) skálára átméretezett template entry (skálánként egyszer számolva)
+
+        Args:
+            template_path: Template fájl útvonala
+            scale: Skála (pl. utils.scale_calibration szerint)
+
+        Returns:
+            dict: Entry, amiben a 'scales' / 'gray_scales' / 'coarse_scales' csak ezt
+                  a skálát tartalmazza, vagy None ha a template nem olvasható
+        """
+        entry = self.get(template_path)
+        if entry is None:
+            return None
+
+        with self.lock:
+            scaled = entry['calibrated'].get(scale)
+        if scaled is not None:
+            return scaled
+
+        width = int(round(entry['bgr'].shape[1] * scale))
+        height = int(round(entry['bgr'].shape[0] * scale))
+        if width < 1 or height < 1:
+            return None
+
+        bgr = cv2.resize(entry['bgr'], (width, height))
+        gray = cv2.resize(entry['gray'], (width, height))
+        coarse_scales = {}
+        coarse_width, coarse_height = int(width * PYRAMID_FACTOR), int(height * PYRAMID_FACTOR)
+        if coarse_width >= 1 and coarse_height >= 1:
+            coarse_scales[scale] = cv2.resize(gray, (coarse_width, coarse_height), interpolation=cv2.INTER_AREA)
+
+        scaled = {
+            'path': entry['path'],
+            'mtime': entry['mtime'],
+            'bgr': bgr,
+            'gray': gray,
+            'scales': {scale: bgr},
+            'gray_scales': {scale: gray},
+            'coarse_scales': coarse_scales
+        }
+
+        with self.lock:
+            entry['calibrated'][scale] = scaled
+
+        return scaled
+
+    def invalidate(self, template_path=None):
+        """
+        Cache entry törlése (None = teljes cache)
+
+        Args:
+            template_path: Template útvonal vagy None
+        """
+        with self.lock:
+            if template_path is None:
+                self.entries = {}
+            else:
+                self.entries.pop(str(Path(template_path).resolve()), None)
+
+    def get_stats(self):
+        """
+        Cache statisztika
+
+        Returns:
+            dict: {'templates', 'hits', 'loads'}
+        """
+        with self.lock:
+            return {
+                'templates': len(self.entries),
+                'hits': self.hits,
+                'loads': self.loads
+            }
+
+    def _load(self, key, mtime):
+        """PNG decode + grayscale + multi-scale piramis + durva szint"""
+        bgr = cv2.imread(key)
+        if bgr is None:
+            return None
+
+        gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+
+        scales = {}
+        gray_scales = {}
+        for scale in MULTI_SCALES:
+            if scale == 1.0:
+                scales[scale] = bgr
+                gray_scales[scale] = gray
+                continue
+
+            width = int(bgr.shape[1] * scale)
+            height = int(bgr.shape[0] * scale)
+            if width < 1 or height < 1:
+                continue
+
+            scales[scale] = cv2.resize(bgr, (width, height))
+            gray_scales[scale] = cv2.resize(gray, (width, height))
+
+        # Durva szint: minden skála grayscale változata kicsinyítve
+        coarse_scales = {}
+        for scale, scaled_gray in gray_scales.items():
+            width = int(scaled_gray.shape[1] * PYRAMID_FACTOR)
+            height = int(scaled_gray.shape[0] * PYRAMID_FACTOR)
+            if width < 1 or height < 1:
+                continue
+            coarse_scales[scale] = cv2.resize(scaled_gray, (width, height), interpolation=cv2.INTER_AREA)
+
+        return {
+            'path': key,
+            'mtime': mtime,
+            'bgr': bgr,
+            'gray': gray,
+            'scales': scales,
+            'gray_scales': gray_scales,
+            'coarse_scales': coarse_scales,
+            # Kalibrált skálák: {scale: entry} (get_scaled)
+            'calibrated': {}
+        }
+
+    def _log_action(self, message):
+        """Logging template cache műveletekhez"""
+        try:
+            from utils.logger import FarmLogger as log
+            log.info(f"[TemplateCache] {message}")
+        except:
+            # Ha logger még nincs inicializálva
+            print(f"[TemplateCache] {message}")
+
+
+# Globális singleton instance
+template_cache = TemplateCache()
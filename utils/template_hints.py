@@ -0,0 +1,234 @@
+"""
+Auto Farm - Template Hints
+Template-enként a legutóbbi találati helyek (játék ablakhoz relatív), perzisztálva
+
+A gyakori UI elemek (gather.png, hand.png, X gomb) szinte mindig ugyanott vannak:
+find_image először a hint helyek körüli kis ablakban keres, teljes frame-en
+csak ha egyikben sincs találat.
+"""
+import json
+import threading
+from pathlib import Path
+
+from utils.template_cache import template_key
+
+
+# Hint helyek száma template-enként (legutóbbi elöl)
+MAX_HINTS = 3
+
+# Keresési ablak ráhagyás a legutóbbi találat körül (px, + a template méret negyede)
+HINT_PADDING = 24
+
+# Ennyi px eltérésen belül ugyanannak a helynek számít
+SAME_LOCATION_TOLERANCE = 6
+
+
+class TemplateHints:
+    """Thread-safe location hint store (config/template_hints.json)"""
+
+    def __init__(self, config_dir=None, max_hints=MAX_HINTS, padding=HINT_PADDING):
+        if config_dir is None:
+            config_dir = Path(__file__).parent.parent / 'config'
+
+        self.config_dir = Path(config_dir)
+        self.hints_file = self.config_dir / 'template_hints.json'
+
+        self.max_hints = max_hints
+        self.padding = padding
+
+        self.lock = threading.Lock()
+
+        # {template kulcs: {'locations': [[x, y, w, h], ...], 'hits', 'misses', 'full_searches'}}
+        self.hints = {}
+
+        # Automatikus betöltés
+        self.load_from_file()
+
+    def get_regions(self, template_path):
+        """
+        Keresési ablakok a hint helyek körül (legutóbbi elöl)
+
+        Args:
+            template_path: Template útvonal
+
+        Returns:
+            list: [{'x', 'y', 'width', 'height'}, ...] játék ablakhoz relatív régiók
+        """
+        with self.lock:
+            hint = self.hints.get(template_key(template_path))
+            locations = list(hint['locations']) if hint else []
+
+        regions = []
+        for x, y, width, height in locations:
+            pad_x = self.padding + width // 4
+            pad_y = self.padding + height // 4
+            left = max(0, x - pad_x)
+            top = max(0, y - pad_y)
+            regions.append({
+                'x': left,
+                'y': top,
+                'width': x + width + pad_x - left,
+                'height': y + height + pad_y - top
+            })
+
+        return regions
+
+    def record_hit(self, template_path, box):
+        """
+        Találat egy hint ablakban
+
+        Args:
+            template_path: Template útvonal
+            box: (x, y, width, height) találat - játék ablakhoz relatív
+        """
+        with self.lock:
+            hint = self._hint(template_path)
+            hint['hits'] += 1
+            changed = self._remember(hint, box)
+
+        if changed:
+            self.save_to_file()
+
+    def record_miss(self, template_path, box=None):
+        """
+        Hint nélküli / hint ablakokban sikertelen keresés (teljes frame kellett)
+
+        Args:
+            template_path: Template útvonal
+            box: Teljes frame-es találat (x, y, width, height) vagy None
+        """
+        with self.lock:
+            hint = self._hint(template_path)
+            if hint['locations']:
+                hint['misses'] += 1
+            else:
+                hint['full_searches'] += 1
+
+            changed = self._remember(hint, box) if box is not None else False
+
+        if changed:
+            self.save_to_file()
+
+    def forget(self, template_path=None):
+        """
+        Hint-ek törlése (None = összes), pl. UI átrendezés / felbontás váltás után
+
+        Args:
+            template_path: Template útvonal vagy None
+        """
+        with self.lock:
+            if template_path is None:
+                self.hints = {}
+            else:
+                self.hints.pop(template_key(template_path), None)
+
+        self.save_to_file()
+
+    def set_state_dir(self, state_dir):
+        """
+        Hint fájl áthelyezése (replay: scratch könyvtár, a valódi config/ érintetlen)
+
+        A meglévő hint-ek a memóriában maradnak (induló állapot), csak az új írások kerülnek át.
+
+        Args:
+            state_dir: Új könyvtár a template_hints.json-nak
+        """
+        with self.lock:
+            self.config_dir = Path(state_dir)
+            self.hints_file = self.config_dir / 'template_hints.json'
+
+    def get_stats(self):
+        """
+        Hint statisztika
+
+        Returns:
+            dict: {'templates', 'hits', 'misses', 'full_searches', 'hit_rate'}
+                  hit_rate: hint találat / összes keresés
+        """
+        with self.lock:
+            hits = sum(h['hits'] for h in self.hints.values())
+            misses = sum(h['misses'] for h in self.hints.values())
+            full_searches = sum(h['full_searches'] for h in self.hints.values())
+
+        total = hits + misses + full_searches
+        return {
+            'templates': len(self.hints),
+            'hits': hits,
+            'misses': misses,
+            'full_searches': full_searches,
+            'hit_rate': round(hits / total, 3) if total else 0.0
+        }
+
+    def save_to_file(self):
+        """Hint-ek mentése JSON-ba"""
+        try:
+            self.config_dir.mkdir(parents=True, exist_ok=True)
+
+            with self.lock:
+                data = {key: dict(hint, locations=[list(box) for box in hint['locations']])
+                        for key, hint in self.hints.items()}
+
+            with open(self.hints_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+
+        except Exception as e:
+            print(f"Template hint mentési hiba: {e}")
+
+    def load_from_file(self):
+        """Hint-ek betöltése JSON-ból"""
+        try:
+            if not self.hints_file.exists():
+                return
+
+            with open(self.hints_file, 'r', encoding='utf-8') as f:
+                content = f.read().strip()
+                data = json.loads(content) if content else {}
+
+            hints = {}
+            for key, hint in data.items():
+                hints[key] = {
+                    'locations': [tuple(box) for box in hint.get('locations', [])][:self.max_hints],
+                    'hits': hint.get('hits', 0),
+                    'misses': hint.get('misses', 0),
+                    'full_searches': hint.get('full_searches', 0)
+                }
+
+            with self.lock:
+                self.hints = hints
+
+        except Exception as e:
+            print(f"Template hint betöltési hiba: {e}")
+            self.hints = {}
+
+    def _remember(self, hint, box):
+        """
+        Találati hely elejére (lock alatt hívandó!)
+
+        Returns:
+            bool: True ha a hely lista változott (mentés kell)
+        """
+        box = tuple(int(value) for value in box)
+        locations = hint['locations']
+
+        for index, known in enumerate(locations):
+            if (abs(known[0] - box[0]) <= SAME_LOCATION_TOLERANCE
+                    and abs(known[1] - box[1]) <= SAME_LOCATION_TOLERANCE):
+                if index == 0:
+                    return False
+                del locations[index]
+                break
+
+        locations.insert(0, box)
+        del locations[self.max_hints:]
+        return True
+
+    def _hint(self, template_path):
+        """Template hint bejegyzés (lock alatt hívandó!)"""
+        key = template_key(template_path)
+        if key not in self.hints:
+            self.hints[key] = {'locations': [], 'hits': 0, 'misses': 0, 'full_searches': 0}
+        return self.hints[key]
+
+
+# Globális singleton instance
+template_hints = TemplateHints()
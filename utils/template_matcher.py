@@ -0,0 +1,252 @@
+"""
+Auto Farm - Template Matcher
+Coarse-to-fine template matching (grayscale piramis → teljes felbontású finomítás)
+
+1. Durva szint: a frame és a template PYRAMID_FACTOR-ra kicsinyített grayscale
+   változatán korreláció (~1/4 pixel, 1/3 csatorna) → jelölt csúcsok
+2. Finom szint: csak a jelöltek körüli kis ablakban teljes felbontású BGR
+   TM_CCOEFF_NORMED → ugyanaz a pozíció és confidence, mint a teljes frame-en
+
+A kicsinyített frame frame_id szerint cache-elve (egy frame-en több keresés).
+Template csoport (match_many): ugyanaz a frame, template-enként párhuzamos
+correlation (a cv2 elengedi a GIL-t).
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from utils.template_cache import PYRAMID_FACTOR
+
+
+# Ennyivel a végső küszöb alatt is jelölt a durva szinten
+# (grayscale + kicsinyítés miatt a durva score kissé alacsonyabb)
+COARSE_MARGIN = 0.15
+
+# Max jelölt csúcs skálánként
+MAX_CANDIDATES = 3
+
+# Ennél kisebb (durva szintű) template oldal → közvetlen teljes felbontású match
+MIN_COARSE_SIDE = 8
+
+# Finomító ablak ráhagyás a jelölt körül (teljes felbontású pixel)
+REFINE_PADDING = int(round(2 / PYRAMID_FACTOR)) + 2
+
+
+class TemplateMatcher:
+    """Coarse-to-fine matching engine"""
+
+    def __init__(self, coarse_margin=COARSE_MARGIN, max_candidates=MAX_CANDIDATES, max_workers=4):
+        """
+        Args:
+            coarse_margin: Durva szintű küszöb engedmény
+            max_candidates: Max finomított jelölt skálánként
+            max_workers: Párhuzamosan matchelt template-ek max száma (match_many)
+        """
+        self.coarse_margin = coarse_margin
+        self.max_candidates = max_candidates
+        self.max_workers = max_workers
+
+        self.lock = threading.Lock()
+        self.executor = None
+
+        # Utolsó előkészített frame: (key, prepared)
+        self.last_prepared = None
+
+        # Statisztika
+        self.coarse_matches = 0
+        self.full_matches = 0
+        self.refinements = 0
+
+    def prepare(self, screen, key=None):
+        """
+        Keresési kép előkészítése (BGR + kicsinyített grayscale)
+
+        Args:
+            screen: BGR numpy kép (frame vagy kivágás)
+            key: Cache kulcs (pl. (frame_id, régió)), None = nincs cache
+
+        Returns:
+            dict: {'bgr', 'coarse'}
+        """
+        if key is not None:
+            with self.lock:
+                if self.last_prepared is not None and self.last_prepared[0] == key:
+                    return self.last_prepared[1]
+
+        gray = screen if screen.ndim == 2 else cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
+        coarse = cv2.resize(gray, None, fx=PYRAMID_FACTOR, fy=PYRAMID_FACTOR, interpolation=cv2.INTER_AREA)
+        prepared = {'bgr': screen, 'coarse': coarse}
+
+        if key is not None:
+            with self.lock:
+                self.last_prepared = (key, prepared)
+
+        return prepared
+
+    def match(self, prepared, entry, threshold, scales=(1.0,)):
+        """
+        Legjobb egyezés keresése
+
+        Args:
+            prepared: prepare() eredménye
+            entry: template_cache entry
+            threshold: Egyezési küszöb (a confidence-nek ennél nagyobbnak kell lennie)
+            scales: Template skálák (MULTI_SCALES részhalmaza)
+
+        Returns:
+            tuple: (confidence, (left, top), (width, height)) a keresési képen belül, vagy None
+        """
+        screen = prepared['bgr']
+        best = None
+        best_val = threshold
+
+        for scale in scales:
+            template = entry['scales'].get(scale)
+            if template is None:
+                continue
+
+            height, width = template.shape[:2]
+            if height > screen.shape[0] or width > screen.shape[1]:
+                continue
+
+            for val, loc in self._match_scale(prepared, entry, scale, template, threshold):
+                if val > best_val:
+                    best_val = val
+                    best = (val, loc, (width, height))
+
+        return best
+
+    def match_many(self, prepared, entries, threshold, scales=(1.0,), entry_scales=None):
+        """
+        Template csoport matchelése ugyanazon a keresési képen, párhuzamosan
+
+        Args:
+            prepared: prepare() eredménye
+            entries: template_cache entry-k listája
+            threshold / scales: lásd match()
+            entry_scales: Template-enkénti skálák (entries sorrendjében, pl. kalibráció),
+                          None = mindegyikre a scales
+
+        Returns:
+            list: match() eredmények a bemenet sorrendjében (None = nincs egyezés)
+        """
+        if entry_scales is None:
+            entry_scales = [scales] * len(entries)
+
+        if len(entries) <= 1:
+            return [self.match(prepared, entry, threshold, entry_scale)
+                    for entry, entry_scale in zip(entries, entry_scales)]
+
+        executor = self.get_executor()
+        futures = [executor.submit(self.match, prepared, entry, threshold, entry_scale)
+                   for entry, entry_scale in zip(entries, entry_scales)]
+        return [future.result() for future in futures]
+
+    def get_executor(self):
+        """Worker pool (lazy indítás)"""
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                   thread_name_prefix='match')
+            return self.executor
+
+    def shutdown(self):
+        """Worker pool leállítása"""
+        with self.lock:
+            executor, self.executor = self.executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _match_scale(self, prepared, entry, scale, template, threshold):
+        """
+        Egy skála: durva jelöltek → finomítás (vagy közvetlen match kis template-nél)
+
+        Returns:
+            list: [(confidence, (left, top)), ...]
+        """
+        screen = prepared['bgr']
+        coarse_template = entry.get('coarse_scales', {}).get(scale)
+
+        if (coarse_template is None
+                or min(coarse_template.shape[:2]) < MIN_COARSE_SIDE
+                or coarse_template.shape[0] > prepared['coarse'].shape[0]
+                or coarse_template.shape[1] > prepared['coarse'].shape[1]):
+            # Túl kicsi a durva szinthez → teljes felbontás (régi viselkedés)
+            with self.lock:
+                self.full_matches += 1
+            result = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
+            _, max_val, _, max_loc = cv2.minMaxLoc(result)
+            return [(max_val, max_loc)]
+
+        with self.lock:
+            self.coarse_matches += 1
+
+        coarse_result = cv2.matchTemplate(prepared['coarse'], coarse_template, cv2.TM_CCOEFF_NORMED)
+        candidates = self._find_peaks(coarse_result, threshold - self.coarse_margin,
+                                      coarse_template.shape[:2], self.max_candidates)
+
+        height, width = template.shape[:2]
+        matches = []
+        for coarse_x, coarse_y in candidates:
+            # Durva pozíció → teljes felbontású ablak (ráhagyással)
+            x0 = max(0, int(coarse_x / PYRAMID_FACTOR) - REFINE_PADDING)
+            y0 = max(0, int(coarse_y / PYRAMID_FACTOR) - REFINE_PADDING)
+            x1 = min(screen.shape[1], int(coarse_x / PYRAMID_FACTOR) + width + REFINE_PADDING)
+            y1 = min(screen.shape[0], int(coarse_y / PYRAMID_FACTOR) + height + REFINE_PADDING)
+            if x1 - x0 < width or y1 - y0 < height:
+                continue
+
+            with self.lock:
+                self.refinements += 1
+
+            result = cv2.matchTemplate(screen[y0:y1, x0:x1], template, cv2.TM_CCOEFF_NORMED)
+            _, max_val, _, max_loc = cv2.minMaxLoc(result)
+            matches.append((max_val, (max_loc[0] + x0, max_loc[1] + y0)))
+
+        return matches
+
+    @staticmethod
+    def _find_peaks(result, min_val, template_shape, count):
+        """
+        Legjobb csúcsok a korrelációs térképen (non-maximum suppression: template méretű környezet)
+
+        Returns:
+            list: [(x, y), ...] csökkenő score sorrendben
+        """
+        result = result.copy()
+        height, width = template_shape
+        peaks = []
+
+        for _ in range(count):
+            _, max_val, _, max_loc = cv2.minMaxLoc(result)
+            if max_val < min_val or not np.isfinite(max_val):
+                break
+
+            peaks.append(max_loc)
+
+            x, y = max_loc
+            result[max(0, y - height // 2):y + height // 2 + 1,
+                   max(0, x - width // 2):x + width // 2 + 1] = -1.0
+
+        return peaks
+
+    def get_stats(self):
+        """
+        Matching statisztika
+
+        Returns:
+            dict: {'coarse_matches', 'full_matches', 'refinements'}
+        """
+        with self.lock:
+            return {
+                'coarse_matches': self.coarse_matches,
+                'full_matches': self.full_matches,
+                'refinements': self.refinements
+            }
+
+
+# Globális singleton instance
+template_matcher = TemplateMatcher()
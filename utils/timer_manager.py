@@ -1,13 +1,19 @@
 """
 Auto Farm - Timer Manager
 Háttérszálon futó timer rendszer deadline kezeléssel
+
+Min-heap (monoton deadline szerint) + condition variable: a szál pontosan a
+következő lejáratig alszik, új timer esetén azonnal újraszámol (nincs polling)
 """
 import json
-import time
+import heapq
+import itertools
 import threading
 from pathlib import Path
 from datetime import datetime, timedelta
 
+from utils.clock import clock
+
 
 class TimerManager:
     """Háttérszálon futó timer manager deadline callback-kel"""
@@ -19,19 +25,23 @@ class TimerManager:
         self.config_dir = Path(config_dir)
         self.timers_file = self.config_dir / 'timers.json'
         
-        # Thread lock
+        # Thread lock + condition (új timer / stop → ébresztés)
         self.lock = threading.Lock()
+        self.condition = threading.Condition(self.lock)
         
-        # Timers lista
-        self.timers = []
+        # Timers: {timer_id: timer dict} (JSON formátum, beszúrási sorrend)
+        self.timers = {}
+
+        # Heap: (monoton deadline, seq, timer_id) - törölt / felülírt
+        # timer bejegyzése lazy módon esik ki (seq eltérés)
+        self.heap = []
+        self.timer_seq = {}
+        self._seq = itertools.count()
         
         # Thread control
         self.running = False
         self.thread = None
         
-        # Tick interval (másodperc)
-        self.tick_interval = 10
-        
         # Automatikus betöltés
         self.load_from_file()
     
@@ -46,9 +56,9 @@ class TimerManager:
             task_type: Task típus ("gathering", "training", stb.)
             data: Opcionális extra adat
         """
-        with self.lock:
+        with self.condition:
             # Deadline számítás
-            deadline = datetime.now() + timedelta(seconds=deadline_seconds)
+            deadline = clock.now() + timedelta(seconds=deadline_seconds)
             deadline_str = deadline.strftime("%Y-%m-%d %H:%M:%S")
             
             timer = {
@@ -62,12 +72,15 @@ class TimerManager:
                 }
             }
             
-            # Ha már létezik ilyen timer_id, töröljük
-            self.timers = [t for t in self.timers if t['timer_id'] != timer_id]
-            
-            self.timers.append(timer)
+            # Ha már létezik ilyen timer_id, felülírjuk (régi heap entry lazy törlés)
+            self.timers.pop(timer_id, None)
+            self._push(timer, clock.monotonic() + deadline_seconds)
+
             self._log_action(f"Timer hozzáadva: {timer_id} → {deadline_seconds}s múlva ({deadline_str})")
             self.save_to_file()
+
+            # Tick szál ébresztése (új legkorábbi deadline lehet)
+            self.condition.notify()
     
     def remove_timer(self, timer_id):
         """
@@ -79,16 +92,14 @@ class TimerManager:
         Returns:
             bool: Sikeres törlés
         """
-        with self.lock:
-            before_count = len(self.timers)
-            self.timers = [t for t in self.timers if t['timer_id'] != timer_id]
-            
-            if len(self.timers) < before_count:
-                self._log_action(f"Timer törölve: {timer_id}")
-                self.save_to_file()
-                return True
-            
-            return False
+        with self.condition:
+            if self.timers.pop(timer_id, None) is None:
+                return False
+
+            self.timer_seq.pop(timer_id, None)
+            self._log_action(f"Timer törölve: {timer_id}")
+            self.save_to_file()
+            return True
     
     def get_all_timers(self):
         """
@@ -98,7 +109,20 @@ class TimerManager:
             list: Timer lista (másolat)
         """
         with self.lock:
-            return [t.copy() for t in self.timers]
+            return [t.copy() for t in self.timers.values()]
+
+    def get_next_deadline(self):
+        """
+        Legközelebbi lejárat
+
+        Returns:
+            float: Hány mp múlva jár le a következő timer (None ha nincs)
+        """
+        with self.lock:
+            self._discard_stale()
+            if not self.heap:
+                return None
+            return max(0.0, self.heap[0][0] - clock.monotonic())
 
     def cleanup_on_startup(self):
         """
@@ -107,10 +131,12 @@ class TimerManager:
         Törli:
         - Összes timert (clean slate)
         """
-        with self.lock:
+        with self.condition:
             count = len(self.timers)
             if count > 0:
-                self.timers = []
+                self.timers = {}
+                self.heap = []
+                self.timer_seq = {}
                 self._log_action(f"[STARTUP CLEANUP] Timerek törölve ({count} régi timer eltávolítva)")
                 self.save_to_file()
             else:
@@ -125,57 +151,97 @@ class TimerManager:
         self.running = True
         self.thread = threading.Thread(target=self._tick_loop, daemon=True)
         self.thread.start()
-        self._log_action("Timer Manager elindult (10 sec tick)")
+        self._log_action("Timer Manager elindult (heap, pontos deadline ébresztés)")
     
     def stop(self):
         """Háttérszál leállítása"""
         if not self.running:
             return
         
-        self.running = False
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+
         if self.thread:
             self.thread.join(timeout=2)
         
         self._log_action("Timer Manager leállítva")
     
     def _tick_loop(self):
-        """Fő ciklus (10 sec tick)"""
+        """Fő ciklus: alvás a következő deadline-ig (vagy új timer / stop jelzésig)"""
         while self.running:
             try:
-                self._check_deadlines()
+                with self.condition:
+                    expired_timers = self._pop_expired()
+
+                    if not expired_timers and self.running:
+                        # Nincs timer → várakozás amíg add_timer / stop fel nem ébreszt
+                        timeout = None
+                        if self.heap:
+                            timeout = self.heap[0][0] - clock.monotonic()
+                        clock.wait(self.condition, timeout)
+                        continue
+
+                # Callback-ek futtatása (lock-on kívül!)
+                for timer in expired_timers:
+                    self._execute_callback(timer)
+
             except Exception as e:
                 self._log_action(f"Tick hiba: {e}")
-            
-            # Várakozás (10 sec, de 1 sec-enként ellenőrzi a running flag-et)
-            for _ in range(self.tick_interval):
-                if not self.running:
-                    break
-                time.sleep(1)
+                clock.sleep(1)
     
     def _check_deadlines(self):
-        """Lejárt timer-ek keresése és callback futtatás"""
-        now = datetime.now()
-        
-        with self.lock:
-            expired_timers = []
-            
-            for timer in self.timers:
-                deadline = datetime.strptime(timer['deadline'], "%Y-%m-%d %H:%M:%S")
-                
-                if now >= deadline:
-                    expired_timers.append(timer)
-            
-            # Lejárt timer-ek törlése
-            if expired_timers:
-                for timer in expired_timers:
-                    self.timers.remove(timer)
-                    self._log_action(f"Timer lejárt: {timer['timer_id']}")
-                
-                self.save_to_file()
+        """Lejárt timer-ek kivétele és callback futtatás (kézi ellenőrzéshez)"""
+        with self.condition:
+            expired_timers = self._pop_expired()
         
         # Callback-ek futtatása (lock-on kívül!)
         for timer in expired_timers:
             self._execute_callback(timer)
+
+    def _pop_expired(self):
+        """
+        Lejárt timer-ek kivétele a heap tetejéről (lock alatt hívandó!)
+
+        Returns:
+            list: Lejárt timer dict-ek (deadline sorrendben)
+        """
+        now = clock.monotonic()
+        expired_timers = []
+
+        while self.heap and self.heap[0][0] <= now:
+            _, seq, timer_id = heapq.heappop(self.heap)
+
+            if self.timer_seq.get(timer_id) != seq:
+                continue  # Törölt / felülírt timer
+
+            del self.timer_seq[timer_id]
+            timer = self.timers.pop(timer_id)
+            expired_timers.append(timer)
+            self._log_action(f"Timer lejárt: {timer_id}")
+
+        if expired_timers:
+            self.save_to_file()
+
+        return expired_timers
+
+    def _discard_stale(self):
+        """Törölt / felülírt heap bejegyzések eldobása a tetejéről (lock alatt!)"""
+        while self.heap and self.timer_seq.get(self.heap[0][2]) != self.heap[0][1]:
+            heapq.heappop(self.heap)
+
+    def _push(self, timer, due):
+        """
+        Timer felvétele (lock alatt hívandó!)
+
+        Args:
+            timer: Timer dict
+            due: Lejárat monoton időben (clock.monotonic())
+        """
+        seq = next(self._seq)
+        self.timers[timer['timer_id']] = timer
+        self.timer_seq[timer['timer_id']] = seq
+        heapq.heappush(self.heap, (due, seq, timer['timer_id']))
     
     def _execute_callback(self, timer):
         """
@@ -202,13 +268,32 @@ class TimerManager:
         except Exception as e:
             self._log_action(f"Callback hiba: {e}")
     
+    def set_state_dir(self, state_dir):
+        """
+        Timer fájl áthelyezése (replay: scratch könyvtár, a valódi config/ érintetlen)
+
+        Args:
+            state_dir: Új könyvtár a timers.json-nak
+        """
+        state_dir = Path(state_dir)
+
+        with self.condition:
+            self.config_dir = state_dir
+            self.timers_file = state_dir / 'timers.json'
+            self.timers = {}
+            self.heap = []
+            self.timer_seq = {}
+            self.condition.notify_all()
+
+        self.load_from_file()
+
     def save_to_file(self):
         """Timer-ek mentése JSON-ba"""
         try:
             self.config_dir.mkdir(parents=True, exist_ok=True)
             
             with open(self.timers_file, 'w', encoding='utf-8') as f:
-                json.dump(self.timers, f, indent=2, ensure_ascii=False)
+                json.dump(list(self.timers.values()), f, indent=2, ensure_ascii=False)
         
         except Exception as e:
             print(f"Timer mentési hiba: {e}")
@@ -219,17 +304,24 @@ class TimerManager:
             if self.timers_file.exists():
                 with open(self.timers_file, 'r', encoding='utf-8') as f:
                     content = f.read().strip()
-                    if content:
-                        self.timers = json.loads(content)
-                        self._log_action(f"Timer-ek betöltve: {len(self.timers)} db")
-                    else:
-                        self.timers = []
+                    timers = json.loads(content) if content else []
             else:
-                self.timers = []
+                timers = []
+
+            # Fali óra deadline → monoton deadline (egyszer, betöltéskor)
+            now, now_mono = clock.now(), clock.monotonic()
+            for timer in timers:
+                deadline = datetime.strptime(timer['deadline'], "%Y-%m-%d %H:%M:%S")
+                self._push(timer, now_mono + (deadline - now).total_seconds())
+
+            if timers:
+                self._log_action(f"Timer-ek betöltve: {len(timers)} db")
         
         except Exception as e:
             print(f"Timer betöltési hiba: {e}")
-            self.timers = []
+            self.timers = {}
+            self.heap = []
+            self.timer_seq = {}
     
     def _log_action(self, message):
         """Logging timer műveletekhez"""